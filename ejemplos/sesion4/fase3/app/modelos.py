@@ -5,6 +5,8 @@ from abc import ABC, abstractmethod
 
 # --- Base abstracta ---
 class BaseUsuario(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def permisos(self) -> list[str]:
         """Lista de permisos concedidos al usuario."""
@@ -15,8 +17,11 @@ class BaseUsuario(ABC):
 
 # --- Usuario (de Fase 2) HEREDA de BaseUsuario ---
 class Usuario(BaseUsuario):
+    # Sin __dict__ por instancia; subclases y mixins declaran también __slots__
+    __slots__ = ("nombre", "_email", "_rol", "activo", "__password_hash")
+
     contador = 0
-    ROLES_VALIDOS = {"usuario", "admin", "invitado"}
+    ROLES_VALIDOS = {"usuario", "admin", "invitado", "moderador"}
 
     def __init__(self, nombre: str, email: str, rol: str = "usuario", activo: bool = True):
         self.nombre = nombre
@@ -91,6 +96,8 @@ class Usuario(BaseUsuario):
 
 
 class Admin(Usuario):
+    __slots__ = ()
+
     def __init__(self, nombre: str, email: str, activo: bool = True):
         super().__init__(nombre, email, rol="admin", activo=activo)
 
@@ -104,6 +111,8 @@ class Admin(Usuario):
 
 
 class Moderador(Usuario):
+    __slots__ = ("nivel",)
+
     def __init__(self, nombre: str, email: str, nivel: int = 1, activo: bool = True):
         super().__init__(nombre, email, rol="moderador", activo=activo)
         self.nivel = nivel
@@ -123,7 +132,13 @@ from datetime import datetime
 from typing import Any
 
 class LoggerMixin:
-    """Mixin de logging simple. Supone que la clase hija tiene .email y .__class__.__name__."""
+    """
+    Mixin de logging simple. Supone que la clase hija tiene .email y .__class__.__name__.
+    Versión de la sesión: print síncrono por evento. La versión con sink enchufable
+    (cola + hilo escritor por lotes) está en src/labs/lab06_testing (app/registro.py).
+    """
+    __slots__ = ()
+
     def log_evento(self, msg: str, **context: Any) -> None:
         ts = datetime.now().isoformat(timespec="seconds")
         who = getattr(self, "email", "desconocido")
@@ -138,6 +153,8 @@ class LoggerMixin:
 
 class AdminConLogger(LoggerMixin, Admin):
     """Admin con capacidades de logging vía mixin."""
+    __slots__ = ()
+
     # hereda todo; si quieres, puedes extender presentarse/activar usando super()
     def presentarse(self) -> str:
         base = super().presentarse()
@@ -145,8 +162,10 @@ class AdminConLogger(LoggerMixin, Admin):
         return base
     
 class NotificadorMixin:
+    __slots__ = ()
+
     def enviar_email(self, asunto: str, cuerpo: str) -> None:
         print(f"[EMAIL a {self.email}] {asunto}: {cuerpo}")
 
 class AdminFull(NotificadorMixin, LoggerMixin, Admin):
-    pass
\ No newline at end of file
+    __slots__ = ()
\ No newline at end of file
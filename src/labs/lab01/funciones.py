@@ -1,4 +1,5 @@
 from typing import Callable, Dict, List, Tuple, Any
+from perfilado import perfilar
 from validaciones import (
     validar_email,
     validar_telefono_es,
@@ -71,6 +72,7 @@ def validar_valor(valor: Any, validadores: List[Tuple[Validador, str]]) -> Resul
 # ------------------------------------------------------------
 # API REUTILIZABLE
 # ------------------------------------------------------------
+@perfilar
 def procesar_formulario(*checks_globales: Callable[[Dict[str, Any]], Tuple[bool, str]],
                         reglas: Dict[str, Dict[str, Any]] = None,
                         **campos) -> Dict[str, Any]:
@@ -0,0 +1,47 @@
+# perfilado.py
+"""
+Versión mínima del perfilado de lab06 (app/perfilado.py): solo el decorador.
+
+A diferencia de `contador` (sesión 1), @perfilar no imprime en cada llamada:
+acumula llamadas, tiempo total y máximo, y el informe sale una vez al
+terminar. Se enciende con la variable de entorno PERFILADO=1; apagado, el
+decorador devuelve la función original y no cuesta nada.
+
+    PERFILADO=1 python pipeline.py
+"""
+import atexit
+import functools
+import os
+import sys
+from time import perf_counter_ns
+
+ACTIVO = os.environ.get("PERFILADO", "") not in ("", "0")
+REGISTRO = {}  # nombre -> [llamadas, total_ns, max_ns]
+
+def perfilar(func):
+    if not ACTIVO:
+        return func
+    metricas = REGISTRO.setdefault(f"{func.__module__}.{func.__qualname__}", [0, 0, 0])
+
+    @functools.wraps(func)
+    def envoltorio(*args, **kwargs):
+        t0 = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            ns = perf_counter_ns() - t0
+            metricas[0] += 1
+            metricas[1] += ns
+            if ns > metricas[2]:
+                metricas[2] = ns
+    return envoltorio
+
+def informe() -> str:
+    lineas = [f"{'función':<40} {'llamadas':>9} {'total ms':>10} {'media µs':>9} {'max µs':>9}"]
+    for nombre, (n, total, maximo) in sorted(REGISTRO.items(), key=lambda kv: -kv[1][1]):
+        if n:
+            lineas.append(f"{nombre[-40:]:<40} {n:>9} {total / 1e6:>10.3f} {total / n / 1e3:>9.2f} {maximo / 1e3:>9.2f}")
+    return "\n".join(lineas)
+
+if ACTIVO:
+    atexit.register(lambda: print(informe(), file=sys.stderr))
@@ -1,5 +1,6 @@
 from itertools import zip_longest
 from functools import reduce
+from perfilado import perfilar
 
 # Dataset inicial de ejemplo (simula datos desordenados de un CSV)
 PRODUCTOS = [
@@ -56,6 +57,7 @@ def descuentos_encadenados(items, *porcentajes):
 def top_n(*items, n=2):
     return sorted(*items, key=lambda x: x['precio']*x['stock'], reverse=True)[:n]
 
+@perfilar
 def kpis_catalogo(items):
     """
     items: lista de dicts con al menos: nombre, precio, stock, (opcional) precio_final
@@ -1,3 +1,5 @@
 # Exponer lo esencial del paquete
 from .modelos import Usuario, Admin, Invitado, Moderador
-from .repositorio import RepositorioUsuarios
\ No newline at end of file
+from .repositorio import RepositorioUsuarios, usuarios_con_permiso
+
+__all__ = ["Usuario", "Admin", "Invitado", "Moderador", "RepositorioUsuarios", "usuarios_con_permiso"]
@@ -0,0 +1,217 @@
+# app/intercambio.py
+"""
+Importación y exportación de usuarios en CSV o JSON Lines, en streaming.
+
+Las filas se leen de una en una y se validan por lotes con
+Usuario.desde_registros (misma validación que desde_dict, sin pasar por los
+setters), así que la memoria del proceso de lectura no depende del tamaño
+del fichero: solo crece lo que se guarda en el repositorio. De los errores
+se cuentan todos pero solo se conservan los primeros MAX_ERRORES. Una línea
+ilegible (JSON mal formado o que no es un objeto) cuenta como fila errónea
+y la importación sigue.
+
+- leer / escribir: filas (dict) desde/hacia un fichero; el formato sale de
+  la extensión (.csv, .jsonl, .ndjson) salvo que se indique.
+- importar / exportar: filas -> repositorio y usuarios -> fichero, con un
+  callback de progreso cada `cada` filas.
+
+Cada fila se construye con la clase de su rol (CLASES: Admin, Invitado,
+Moderador con su nivel), así que exportar e importar conserva los permisos.
+"""
+from __future__ import annotations
+import csv
+import json
+import time
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+from .modelos import Admin, Invitado, Moderador, Usuario
+
+FORMATOS = ("csv", "jsonl")
+CAMPOS = ("nombre", "email", "rol", "activo", "nivel")  # nivel: solo moderadores
+# rol -> clase con que se construye; el resto de roles, Usuario
+CLASES: dict[str, type[Usuario]] = {"admin": Admin, "invitado": Invitado, "moderador": Moderador}
+TAM_LOTE = 10_000
+MAX_ERRORES = 20
+_FALSOS = frozenset({"0", "false", "f", "no", "n"})
+
+Progreso = Callable[[int, float], None]  # (filas procesadas, segundos desde el inicio)
+
+class Resultado(NamedTuple):
+    filas: int
+    correctas: int
+    n_errores: int
+    errores: list[tuple[int, str]]  # (nº de fila, 1-based; mensaje), como mucho MAX_ERRORES
+    segundos: float
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+def formato_de(ruta: Path | str, formato: str | None = None) -> str:
+    if formato is not None:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato no soportado: {formato!r}")
+        return formato
+    sufijo = Path(ruta).suffix.lower()
+    if sufijo == ".csv":
+        return "csv"
+    if sufijo in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"No se deduce el formato de {str(ruta)!r}: usa .csv o .jsonl")
+
+def _a_bool(v) -> bool:
+    # en CSV todo llega como texto: bool("False") sería True; vacío o nulo = valor por defecto (True)
+    if v is None:
+        return True
+    if isinstance(v, str):
+        return v.strip().lower() not in _FALSOS
+    return bool(v)
+
+def _a_int(v):
+    # nivel en CSV llega como texto; si no es un entero se deja y lo rechaza el modelo
+    try:
+        return int(v)
+    except ValueError:
+        return v
+
+def _clase(rol) -> type[Usuario]:
+    return CLASES.get(rol.strip().lower(), Usuario) if isinstance(rol, str) else Usuario
+
+def leer(ruta: Path | str, formato: str | None = None) -> Iterator[dict | ValueError]:
+    """
+    Genera las filas del fichero como dicts (CAMPOS), sin cargarlo entero.
+    Una línea que no se puede leer como fila sale como ValueError (sin lanzarlo)
+    para que importar la cuente como error y siga con las demás.
+    """
+    formato = formato_de(ruta, formato)
+    with open(ruta, newline="", encoding="utf-8") as f:
+        if formato == "csv":
+            for d in csv.DictReader(f):
+                # fila corta: DictReader rellena con None; fuera, para que valgan los valores por defecto
+                d = {k: v for k, v in d.items() if k is not None and v is not None}
+                if "activo" in d:
+                    d["activo"] = _a_bool(d["activo"])
+                if "nivel" in d:
+                    if d["nivel"].strip():
+                        d["nivel"] = _a_int(d["nivel"])
+                    else:
+                        del d["nivel"]
+                yield d
+            return
+        for n, linea in enumerate(f, 1):
+            if not linea.strip():
+                continue
+            try:
+                d = json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"línea {n}: JSON inválido ({e.msg})")
+                continue
+            if not isinstance(d, dict):
+                yield ValueError(f"línea {n}: se esperaba un objeto JSON, no {type(d).__name__}")
+                continue
+            if "activo" in d:
+                d["activo"] = _a_bool(d["activo"])
+            yield d
+
+def como_dict(u: Usuario) -> dict:
+    d = {"nombre": u.nombre, "email": u.email, "rol": u.rol, "activo": u.activo}
+    if isinstance(u, Moderador):
+        d["nivel"] = u.nivel
+    return d
+
+def lotes(it: Iterable, n: int) -> Iterator[list]:
+    it = iter(it)
+    while lote := list(islice(it, n)):
+        yield lote
+
+def importar(repo, filas: Iterable[dict | ValueError], tam_lote: int = TAM_LOTE,
+             progreso: Progreso | None = None, cada: int = 100_000) -> Resultado:
+    """
+    Valida las filas por lotes y agrega los usuarios a `repo` (cualquier objeto
+    con agregar(u)). Filas inválidas, ilegibles (lo que no sea un dict, como
+    los ValueError de leer) y emails duplicados no abortan: cuentan como error
+    con su número de fila.
+    """
+    t0 = time.perf_counter()
+    filas_vistas = correctas = n_errores = 0
+    errores: list[tuple[int, str]] = []
+    siguiente = cada
+    agregar = repo.agregar
+
+    def error(fila: int, msg: str) -> None:
+        nonlocal n_errores
+        n_errores += 1
+        if len(errores) < MAX_ERRORES:
+            errores.append((fila, msg))
+
+    for lote in lotes(filas, tam_lote):
+        base = filas_vistas + 1
+        fallos: dict[int, str] = {}
+        indices = [i for i, d in enumerate(lote) if isinstance(d, dict)]
+        if len(indices) < len(lote):
+            for i, d in enumerate(lote):
+                if not isinstance(d, dict):
+                    fallos[i] = str(d) if isinstance(d, Exception) else f"Fila no válida: {type(d).__name__}"
+            registros = [lote[i] for i in indices]
+        else:
+            registros = lote
+        grupos: dict[type[Usuario], list[int]] = {}
+        for j, d in enumerate(registros):
+            grupos.setdefault(_clase(d.get("rol", "usuario")), []).append(j)
+        validos: list[tuple[int, Usuario]] = []  # (índice en el lote, usuario)
+        for cls, js in grupos.items():
+            usuarios, errs = cls.desde_registros(registros if len(grupos) == 1 else [registros[j] for j in js])
+            for k, msgs in errs.items():
+                fallos[indices[js[k]]] = "; ".join(msgs)
+            buenos = (js[k] for k in range(len(js)) if k not in errs) if errs else iter(js)
+            validos.extend(zip((indices[j] for j in buenos), usuarios))
+        if len(grupos) > 1:
+            validos.sort(key=itemgetter(0))  # en orden de fila: el duplicado es el que va después
+        for i in sorted(fallos):
+            error(base + i, fallos[i])
+        for i, u in validos:
+            try:
+                agregar(u)
+            except ValueError as e:
+                error(base + i, str(e))
+            else:
+                correctas += 1
+        filas_vistas += len(lote)
+        if progreso is not None and filas_vistas >= siguiente:
+            progreso(filas_vistas, time.perf_counter() - t0)
+            siguiente = (filas_vistas // cada + 1) * cada
+    return Resultado(filas_vistas, correctas, n_errores, errores, time.perf_counter() - t0)
+
+def escribir(ruta: Path | str, filas: Iterable[dict], formato: str | None = None) -> int:
+    """Escribe las filas en `ruta` a medida que llegan; devuelve cuántas."""
+    formato = formato_de(ruta, formato)
+    n = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        if formato == "csv":
+            w = csv.writer(f)
+            w.writerow(CAMPOS)
+            for lote in lotes(filas, TAM_LOTE):
+                w.writerows([d["nombre"], d["email"], d["rol"], "true" if d["activo"] else "false", d.get("nivel", "")]
+                            for d in lote)
+                n += len(lote)
+            return n
+        dumps = json.dumps
+        for lote in lotes(filas, TAM_LOTE):
+            f.write("".join(dumps(d, ensure_ascii=False) + "\n" for d in lote))
+            n += len(lote)
+    return n
+
+def exportar(usuarios: Iterable[Usuario], ruta: Path | str, formato: str | None = None,
+             progreso: Progreso | None = None, cada: int = 100_000) -> Resultado:
+    t0 = time.perf_counter()
+
+    def filas() -> Iterator[dict]:
+        for n, u in enumerate(usuarios, 1):
+            yield como_dict(u)
+            if progreso is not None and n % cada == 0:
+                progreso(n, time.perf_counter() - t0)
+
+    n = escribir(ruta, filas(), formato)
+    return Resultado(n, n, 0, [], time.perf_counter() - t0)
@@ -1,3 +1,240 @@
+# app/modelos.py
+from __future__ import annotations
+import inspect
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Iterable
 from .utils import validar_email
-# … Usuario, Admin, Invitado, Moderador, mixins …
-# Asegúrate de que Usuario usa validar_email en el setter de email.
\ No newline at end of file
+from . import notificaciones, registro, seguridad
+
+# Todas las clases de la jerarquía (incluidos los mixins) declaran __slots__:
+# si una sola lo omite, sus instancias vuelven a tener __dict__ por objeto.
+
+class BaseUsuario(ABC):
+    __slots__ = ()
+
+    @abstractmethod
+    def permisos(self) -> frozenset[str]: ...
+    def tiene_permiso(self, p: str) -> bool: return p in self.permisos()  # O(1): frozenset
+
+class Usuario(BaseUsuario):
+    __slots__ = ("nombre", "_email", "_rol", "activo", "__password_hash")
+
+    contador = 0
+    ROLES_VALIDOS = {"usuario", "admin", "invitado", "moderador"}
+    # Permisos precalculados a nivel de clase: permisos() no construye nada por llamada
+    PERMISOS: frozenset[str] = frozenset({"ver"})
+    # Backend de hash (coste ajustable); compartido por todas las instancias
+    hasher = seguridad.HasherScrypt()
+
+    def __init__(self, nombre: str, email: str, rol: str = "usuario", activo: bool = True):
+        self.nombre = nombre
+        self._email: str | None = None
+        self.email = email       # setter valida
+        self._rol: str | None = None
+        self.rol = rol           # setter valida
+        self.activo = activo
+        self.__password_hash: str | None = None
+        Usuario.contador += 1
+
+    def presentarse(self) -> str:
+        return f"Soy {self.nombre} ({self.email})"
+
+    def activar(self): self.activo = True
+    def desactivar(self): self.activo = False
+
+    def __str__(self) -> str:
+        estado = "activo" if self.activo else "inactivo"
+        return f"{self.nombre} <{self.email}> ({self.rol}) [{estado}]"
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(nombre={self.nombre!r}, email={self.email!r}, "
+                f"rol={self.rol!r}, activo={self.activo!r})")
+
+    @property
+    def email(self) -> str: return self._email or ""
+    @email.setter
+    def email(self, value: str):
+        if not validar_email(value):
+            raise ValueError(f"Email inválido: {value!r}")
+        self._email = value.strip().lower()
+
+    @property
+    def rol(self) -> str: return self._rol or "usuario"
+    @rol.setter
+    def rol(self, value: str):
+        v = (value or "").strip().lower()
+        if v not in self.ROLES_VALIDOS:
+            raise ValueError(f"Rol inválido: {value!r}")
+        self._rol = sys.intern(v)  # todas las instancias comparten la misma cadena
+
+    def set_password(self, p: str):
+        if not p or len(p) < 6:
+            raise ValueError("La contraseña debe tener al menos 6 caracteres")
+        self.__password_hash = self.hasher.hash(p)
+    def check_password(self, p: str) -> bool:
+        return seguridad.verificar(p, self.__password_hash, (self.hasher,))
+
+    @property
+    def password_hash(self) -> str | None:
+        return self.__password_hash
+    def set_password_hash(self, h: str) -> None:
+        """Asigna un hash ya calculado (p. ej. en un PoolHashing)."""
+        self.__password_hash = h
+
+    @classmethod
+    def desde_dict(cls, d: dict) -> "Usuario":
+        return cls(d.get("nombre",""), d.get("email",""), d.get("rol","usuario"), bool(d.get("activo", True)))
+
+    @classmethod
+    def desde_registros(cls, registros: Iterable[dict]) -> tuple[list["Usuario"], dict[int, list[str]]]:
+        """
+        Carga masiva equivalente a [desde_dict(d) for d in registros], pero sin
+        pasar por los setters: valida cada columna de una vez y construye las
+        instancias directamente. Las filas inválidas no lanzan; se devuelven en
+        el informe {índice: [errores]} con los mismos mensajes que los setters.
+        """
+        registros = registros if isinstance(registros, list) else list(registros)
+        emails_brutos = [d.get("email", "") for d in registros]
+        emails = [(e or "").strip().lower() for e in emails_brutos]
+        emails_ok = list(map(validar_email, emails))
+
+        # Pocos roles distintos: se normalizan una sola vez por valor
+        roles_norm: dict[Any, str] = {}
+        for r in {d.get("rol", "usuario") for d in registros}:
+            roles_norm[r] = sys.intern((r or "").strip().lower())
+        roles = [roles_norm[d.get("rol", "usuario")] for d in registros]
+        validos = cls.ROLES_VALIDOS
+
+        errores: dict[int, list[str]] = {}
+        for i, ok in enumerate(emails_ok):
+            if not ok:
+                errores[i] = [f"Email inválido: {emails_brutos[i]!r}"]
+        for i, r in enumerate(roles):
+            if r not in validos:
+                errores.setdefault(i, []).append(f"Rol inválido: {registros[i].get('rol', 'usuario')!r}")
+
+        usuarios: list[Usuario] = []
+        if cls.__init__ is not Usuario.__init__:
+            # Subclases con constructor propio (Admin fija el rol, Moderador añade
+            # nivel...): se construyen por su __init__ para que todos sus slots
+            # queden asignados; aquí solo se ahorra la validación ya hecha.
+            params = inspect.signature(cls.__init__).parameters
+            if "rol" not in params:
+                for i in [i for i, msgs in errores.items() if msgs[-1].startswith("Rol")]:
+                    del errores[i][-1]
+                    if not errores[i]:
+                        del errores[i]
+            extra = [k for k in params if k not in ("self", "nombre", "email", "activo")]
+            for i, d in enumerate(registros):
+                if i in errores:
+                    continue
+                try:
+                    usuarios.append(cls(d.get("nombre", ""), emails[i], activo=bool(d.get("activo", True)),
+                                        **{k: d[k] for k in extra if k in d}))
+                except (TypeError, ValueError) as e:
+                    errores[i] = [str(e)]
+            return usuarios, errores
+
+        nuevo = cls.__new__
+        for i, d in enumerate(registros):
+            if i in errores:
+                continue
+            u = nuevo(cls)
+            u.nombre = d.get("nombre", "")
+            u._email = emails[i]
+            u._rol = roles[i]
+            u.activo = bool(d.get("activo", True))
+            u.__password_hash = None
+            usuarios.append(u)
+        Usuario.contador += len(usuarios)
+        return usuarios, errores
+
+    def permisos(self) -> frozenset[str]:
+        return self.PERMISOS
+
+class Admin(Usuario):
+    __slots__ = ()
+    PERMISOS = frozenset({"ver", "crear", "editar", "borrar"})
+
+    def __init__(self, nombre: str, email: str, activo: bool = True):
+        super().__init__(nombre, email, rol="admin", activo=activo)
+    def presentarse(self) -> str:
+        return f"[ADMIN] {super().presentarse()}"
+
+class Invitado(Usuario):
+    __slots__ = ()
+
+    def __init__(self, nombre: str, email: str, activo: bool = True):
+        super().__init__(nombre, email, rol="invitado", activo=activo)
+    def __str__(self) -> str:
+        return f"[INVITADO] {super().__str__()}"
+
+class Moderador(Usuario):
+    __slots__ = ("_nivel",)
+    # nivel -> permisos; los niveles superiores al último usan el último
+    PERMISOS_POR_NIVEL: tuple[frozenset[str], ...] = (
+        frozenset({"ver", "editar"}),
+        frozenset({"ver", "editar", "borrar"}),
+    )
+
+    def __init__(self, nombre: str, email: str, nivel: int = 1, activo: bool = True):
+        super().__init__(nombre, email, rol="moderador", activo=activo)
+        self.nivel = nivel       # setter valida
+
+    @property
+    def nivel(self) -> int: return self._nivel
+    @nivel.setter
+    def nivel(self, value: int):
+        # validado también después de construir: permisos() indexa con él
+        if not isinstance(value, int) or value < 1:
+            raise ValueError("nivel debe ser int >= 1")
+        self._nivel = value
+
+    def permisos(self) -> frozenset[str]:
+        niveles = self.PERMISOS_POR_NIVEL
+        return niveles[min(self.nivel, len(niveles)) - 1]
+    def __str__(self) -> str:
+        return f"[MODERADOR-N{self.nivel}] {super().__str__()}"
+
+# --- Mixins ---
+class LoggerMixin:
+    """
+    Mixin de logging simple. Supone que la clase hija tiene .email y .__class__.__name__.
+    Los eventos van a `sink` (por defecto, consola); para operaciones masivas
+    asigna un registro.SinkArchivoAsync a LoggerMixin.sink o a una subclase.
+    """
+    __slots__ = ()
+    sink = registro.SinkConsola()
+
+    def log_evento(self, msg: str, **context: Any) -> None:
+        who = getattr(self, "email", "desconocido")
+        self.sink.emitir(registro.evento(self.__class__.__name__, who, msg, context))
+
+    def activar(self) -> None:
+        self.log_evento("Activando usuario…")
+        super().activar()  # delega al siguiente en el MRO
+        self.log_evento("Usuario activado")
+
+class NotificadorMixin:
+    """Si `outbox` está asignado, los emails se encolan allí (ver notificaciones.Outbox)."""
+    __slots__ = ()
+    outbox: notificaciones.Outbox | None = None
+
+    def enviar_email(self, asunto: str, cuerpo: str) -> None:
+        if self.outbox is not None:
+            self.outbox.encolar(notificaciones.Mensaje(self.email, asunto, cuerpo))
+            return
+        print(f"[EMAIL a {self.email}] {asunto}: {cuerpo}")
+
+class AdminConLogger(LoggerMixin, Admin):
+    """Admin con capacidades de logging vía mixin."""
+    __slots__ = ()
+
+    def presentarse(self) -> str:
+        base = super().presentarse()
+        self.log_evento("presentarse() invocado")
+        return base
+
+class AdminFull(NotificadorMixin, LoggerMixin, Admin):
+    __slots__ = ()
@@ -0,0 +1,151 @@
+# app/notificaciones.py
+"""
+Outbox asíncrono para NotificadorMixin.enviar_email.
+
+Los mensajes se acumulan con `encolar` y `await vaciar()` los agrupa por
+dominio de destino, los trocea en lotes y los envía con concurrencia
+acotada (asyncio.Semaphore) y reintentos con backoff exponencial. Si el
+transporte entrega parte de un lote (EnvioParcial), solo se reintenta el
+resto. El transporte es intercambiable:
+
+- TransporteArchivo: escribe cada mensaje como una línea (tests, demos).
+- TransporteSMTP: smtplib en un hilo, una conexión por lote. Para probar en
+  local sirve un servidor stub (p. ej. `python -m aiosmtpd -n -l localhost:8025`).
+"""
+from __future__ import annotations
+import asyncio
+import smtplib
+import time
+from email.message import EmailMessage
+from statistics import quantiles
+from typing import NamedTuple, Protocol
+
+class Mensaje(NamedTuple):
+    destino: str
+    asunto: str
+    cuerpo: str
+
+class EnvioParcial(Exception):
+    """El transporte entregó parte del lote; `fallidos` son los que hay que reintentar."""
+    def __init__(self, fallidos: list[Mensaje], causa: BaseException | None = None):
+        super().__init__(f"{len(fallidos)} mensajes sin entregar: {causa!r}")
+        self.fallidos = fallidos
+
+class Transporte(Protocol):
+    # Cualquier excepción cuenta como lote entero fallido, salvo EnvioParcial.
+    async def enviar_lote(self, dominio: str, mensajes: list[Mensaje]) -> None: ...
+
+class TransporteArchivo:
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._lock = asyncio.Lock()
+
+    async def enviar_lote(self, dominio: str, mensajes: list[Mensaje]) -> None:
+        lineas = "".join(f"{m.destino}\t{m.asunto}\t{m.cuerpo}\n" for m in mensajes)
+        async with self._lock:
+            # la E/S bloqueante va a un hilo: el bucle sigue atendiendo otros lotes
+            await asyncio.to_thread(self._escribir, lineas)
+
+    def _escribir(self, lineas: str) -> None:
+        with open(self.ruta, "a", encoding="utf-8") as f:
+            f.write(lineas)
+
+class TransporteSMTP:
+    def __init__(self, host: str = "localhost", puerto: int = 8025, remitente: str = "noreply@localhost"):
+        self.host, self.puerto, self.remitente = host, puerto, remitente
+
+    def _enviar(self, mensajes: list[Mensaje]) -> None:
+        fallidos: list[Mensaje] = []
+        causa: BaseException | None = None
+        with smtplib.SMTP(self.host, self.puerto) as smtp:
+            for m in mensajes:
+                # también la construcción: una cabecera inválida (p. ej. un salto de
+                # línea en el asunto) lanza ValueError y no debe cortar el lote a medias
+                try:
+                    em = EmailMessage()
+                    em["From"], em["To"], em["Subject"] = self.remitente, m.destino, m.asunto
+                    em.set_content(m.cuerpo)
+                    smtp.send_message(em)
+                except (ValueError, smtplib.SMTPException) as e:
+                    fallidos.append(m)
+                    causa = e
+        if fallidos:
+            raise EnvioParcial(fallidos, causa)
+
+    async def enviar_lote(self, dominio: str, mensajes: list[Mensaje]) -> None:
+        await asyncio.to_thread(self._enviar, mensajes)
+
+class Outbox:
+    def __init__(self, transporte: Transporte, concurrencia: int = 8, lote: int = 100,
+                 reintentos: int = 3, espera_base: float = 0.1):
+        if concurrencia < 1 or lote < 1:
+            raise ValueError("concurrencia y lote deben ser >= 1")
+        self.transporte = transporte
+        self.concurrencia, self.lote = concurrencia, lote
+        self.reintentos, self.espera_base = reintentos, espera_base
+        self._pendientes: list[Mensaje] = []
+        self.enviados = 0
+        self.fallidos: list[Mensaje] = []
+        self.reintentos_hechos = 0
+        self.lotes = 0
+        self._latencias: list[float] = []
+        self._segundos = 0.0
+
+    def encolar(self, m: Mensaje) -> None:
+        self._pendientes.append(m)
+
+    def _lotes(self) -> list[tuple[str, list[Mensaje]]]:
+        por_dominio: dict[str, list[Mensaje]] = {}
+        for m in self._pendientes:
+            por_dominio.setdefault(m.destino.rsplit("@", 1)[-1], []).append(m)
+        return [(dom, ms[i:i + self.lote])
+                for dom, ms in por_dominio.items()
+                for i in range(0, len(ms), self.lote)]
+
+    async def _enviar(self, sem: asyncio.Semaphore, dominio: str, mensajes: list[Mensaje]) -> None:
+        async with sem:
+            for intento in range(self.reintentos + 1):
+                t0 = time.perf_counter()
+                try:
+                    await self.transporte.enviar_lote(dominio, mensajes)
+                except Exception as e:
+                    if isinstance(e, EnvioParcial):
+                        # se reintenta solo lo no entregado: nadie recibe un mensaje dos veces
+                        self.enviados += len(mensajes) - len(e.fallidos)
+                        mensajes = e.fallidos
+                    if intento == self.reintentos:
+                        self.fallidos.extend(mensajes)
+                        return
+                    self.reintentos_hechos += 1
+                    await asyncio.sleep(self.espera_base * 2 ** intento)
+                else:
+                    self._latencias.append(time.perf_counter() - t0)
+                    self.enviados += len(mensajes)
+                    self.lotes += 1
+                    return
+
+    async def vaciar(self) -> None:
+        """Envía todo lo pendiente. Los lotes que agotan reintentos quedan en `fallidos`."""
+        lotes = self._lotes()
+        self._pendientes = []
+        sem = asyncio.Semaphore(self.concurrencia)
+        t0 = time.perf_counter()
+        await asyncio.gather(*(self._enviar(sem, dom, ms) for dom, ms in lotes))
+        self._segundos += time.perf_counter() - t0
+
+    def estadisticas(self) -> dict:
+        lat = self._latencias
+        if len(lat) > 1:
+            q = quantiles(lat, n=100)
+            p50, p95 = q[49], q[94]
+        else:
+            p50 = p95 = lat[0] if lat else 0.0
+        return {
+            "enviados": self.enviados,
+            "fallidos": len(self.fallidos),
+            "lotes": self.lotes,
+            "reintentos": self.reintentos_hechos,
+            "mensajes_por_s": round(self.enviados / self._segundos, 1) if self._segundos else 0.0,
+            "latencia_lote_p50_ms": round(p50 * 1000, 3),
+            "latencia_lote_p95_ms": round(p95 * 1000, 3),
+        }
@@ -0,0 +1,345 @@
+# app/perfilado.py
+"""
+Instrumentación de funciones calientes (lab01 y lab02 llevan una versión mínima).
+
+El decorador `contador` de la sesión 1 imprime en cada llamada, y ese print
+cuesta más que muchas de las funciones que mide. @perfilar solo acumula:
+
+- llamadas, tiempo total (incluye lo que tarden las funciones llamadas) y
+  tiempo propio (descuenta el de otras funciones instrumentadas que se
+  ejecuten dentro, como el tottime de cProfile);
+- histograma de latencias log-lineal al estilo HDR: 8 subcubos por potencia
+  de 2 (error relativo < 12,5 %), un array fijo de contadores, así que
+  registrar es O(1) y no crece con las llamadas;
+- percentiles p50/p90/p99 y máximo a partir del histograma.
+
+Se enciende y apaga en caliente (activar/desactivar/perfilando, o la variable
+de entorno PERFILADO=1 al arrancar). Apagado no queda envoltorio: activar y
+desactivar cambian el atributo en su módulo (funciones de primer nivel) o en
+su clase (perfilar_metodos), así que quien llama por ese nombre ejecuta la
+función original sin coste añadido. Una referencia copiada mientras está
+encendido (from x import f) conserva el envoltorio, que comprueba el
+interruptor en cada llamada; una copiada mientras está apagado no se mide.
+Con PERFILADO_INFORME=<ruta> el informe se vuelca al salir (JSON si la ruta
+acaba en .json, tabla de texto si no).
+
+    from app.perfilado import perfilar, perfilar_metodos, informe
+
+    @perfilar
+    def procesar(...): ...
+
+    @perfilar_metodos
+    class Repositorio: ...
+
+    print(informe())
+
+Cada hilo acumula en sus propios contadores (sin lock en la ruta caliente)
+y el informe los suma. En una función recursiva el tiempo total cuenta cada
+nivel; el propio es correcto.
+
+Para ver dónde se va el tiempo sin decorar nada está muestreo.Muestreador
+(junto a cli.py), que toma muestras de la pila.
+"""
+from __future__ import annotations
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Callable, Iterator, NamedTuple
+
+# --- histograma ---
+BITS_SUBCUBO = 3
+SUBCUBOS = 1 << BITS_SUBCUBO             # 8 subcubos por potencia de 2
+_LINEAL = SUBCUBOS * 2                   # por debajo de 16 ns cada valor tiene su cubo
+N_CUBOS = SUBCUBOS * 64                  # hasta 2**63 ns
+
+def cubo(ns: int) -> int:
+    """Índice del cubo de una latencia en ns: se conservan los 4 bits más altos."""
+    if ns < _LINEAL:
+        return max(ns, 0)
+    desp = ns.bit_length() - BITS_SUBCUBO - 1
+    return SUBCUBOS * desp + (ns >> desp)
+
+def limite_inferior(indice: int) -> int:
+    if indice < _LINEAL:
+        return indice
+    desp = indice // SUBCUBOS - 1
+    return (indice - SUBCUBOS * desp) << desp
+
+def limite_superior(indice: int) -> int:
+    return limite_inferior(indice + 1) - 1
+
+# --- métricas ---
+class _Fragmento:
+    """Contadores de una función en un hilo: solo los escribe ese hilo, sin lock."""
+    __slots__ = ("total_ns", "propio_ns", "max_ns", "histograma")  # llamadas = sum(histograma)
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        self.total_ns = self.propio_ns = self.max_ns = 0
+        self.histograma = [0] * N_CUBOS
+
+class Metricas:
+    """Métricas de una función: la suma de los fragmentos de cada hilo que la ha llamado."""
+    __slots__ = ("nombre", "_fragmentos", "_lock")
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self._fragmentos: list[_Fragmento] = []
+        self._lock = threading.Lock()  # solo para dar de alta fragmentos
+
+    def fragmento(self) -> _Fragmento:
+        """Fragmento del hilo actual (se crea la primera vez)."""
+        fragmentos = _estado_hilo.datos[1]
+        f = fragmentos.get(self)
+        if f is None:
+            f = fragmentos[self] = _Fragmento()
+            with self._lock:
+                self._fragmentos.append(f)
+        return f
+
+    def reiniciar(self) -> None:
+        # con hilos en marcha puede perderse alguna llamada que se registre a la vez
+        for f in list(self._fragmentos):
+            f.reiniciar()
+
+    def registrar(self, total_ns: int, propio_ns: int) -> None:
+        _registrar(self.fragmento(), total_ns, propio_ns)
+
+    @property
+    def llamadas(self) -> int:
+        return sum(sum(f.histograma) for f in list(self._fragmentos))
+
+    @property
+    def total_ns(self) -> int:
+        return sum(f.total_ns for f in list(self._fragmentos))
+
+    @property
+    def propio_ns(self) -> int:
+        return sum(f.propio_ns for f in list(self._fragmentos))
+
+    @property
+    def max_ns(self) -> int:
+        return max((f.max_ns for f in list(self._fragmentos)), default=0)
+
+    @property
+    def histograma(self) -> list[int]:
+        total = [0] * N_CUBOS
+        for f in list(self._fragmentos):
+            for i, n in enumerate(f.histograma):
+                if n:
+                    total[i] += n
+        return total
+
+    def percentil(self, p: float, histograma: list[int] | None = None) -> int:
+        """Latencia (ns, punto medio del cubo) por debajo de la que queda el p % de las llamadas."""
+        histograma = histograma or self.histograma
+        n, maximo = sum(histograma), self.max_ns
+        if not n:
+            return 0
+        if p >= 100:
+            return maximo
+        objetivo = max(1, -(-n * p // 100))  # ceil sin floats
+        acumulado = 0
+        for i, c in enumerate(histograma):
+            acumulado += c
+            if acumulado >= objetivo:
+                return min((limite_inferior(i) + limite_superior(i)) // 2, maximo)
+        return maximo
+
+    def resumen(self) -> dict:
+        n, total, hist = self.llamadas, self.total_ns, self.histograma
+        return {
+            "funcion": self.nombre,
+            "llamadas": n,
+            "total_ms": total / 1e6,
+            "propio_ms": self.propio_ns / 1e6,
+            "media_us": total / n / 1e3 if n else 0.0,
+            "p50_us": self.percentil(50, hist) / 1e3,
+            "p90_us": self.percentil(90, hist) / 1e3,
+            "p99_us": self.percentil(99, hist) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "histograma": {limite_inferior(i): c for i, c in enumerate(hist) if c},
+        }
+
+def _registrar(f: _Fragmento, total_ns: int, propio_ns: int) -> None:
+    # igual que el final del envoltorio, donde va en línea
+    i = cubo(total_ns)
+    f.total_ns += total_ns
+    f.propio_ns += propio_ns
+    if total_ns > f.max_ns:
+        f.max_ns = total_ns
+    f.histograma[i] += 1
+
+REGISTRO: dict[str, Metricas] = {}
+_estado = {"activo": os.environ.get("PERFILADO", "") not in ("", "0")}
+class _EstadoHilo(threading.local):
+    def __init__(self):
+        # (tiempo de hijos instrumentados de cada marco abierto, fragmento por función);
+        # en una tupla para leer el estado del hilo con un solo acceso
+        self.datos: tuple[list[int], dict[Metricas, _Fragmento]] = ([], {})
+
+_estado_hilo = _EstadoHilo()
+
+class _Punto(NamedTuple):
+    """Atributo que activar/desactivar alternan entre la versión instrumentada y la original."""
+    propietario: Callable[[], object]
+    attr: str
+    original: object
+    instrumentado: object
+
+_PUNTOS: list[_Punto] = []
+
+def _intercambiar(encender: bool) -> None:
+    for p in _PUNTOS:
+        dueno = p.propietario()
+        if dueno is None:
+            continue
+        actual, nuevo = (p.original, p.instrumentado) if encender else (p.instrumentado, p.original)
+        # si alguien lo ha reasignado entretanto, no se toca
+        if vars(dueno).get(p.attr) is actual:
+            setattr(dueno, p.attr, nuevo)
+
+def activar() -> None:
+    _estado["activo"] = True
+    _intercambiar(True)
+
+def desactivar() -> None:
+    _estado["activo"] = False
+    _intercambiar(False)
+
+def activo() -> bool:
+    return _estado["activo"]
+
+@contextmanager
+def perfilando(reiniciar_antes: bool = True) -> Iterator[dict[str, Metricas]]:
+    """Activa la instrumentación dentro del bloque y restaura el estado anterior al salir."""
+    previo = _estado["activo"]
+    if reiniciar_antes:
+        reiniciar()
+    activar()
+    try:
+        yield REGISTRO
+    finally:
+        if not previo:
+            desactivar()
+
+def reiniciar() -> None:
+    for m in REGISTRO.values():
+        m.reiniciar()
+
+# --- decoradores ---
+def _envolver(func: Callable, nombre: str) -> Callable:
+    metricas = REGISTRO.setdefault(nombre, Metricas(nombre))
+    estado, hilo, reloj = _estado, _estado_hilo, perf_counter_ns
+    lineal, bits, sub = _LINEAL, BITS_SUBCUBO + 1, BITS_SUBCUBO
+
+    @functools.wraps(func)
+    def envoltorio(*args, **kwargs):
+        if not estado["activo"]:
+            return func(*args, **kwargs)
+        marcos, fragmentos = hilo.datos
+        marcos.append(0)
+        t0 = reloj()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            total = reloj() - t0
+            hijos = marcos.pop()
+            if marcos:
+                marcos[-1] += total
+            # _registrar y cubo() en línea: cada llamada a función cuenta en la ruta caliente
+            f = fragmentos.get(metricas) or metricas.fragmento()
+            if total < lineal:
+                f.histograma[total] += 1
+            else:
+                desp = total.bit_length() - bits
+                f.histograma[(desp << sub) + (total >> desp)] += 1
+            f.total_ns += total
+            f.propio_ns += total - hijos
+            if total > f.max_ns:
+                f.max_ns = total
+
+    envoltorio.metricas = metricas  # solo en el envoltorio: la función original no se toca
+    return envoltorio
+
+def perfilar(func: Callable | None = None, *, nombre: str | None = None):
+    """
+    @perfilar o @perfilar(nombre=...). Las métricas quedan en REGISTRO[nombre]
+    y en el atributo metricas del envoltorio (metricas_de(f) las encuentra
+    también desde la función original). Las funciones de primer nivel se devuelven sin envolver
+    si la instrumentación está apagada; anidadas y métodos sueltos siempre
+    llevan el envoltorio (para clases, mejor perfilar_metodos).
+    """
+    if func is None:
+        return functools.partial(perfilar, nombre=nombre)
+    envoltorio = _envolver(func, nombre or f"{func.__module__}.{func.__qualname__}")
+    if func.__qualname__ != func.__name__:
+        return envoltorio
+    modulo = func.__module__
+    _PUNTOS.append(_Punto(lambda: sys.modules.get(modulo), func.__name__, func, envoltorio))
+    return envoltorio if _estado["activo"] else func
+
+def metricas_de(f) -> Metricas:
+    """Métricas de una función o método instrumentado, envuelto o no."""
+    m = getattr(f, "metricas", None)
+    if isinstance(m, Metricas):
+        return m
+    for p in _PUNTOS:
+        if p.original is f or getattr(p.original, "__func__", None) is f:
+            return getattr(p.instrumentado, "__func__", p.instrumentado).metricas
+    raise ValueError(f"{getattr(f, '__qualname__', f)!r} no está instrumentada")
+
+def perfilar_metodos(cls: type) -> type:
+    """Instrumenta los métodos públicos definidos en la clase (no los heredados ni los _privados)."""
+    for attr, valor in list(vars(cls).items()):
+        if attr.startswith("_"):
+            continue
+        nombre = f"{cls.__module__}.{cls.__qualname__}.{attr}"
+        if isinstance(valor, (staticmethod, classmethod)):
+            instrumentado = type(valor)(_envolver(valor.__func__, nombre))
+        elif callable(valor):
+            instrumentado = _envolver(valor, nombre)
+        else:
+            continue
+        _PUNTOS.append(_Punto(lambda: cls, attr, valor, instrumentado))
+        if _estado["activo"]:
+            setattr(cls, attr, instrumentado)
+    return cls
+
+# --- informes ---
+def metricas(orden: str = "propio_ms", minimo_llamadas: int = 1) -> list[dict]:
+    filas = [m.resumen() for m in list(REGISTRO.values()) if m.llamadas >= minimo_llamadas]
+    return sorted(filas, key=lambda f: f[orden], reverse=True)
+
+def informe(orden: str = "propio_ms", top: int | None = None) -> str:
+    """Tabla de texto con las funciones instrumentadas que se han llamado."""
+    filas = metricas(orden)[:top]
+    cab = f"{'función':<48} {'llamadas':>9} {'total ms':>10} {'propio ms':>10} {'media µs':>9} {'p50 µs':>8} {'p90 µs':>8} {'p99 µs':>8} {'max µs':>9}"
+    lineas = [cab, "-" * len(cab)]
+    for f in filas:
+        lineas.append(f"{f['funcion'][-48:]:<48} {f['llamadas']:>9} {f['total_ms']:>10.3f} {f['propio_ms']:>10.3f} "
+                      f"{f['media_us']:>9.2f} {f['p50_us']:>8.2f} {f['p90_us']:>8.2f} {f['p99_us']:>8.2f} {f['max_us']:>9.2f}")
+    if not filas:
+        lineas.append("(sin llamadas registradas)")
+    return "\n".join(lineas)
+
+def volcar(ruta: Path | str) -> Path:
+    """Escribe el informe en `ruta`: JSON (con histogramas) si acaba en .json, tabla de texto si no."""
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    if ruta.suffix == ".json":
+        ruta.write_text(json.dumps(metricas(), ensure_ascii=False, indent=2), encoding="utf-8")
+    else:
+        ruta.write_text(informe() + "\n", encoding="utf-8")
+    return ruta
+
+if os.environ.get("PERFILADO_INFORME"):
+    atexit.register(volcar, os.environ["PERFILADO_INFORME"])
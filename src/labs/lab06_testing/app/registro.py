@@ -0,0 +1,139 @@
+# app/registro.py
+"""
+Sinks de log para LoggerMixin.
+
+- SinkConsola: comportamiento original (print síncrono por evento).
+- SinkArchivoAsync: cola acotada + hilo escritor que vuelca por lotes (por
+  tamaño o por tiempo) a un archivo. El hilo que loguea solo encola una
+  tupla; el formateo de la fecha y la E/S ocurren en el escritor.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+Evento = tuple[float, str, str, str, dict]  # (ts, clase, quien, msg, contexto)
+
+def formatear(ev: Evento) -> str:
+    ts, clase, who, msg, context = ev
+    extra = f" {context}" if context else ""
+    return f"[{datetime.fromtimestamp(ts).isoformat(timespec='seconds')}] [{clase}] <{who}> {msg}{extra}"
+
+class SinkConsola:
+    def emitir(self, ev: Evento) -> None:
+        print(formatear(ev))
+
+    def cerrar(self) -> None:
+        pass
+
+class SinkArchivoAsync:
+    """
+    politica: "bloquear" (el productor espera si la cola está llena) o
+    "descartar" (el evento se pierde y se cuenta en `descartados`).
+
+    Un lote se escribe al juntar `lote` eventos o cuando el primero lleva
+    `intervalo` segundos esperando, lo que ocurra antes; cerrar() vuelca lo
+    pendiente. Si el escritor falla (no se puede abrir el archivo, un evento
+    no se puede formatear...), sigue vaciando la cola para no bloquear a
+    nadie, los eventos cuentan como descartados y emitir/cerrar lanzan
+    RuntimeError con el error original como causa. emitir y cerrar comparten
+    un lock: ningún evento se encola detrás de la marca de fin.
+    """
+    POLITICAS = {"bloquear", "descartar"}
+    _FIN = object()
+
+    def __init__(self, ruta: str, capacidad: int = 10_000, lote: int = 1_000,
+                 intervalo: float = 0.5, politica: str = "bloquear"):
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política inválida: {politica!r}. Válidas: {sorted(self.POLITICAS)}")
+        self.ruta, self.lote, self.intervalo, self.politica = ruta, lote, intervalo, politica
+        self.escritos = 0
+        self.descartados = 0
+        self.lotes = 0
+        self.error: Exception | None = None
+        self._cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        self._lock_descartes = threading.Lock()
+        self._lock_cierre = threading.Lock()  # comprobar _cerrado y encolar, sin hueco entre medias
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._escritor, name="log-sink", daemon=True)
+        self._hilo.start()
+
+    def _comprobar(self) -> None:
+        if self.error is not None:
+            raise RuntimeError(f"El escritor del sink falló: {self.error!r}") from self.error
+
+    def emitir(self, ev: Evento) -> None:
+        with self._lock_cierre:
+            if self._cerrado:
+                raise RuntimeError("Sink cerrado")
+            self._comprobar()
+            if self.politica == "bloquear":
+                # bloquear con el lock es seguro: el escritor no para de vaciar hasta ver _FIN
+                self._cola.put(ev)
+                return
+            try:
+                self._cola.put_nowait(ev)
+            except queue.Full:
+                self._descartar(1)
+
+    def _descartar(self, n: int) -> None:
+        with self._lock_descartes:
+            self.descartados += n
+
+    def _escritor(self) -> None:
+        cola = self._cola
+        fin = False
+        pendientes: list[Evento] = []
+        try:
+            with open(self.ruta, "a", encoding="utf-8") as f:
+                while not fin:
+                    ev = cola.get()
+                    limite = time.monotonic() + self.intervalo
+                    while True:
+                        if ev is self._FIN:
+                            fin = True
+                            break
+                        pendientes.append(ev)
+                        restante = limite - time.monotonic()
+                        if len(pendientes) >= self.lote or restante <= 0:
+                            break
+                        try:
+                            ev = cola.get(timeout=restante)
+                        except queue.Empty:
+                            break
+                    if pendientes:
+                        f.write("\n".join(map(formatear, pendientes)) + "\n")
+                        f.flush()
+                        self.escritos += len(pendientes)
+                        self.lotes += 1
+                        pendientes = []
+        except Exception as e:
+            self.error = e
+            self._descartar(len(pendientes))
+            # seguir consumiendo: productores con "bloquear" y cerrar() no se quedan colgados
+            while not fin:
+                if cola.get() is self._FIN:
+                    fin = True
+                else:
+                    self._descartar(1)
+
+    def cerrar(self) -> None:
+        """Vacía la cola y espera al escritor. Idempotente."""
+        with self._lock_cierre:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._cola.put(self._FIN)  # siempre bloqueante: el fin no se descarta
+        self._hilo.join()
+        self._comprobar()
+
+    def __enter__(self) -> "SinkArchivoAsync":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+def evento(clase: str, who: str, msg: str, context: dict[str, Any]) -> Evento:
+    return (time.time(), clase, who, msg, context)
@@ -1,6 +1,8 @@
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+from .perfilado import perfilar_metodos
 from .modelos import Usuario
 
+@perfilar_metodos
 class RepositorioUsuarios:
     def __init__(self):
         self._por_email: dict[str, Usuario] = {}
@@ -20,5 +22,16 @@ class RepositorioUsuarios:
     def eliminar(self, email: str):
         self._por_email.pop(email.strip().lower(), None)
 
+    def __len__(self) -> int:
+        return len(self._por_email)
+
+    def __iter__(self) -> Iterator[Usuario]:
+        # sin copiar a una lista: exportar millones de usuarios no duplica memoria
+        return iter(self._por_email.values())
+
     def buscar(self, pred: Callable[[Usuario], bool]):
-        return [u for u in self._por_email.values() if pred(u)]
\ No newline at end of file
+        return [u for u in self._por_email.values() if pred(u)]
+
+def usuarios_con_permiso(repo: RepositorioUsuarios, permiso: str) -> list[Usuario]:
+    """Usuarios del repositorio que tienen `permiso` (comprobación O(1) por usuario)."""
+    return repo.buscar(lambda u: permiso in u.permisos())
@@ -0,0 +1,139 @@
+# app/seguridad.py
+"""
+Hash de contraseñas con sal (scrypt / PBKDF2 de hashlib) y un pool para
+calcularlos fuera del hilo que atiende peticiones.
+
+Formato almacenado (autodescriptivo, así se puede subir el coste sin
+invalidar hashes antiguos):
+    scrypt$<n>$<r>$<p>$<sal_hex>$<hash_hex>
+    pbkdf2_sha256$<iteraciones>$<sal_hex>$<hash_hex>
+"""
+from __future__ import annotations
+import asyncio
+import hashlib
+import hmac
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable
+
+class HasherScrypt:
+    """scrypt con coste n (potencia de 2), tamaño de bloque r y paralelismo p."""
+    algoritmo = "scrypt"
+    # Tope al verificar hashes almacenados: n*r (memoria ~128*n*r bytes, 256 MiB) y p.
+    # Si el hasher está configurado por encima, manda su configuración.
+    MAX_N_R = 2**21
+    MAX_P = 16
+
+    def __init__(self, n: int = 2**14, r: int = 8, p: int = 1, dklen: int = 32, sal_bytes: int = 16):
+        if n < 2 or n & (n - 1):
+            raise ValueError("n debe ser potencia de 2 >= 2")
+        self.n, self.r, self.p, self.dklen, self.sal_bytes = n, r, p, dklen, sal_bytes
+
+    def _derivar(self, password: str, sal: bytes, n: int, r: int, p: int) -> bytes:
+        # maxmem holgado: scrypt necesita ~128*n*r bytes
+        return hashlib.scrypt(password.encode(), salt=sal, n=n, r=r, p=p,
+                              dklen=self.dklen, maxmem=256 * n * r + 2**20)
+
+    def hash(self, password: str) -> str:
+        sal = os.urandom(self.sal_bytes)
+        dk = self._derivar(password, sal, self.n, self.r, self.p)
+        return f"scrypt${self.n}${self.r}${self.p}${sal.hex()}${dk.hex()}"
+
+    def verificar(self, password: str, almacenado: str) -> bool:
+        # Un hash corrupto o manipulado da False, nunca excepción; y sus parámetros
+        # se acotan para que no pueda forzar una derivación desmesurada.
+        try:
+            alg, n, r, p, sal, dk = almacenado.split("$")
+            n, r, p, sal, dk = int(n), int(r), int(p), bytes.fromhex(sal), bytes.fromhex(dk)
+        except (AttributeError, ValueError):
+            return False
+        if alg != self.algoritmo or n < 2 or n & (n - 1) or r < 1 or p < 1:
+            return False
+        if n * r > max(self.n * self.r, self.MAX_N_R) or p > max(self.p, self.MAX_P):
+            return False
+        return hmac.compare_digest(self._derivar(password, sal, n, r, p), dk)
+
+class HasherPBKDF2:
+    """PBKDF2-HMAC-SHA256 con número de iteraciones configurable."""
+    algoritmo = "pbkdf2_sha256"
+    MAX_ITERACIONES = 5_000_000  # tope al verificar (ver HasherScrypt.MAX_N_R)
+
+    def __init__(self, iteraciones: int = 600_000, sal_bytes: int = 16):
+        if iteraciones < 1:
+            raise ValueError("iteraciones debe ser >= 1")
+        self.iteraciones, self.sal_bytes = iteraciones, sal_bytes
+
+    def hash(self, password: str) -> str:
+        sal = os.urandom(self.sal_bytes)
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode(), sal, self.iteraciones)
+        return f"{self.algoritmo}${self.iteraciones}${sal.hex()}${dk.hex()}"
+
+    def verificar(self, password: str, almacenado: str) -> bool:
+        try:
+            alg, it, sal, dk = almacenado.split("$")
+            it, sal, dk = int(it), bytes.fromhex(sal), bytes.fromhex(dk)
+        except (AttributeError, ValueError):
+            return False
+        if alg != self.algoritmo or not 1 <= it <= max(self.iteraciones, self.MAX_ITERACIONES):
+            return False
+        calculado = hashlib.pbkdf2_hmac("sha256", password.encode(), sal, it)
+        return hmac.compare_digest(calculado, dk)
+
+_CONOCIDOS = (HasherScrypt(), HasherPBKDF2())
+
+def verificar(password: str, almacenado: str | None, hashers: Iterable = ()) -> bool:
+    """Verifica contra cualquier algoritmo conocido, según el prefijo del hash."""
+    if not almacenado:
+        return False
+    alg = almacenado.split("$", 1)[0]
+    for h in (*hashers, *_CONOCIDOS):
+        if h.algoritmo == alg:
+            return h.verificar(password, almacenado)
+    return False
+
+# --- Pool de hashing ---
+def _hash(hasher, password: str) -> str:
+    return hasher.hash(password)
+
+def _verificar(hasher, password: str, almacenado: str | None) -> bool:
+    return verificar(password, almacenado, (hasher,))
+
+class PoolHashing:
+    """
+    Ejecuta hash/verificación en un pool. hashlib.scrypt y pbkdf2_hmac liberan
+    el GIL, así que los hilos escalan; con procesos=True se usa un
+    ProcessPoolExecutor (el hasher debe ser pickleable, como los de arriba).
+    """
+    def __init__(self, hasher=None, max_workers: int | None = None, procesos: bool = False):
+        self.hasher = hasher or HasherScrypt()
+        workers = max_workers or os.cpu_count() or 1
+        self._executor: Executor = (ProcessPoolExecutor(workers) if procesos
+                                    else ThreadPoolExecutor(workers, thread_name_prefix="hash"))
+
+    def hash(self, password: str) -> Future:
+        return self._executor.submit(_hash, self.hasher, password)
+
+    def verificar(self, password: str, almacenado: str | None) -> Future:
+        return self._executor.submit(_verificar, self.hasher, password, almacenado)
+
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.hash(password))
+
+    async def averificar(self, password: str, almacenado: str | None) -> bool:
+        return await asyncio.wrap_future(self.verificar(password, almacenado))
+
+    def hash_lote(self, passwords: Iterable[str]) -> list[str]:
+        return [f.result() for f in [self.hash(p) for p in passwords]]
+
+    def verificar_lote(self, pares: Iterable[tuple[str, str | None]]) -> list[bool]:
+        """Verifica (password, hash) en paralelo; útil en migraciones. Conserva el orden."""
+        return [f.result() for f in [self.verificar(p, h) for p, h in pares]]
+
+    def cerrar(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "PoolHashing":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
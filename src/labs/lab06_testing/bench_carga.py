@@ -0,0 +1,47 @@
+# bench_carga.py
+"""
+Carga masiva: bucle de Usuario.desde_dict frente a Usuario.desde_registros.
+
+    python bench_carga.py -n 1000000
+"""
+import argparse
+import time
+from app.modelos import Usuario
+
+ROLES = ["usuario", "Admin", " invitado ", "MODERADOR"]
+
+def generar(n: int) -> list[dict]:
+    return [
+        {"nombre": f"user{i}", "email": f" User{i}@Test.com ", "rol": ROLES[i % 4], "activo": i % 3 != 0}
+        for i in range(n)
+    ]
+
+def con_desde_dict(registros: list[dict]) -> list[Usuario]:
+    usuarios = []
+    for d in registros:
+        try:
+            usuarios.append(Usuario.desde_dict(d))
+        except ValueError:
+            pass
+    return usuarios
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_carga")
+    p.add_argument("-n", type=int, default=1_000_000, help="Número de registros")
+    args = p.parse_args()
+    registros = generar(args.n)
+
+    t0 = time.perf_counter()
+    a = con_desde_dict(registros)
+    t1 = time.perf_counter()
+    b, errores = Usuario.desde_registros(registros)
+    t2 = time.perf_counter()
+
+    assert len(a) == len(b) and not errores
+    print(f"n={args.n:,}")
+    print(f"  desde_dict (bucle): {t1 - t0:7.3f} s  {args.n / (t1 - t0):12,.0f} filas/s")
+    print(f"  desde_registros   : {t2 - t1:7.3f} s  {args.n / (t2 - t1):12,.0f} filas/s")
+    print(f"  speedup           : {(t1 - t0) / (t2 - t1):5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# bench_hashing.py
+"""
+Logins/s según el coste de scrypt: verificación secuencial frente a PoolHashing.
+
+    python bench_hashing.py --logins 64 --workers 8
+"""
+import argparse
+import os
+import time
+from app.seguridad import HasherScrypt, PoolHashing
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_hashing")
+    p.add_argument("--logins", type=int, default=64, help="Verificaciones por medida")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--costes", type=int, nargs="+", default=[12, 13, 14, 15], help="log2(n) de scrypt")
+    args = p.parse_args()
+
+    print(f"{'n':>8} {'secuencial':>12} {'hilos':>12} {'procesos':>12}   (logins/s, {args.workers} workers)")
+    for log_n in args.costes:
+        hasher = HasherScrypt(n=2**log_n)
+        h = hasher.hash("secreta1")
+        pares = [("secreta1", h)] * args.logins
+
+        t0 = time.perf_counter()
+        assert all(hasher.verificar(pw, hh) for pw, hh in pares)
+        sec = args.logins / (time.perf_counter() - t0)
+
+        res = []
+        for procesos in (False, True):
+            with PoolHashing(hasher, max_workers=args.workers, procesos=procesos) as pool:
+                pool.verificar_lote(pares[:args.workers])  # calentar el pool
+                t0 = time.perf_counter()
+                assert all(pool.verificar_lote(pares))
+                res.append(args.logins / (time.perf_counter() - t0))
+        print(f"{2**log_n:>8} {sec:>12.1f} {res[0]:>12.1f} {res[1]:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bench_memoria.py
+"""
+Memoria por usuario con tracemalloc: Usuario (slots) frente a una clase
+equivalente con __dict__.
+
+    python bench_memoria.py -n 1000000
+"""
+import argparse
+import gc
+import tracemalloc
+from app.modelos import Usuario
+
+class UsuarioConDict:
+    """Mismos atributos y normalización que Usuario, sin __slots__ (referencia)."""
+    def __init__(self, nombre: str, email: str, rol: str = "usuario", activo: bool = True):
+        self.nombre = nombre
+        self._email = email.strip().lower()
+        self._rol = rol.strip().lower()
+        self.activo = activo
+        self.__password_hash = None
+
+def medir(cls, n: int) -> float:
+    """Bytes por instancia (solo objetos, sin contar las cadenas de entrada)."""
+    nombres = [f"user{i}" for i in range(n)]
+    emails = [f"user{i}@test.com" for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    objs = [cls(nombres[i], emails[i]) for i in range(n)]
+    despues, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # las cadenas normalizadas (strip/lower) y la propia lista entran en la cifra
+    assert len(objs) == n
+    return (despues - antes) / n
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_memoria")
+    p.add_argument("-n", type=int, default=1_000_000, help="Número de usuarios")
+    args = p.parse_args()
+
+    con_dict = medir(UsuarioConDict, args.n)
+    con_slots = medir(Usuario, args.n)
+    print(f"n={args.n:,}")
+    print(f"  __dict__ : {con_dict:8.1f} B/usuario")
+    print(f"  __slots__: {con_slots:8.1f} B/usuario")
+    print(f"  ahorro   : {100 * (1 - con_slots / con_dict):5.1f} %")
+
+if __name__ == "__main__":
+    main()
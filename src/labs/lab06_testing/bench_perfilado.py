@@ -0,0 +1,64 @@
+# bench_perfilado.py
+"""
+Coste por llamada de la instrumentación sobre RepositorioUsuarios.obtener_por_email:
+sin decorar, con el decorador `contador` de la sesión 1 (print a /dev/null),
+con @perfilar apagado y encendido.
+
+    python bench_perfilado.py -n 1000000
+"""
+import argparse
+import contextlib
+import os
+import time
+from app.modelos import Usuario
+from app.repositorio import RepositorioUsuarios
+from app import perfilado
+
+def contador(func):
+    llamadas = 0
+
+    def wrapper(*args, **kwargs):
+        nonlocal llamadas
+        llamadas += 1
+        print(f"La funcion {func.__name__} se ha llamado {llamadas} veces")
+        return func(*args, **kwargs)
+    return wrapper
+
+def ns_por_llamada(f, n: int) -> float:
+    t0 = time.perf_counter_ns()
+    for _ in range(n):
+        f("user1@test.com")
+    return (time.perf_counter_ns() - t0) / n
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_perfilado")
+    p.add_argument("-n", type=int, default=1_000_000)
+    args = p.parse_args()
+
+    repo = RepositorioUsuarios()
+    for i in range(1_000):
+        repo.agregar(Usuario(f"user{i}", f"user{i}@test.com"))
+
+    perfilado.desactivar()
+    original = RepositorioUsuarios.obtener_por_email
+    base = ns_por_llamada(original.__get__(repo), args.n)
+    # con la instrumentación apagada la clase tiene la función original: se mide por el atributo
+    apagado = ns_por_llamada(repo.obtener_por_email, args.n)
+    with perfilado.perfilando():
+        copia = repo.obtener_por_email  # referencia tomada con el envoltorio puesto
+        encendido = ns_por_llamada(copia, args.n)
+        informe = perfilado.informe()
+    apagado_copia = ns_por_llamada(copia, args.n)
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        con_print = ns_por_llamada(contador(original).__get__(repo), args.n)
+
+    print(f"{'variante':<30} {'ns/llamada':>11} {'sobrecoste':>11}")
+    for nombre, ns in (("sin decorar", base), ("@perfilar apagado", apagado),
+                       ("@perfilar apagado (copia)", apagado_copia), ("@perfilar encendido", encendido),
+                       ("contador (print)", con_print)):
+        print(f"{nombre:<30} {ns:>11.0f} {ns - base:>+10.0f}")
+    print()
+    print(informe)
+
+if __name__ == "__main__":
+    main()
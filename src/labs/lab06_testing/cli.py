@@ -1,9 +1,21 @@
 import argparse
+import cProfile
+import pstats
+import sys
+import time
+from app import intercambio
 from app.modelos import Usuario, Admin, Invitado, Moderador
 from app.repositorio import RepositorioUsuarios
+from muestreo import Muestreador
 
 repo = RepositorioUsuarios()  # en memoria (ciclo de proceso)
 
+def _positivo(texto: str) -> int:
+    n = int(texto)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"debe ser >= 1: {n}")
+    return n
+
 def cmd_crear(args):
     rol = args.rol.lower()
     if rol == "admin":
@@ -26,8 +38,97 @@ def cmd_eliminar(args):
     repo.eliminar(args.email)
     print(f"Eliminado (si existía): {args.email}")
 
+# --- importar / exportar ---
+def _progreso(verbo: str):
+    def informar(filas: int, segundos: float) -> None:
+        print(f"  {verbo} {filas:,} filas ({filas / segundos if segundos else 0:,.0f} filas/s)", file=sys.stderr)
+    return informar
+
+def _importar(rutas, formato, tam_lote: int, cada: int) -> bool:
+    """Importa cada fichero en `repo` y muestra el resumen; False si hubo errores."""
+    ok = True
+    for ruta in rutas:
+        res = intercambio.importar(repo, intercambio.leer(ruta, formato), tam_lote=tam_lote,
+                                   progreso=_progreso("leídas"), cada=cada)
+        print(f"{ruta}: {res.correctas:,} de {res.filas:,} filas importadas, {res.n_errores:,} errores "
+              f"en {res.segundos:.2f} s ({res.filas_por_segundo:,.0f} filas/s)")
+        for fila, msg in res.errores:
+            print(f"  fila {fila}: {msg}", file=sys.stderr)
+        if res.n_errores > len(res.errores):
+            print(f"  … y {res.n_errores - len(res.errores):,} errores más", file=sys.stderr)
+        ok = ok and not res.n_errores
+    return ok
+
+def cmd_importar(args):
+    if not _importar(args.entrada, args.formato, args.lote, args.progreso):
+        sys.exit(1)
+
+def cmd_exportar(args):
+    # el repositorio vive solo lo que dura el proceso: --desde carga antes los ficheros
+    # (convertir CSV <-> JSONL, deduplicar por email, filtrar activos)
+    _importar(args.desde, None, args.lote, args.progreso)
+    usuarios = (u for u in repo if u.activo) if args.solo_activos else iter(repo)
+    res = intercambio.exportar(usuarios, args.salida, args.formato, progreso=_progreso("escritas"), cada=args.progreso)
+    print(f"{args.salida}: {res.filas:,} filas exportadas en {res.segundos:.2f} s ({res.filas_por_segundo:,.0f} filas/s)")
+
+# --- bench ---
+ROLES_BENCH = ("usuario", "admin", "invitado", "moderador")
+
+def cmd_bench(args):
+    """Crea N usuarios sintéticos en un repositorio aparte y mide crear/listar/eliminar."""
+    n = args.n
+    datos = [(f"bench{i}", f"bench{i}@bench.test", ROLES_BENCH[i % 4], i % 3 != 0) for i in range(n)]
+    r = RepositorioUsuarios()
+    t0 = time.perf_counter()
+    for nombre, email, rol, activo in datos:
+        r.agregar(Usuario(nombre, email, rol, activo))
+    t1 = time.perf_counter()
+    for _ in range(args.listados):
+        activos = r.listar_activos()
+    t2 = time.perf_counter()
+    for _, email, _, _ in datos:
+        r.eliminar(email)
+    t3 = time.perf_counter()
+    assert not r.listar_activos()
+
+    print(f"{n:,} usuarios ({len(activos):,} activos)")
+    print(f"{'operación':<10} {'total ms':>10} {'µs/usuario':>11} {'usuarios/s':>12}")
+    for op, seg, veces in (("crear", t1 - t0, n), ("listar", t2 - t1, n * args.listados), ("eliminar", t3 - t2, n)):
+        print(f"{op:<10} {seg * 1e3:>10.1f} {seg / max(veces, 1) * 1e6:>11.3f} {veces / seg if seg else 0:>12,.0f}")
+
+# --- perfilado ---
+EXTENSIONES_PERFIL = {"cprofile": "pstats", "muestreo": "folded"}
+
+def ejecutar(args):
+    """Ejecuta el subcomando; con --profile, bajo cProfile o el muestreador de pila."""
+    if not args.profile:
+        return args.func(args)
+    salida = args.profile_salida or f"usuarios-{args.cmd}.{EXTENSIONES_PERFIL[args.profile]}"
+    if args.profile == "cprofile":
+        prof = cProfile.Profile()
+        try:
+            return prof.runcall(args.func, args)
+        finally:
+            prof.dump_stats(salida)
+            # resumen a stderr para no mezclarlo con la salida del comando
+            pstats.Stats(prof, stream=sys.stderr).sort_stats("cumulative").print_stats(args.profile_top)
+            print(f"Perfil cProfile en {salida} (python -m pstats {salida})", file=sys.stderr)
+    muestreador = Muestreador(args.profile_intervalo / 1000)
+    try:
+        with muestreador:
+            return args.func(args)
+    finally:
+        muestreador.volcar(salida)
+        print(f"{muestreador.total} muestras en {salida} (flamegraph.pl {salida} > perfil.svg, "
+              f"o ábrelo en speedscope)", file=sys.stderr)
+
 def build_parser():
     p = argparse.ArgumentParser(prog="usuarios")
+    p.add_argument("--profile", choices=sorted(EXTENSIONES_PERFIL),
+                   help="Perfilar el subcomando: cprofile (pstats) o muestreo (pilas colapsadas)")
+    p.add_argument("--profile-salida", help="Fichero del perfil (por defecto usuarios-<cmd>.pstats|.folded)")
+    p.add_argument("--profile-intervalo", type=float, default=1.0, help="ms entre muestras (muestreo)")
+    p.add_argument("--profile-top", type=int, default=15, help="Funciones del resumen (cprofile)")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     p_crear = sub.add_parser("crear", help="Crear usuario")
@@ -45,12 +146,33 @@ def build_parser():
     p_del.add_argument("email")
     p_del.set_defaults(func=cmd_eliminar)
 
+    p_bench = sub.add_parser("bench", help="Medir crear/listar/eliminar con N usuarios sintéticos")
+    p_bench.add_argument("-n", type=int, default=100_000, help="Número de usuarios")
+    p_bench.add_argument("--listados", type=_positivo, default=10, help="Veces que se lista el repositorio")
+    p_bench.set_defaults(func=cmd_bench)
+
+    p_imp = sub.add_parser("importar", help="Importar usuarios desde CSV o JSON Lines")
+    p_imp.add_argument("entrada", nargs="+", help="Ficheros .csv, .jsonl o .ndjson")
+    p_imp.add_argument("--formato", choices=intercambio.FORMATOS, help="Forzar formato (si no, por extensión)")
+    p_imp.set_defaults(func=cmd_importar)
+
+    p_exp = sub.add_parser("exportar", help="Exportar usuarios a CSV o JSON Lines")
+    p_exp.add_argument("salida", help="Fichero .csv, .jsonl o .ndjson")
+    p_exp.add_argument("--formato", choices=intercambio.FORMATOS, help="Forzar formato (si no, por extensión)")
+    p_exp.add_argument("--desde", nargs="+", default=[], metavar="ENTRADA", help="Ficheros a cargar antes de exportar")
+    p_exp.add_argument("--solo-activos", action="store_true")
+    p_exp.set_defaults(func=cmd_exportar)
+
+    for sp in (p_imp, p_exp):
+        sp.add_argument("--lote", type=_positivo, default=intercambio.TAM_LOTE, help="Filas validadas por lote")
+        sp.add_argument("--progreso", type=_positivo, default=100_000, help="Informar cada N filas (stderr)")
+
     return p
 
-def main():
+def main(argv=None):
     parser = build_parser()
-    args = parser.parse_args()
-    args.func(args)
+    args = parser.parse_args(argv)
+    ejecutar(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
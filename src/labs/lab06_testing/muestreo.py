@@ -0,0 +1,80 @@
+# muestreo.py
+"""
+Perfilado por muestreo de pila para el CLI (usuarios --profile muestreo).
+"""
+from __future__ import annotations
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+class Muestreador:
+    """
+    Perfilador por muestreo: un hilo aparte lee cada `intervalo` segundos la
+    pila del hilo objetivo (por defecto, el que lo crea) y cuenta cuántas veces
+    aparece cada pila. No toca el código medido, así que sirve para programas
+    enteros. La salida es el formato colapsado ("a;b;c N") de flamegraph.pl y
+    speedscope. Con el GIL, mientras el objetivo no suelte el intérprete las
+    muestras llegan cada sys.getswitchinterval() (5 ms) como mínimo.
+
+        with Muestreador(0.001) as m:
+            trabajo()
+        m.volcar("perfil.folded")
+    """
+
+    def __init__(self, intervalo: float = 0.001, hilo: int | None = None):
+        self.intervalo = intervalo
+        self.objetivo = hilo if hilo is not None else threading.get_ident()
+        self.muestras: Counter[str] = Counter()
+        self._nombres: dict[object, str] = {}
+        self._parar = threading.Event()
+        self._hilo: threading.Thread | None = None
+
+    def _nombre(self, marco) -> str:
+        codigo = marco.f_code
+        nombre = self._nombres.get(codigo)
+        if nombre is None:
+            nombre = self._nombres[codigo] = f"{marco.f_globals.get('__name__', '?')}.{codigo.co_qualname}"
+        return nombre
+
+    def _bucle(self) -> None:
+        marcos, objetivo, muestras = sys._current_frames, self.objetivo, self.muestras
+        while not self._parar.wait(self.intervalo):
+            marco = marcos().get(objetivo)
+            pila = []
+            while marco is not None:
+                pila.append(self._nombre(marco))
+                marco = marco.f_back
+            if pila:
+                muestras[";".join(reversed(pila))] += 1
+
+    def iniciar(self) -> "Muestreador":
+        self._parar.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="muestreador", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self) -> None:
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def __enter__(self) -> "Muestreador":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.detener()
+
+    @property
+    def total(self) -> int:
+        return sum(self.muestras.values())
+
+    def colapsado(self) -> str:
+        return "\n".join(f"{pila} {n}" for pila, n in self.muestras.most_common())
+
+    def volcar(self, ruta: Path | str) -> Path:
+        ruta = Path(ruta)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_text(self.colapsado() + "\n", encoding="utf-8")
+        return ruta
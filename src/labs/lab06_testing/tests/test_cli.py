@@ -0,0 +1,69 @@
+import contextlib
+import io
+import pstats
+import tempfile
+import time
+import unittest
+from pathlib import Path
+import cli
+from muestreo import Muestreador
+
+def ejecutar(*argv: str) -> tuple[str, str]:
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        cli.main(list(argv))
+    return out.getvalue(), err.getvalue()
+
+def ocupado(segundos: float) -> int:
+    fin, n = time.perf_counter() + segundos, 0
+    while time.perf_counter() < fin:
+        n += 1
+    return n
+
+class TestBench(unittest.TestCase):
+    def test_bench_crear_listar_eliminar(self):
+        out, _ = ejecutar("bench", "-n", "300", "--listados", "2")
+        self.assertIn("300 usuarios (200 activos)", out)
+        for op in ("crear", "listar", "eliminar"):
+            self.assertIn(op, out)
+        self.assertEqual(cli.repo.listar_activos(), [])  # no toca el repositorio del CLI
+
+    def test_listados_debe_ser_positivo(self):
+        for valor in ("0", "-1"):
+            with self.subTest(listados=valor), self.assertRaises(SystemExit) as cm:
+                ejecutar("bench", "-n", "10", "--listados", valor)
+            self.assertEqual(cm.exception.code, 2)
+
+class TestProfile(unittest.TestCase):
+    def test_cprofile_escribe_pstats(self):
+        with tempfile.TemporaryDirectory() as d:
+            ruta = Path(d) / "bench.pstats"
+            out, err = ejecutar("--profile", "cprofile", "--profile-salida", str(ruta), "bench", "-n", "200")
+            self.assertIn("200 usuarios", out)
+            self.assertIn("cumulative", err)
+            funciones = {f[2] for f in pstats.Stats(str(ruta)).stats}
+        self.assertIn("cmd_bench", funciones)
+        self.assertIn("agregar", funciones)
+
+    def test_muestreo_escribe_pilas_colapsadas(self):
+        with tempfile.TemporaryDirectory() as d:
+            ruta = Path(d) / "bench.folded"
+            ejecutar("--profile", "muestreo", "--profile-salida", str(ruta), "bench", "-n", "20000")
+            lineas = ruta.read_text(encoding="utf-8").splitlines()
+        self.assertTrue(lineas)
+        for linea in lineas:
+            pila, n = linea.rsplit(" ", 1)
+            self.assertGreater(int(n), 0)
+        self.assertTrue(any("cli.cmd_bench" in l for l in lineas))
+
+class TestMuestreador(unittest.TestCase):
+    def test_cuenta_la_pila_del_hilo_objetivo(self):
+        with Muestreador(0.001) as m:
+            ocupado(0.2)
+        self.assertGreater(m.total, 5)
+        pila, _ = m.muestras.most_common(1)[0]
+        self.assertTrue(pila.endswith("test_cli.ocupado"), pila)
+        self.assertNotIn("Muestreador._bucle", m.colapsado())  # no se muestrea a sí mismo
+
+if __name__ == "__main__":
+    unittest.main()
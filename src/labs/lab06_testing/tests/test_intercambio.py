@@ -0,0 +1,178 @@
+import contextlib
+import io
+import json
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+import cli
+from app import intercambio
+from app.modelos import Admin, Invitado, Moderador, Usuario
+from app.repositorio import RepositorioUsuarios
+
+def sinteticos(n: int):
+    for i in range(n):
+        yield {"nombre": f"user{i}", "email": f"user{i}@test.com", "rol": ("usuario", "admin")[i % 2], "activo": i % 3 != 0}
+
+class Descarte:
+    """Repositorio que no guarda nada: para medir solo la memoria de la lectura."""
+    def __init__(self):
+        self.n = 0
+
+    def agregar(self, u: Usuario):
+        self.n += 1
+
+class TestIntercambio(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ruta = Path(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_ida_y_vuelta_csv_y_jsonl(self):
+        for nombre in ("u.csv", "u.jsonl"):
+            ruta = self.ruta / nombre
+            self.assertEqual(intercambio.escribir(ruta, sinteticos(50)), 50)
+            repo = RepositorioUsuarios()
+            res = intercambio.importar(repo, intercambio.leer(ruta), tam_lote=7)
+            self.assertEqual((res.filas, res.correctas, res.n_errores), (50, 50, 0))
+            self.assertEqual([intercambio.como_dict(u) for u in repo], list(sinteticos(50)))
+
+    def test_ida_y_vuelta_conserva_clase_y_nivel(self):
+        usuarios = [Usuario("U", "u@x.com"), Admin("A", "a@x.com"), Invitado("I", "i@x.com", activo=False),
+                    Moderador("M", "m@x.com", nivel=2)]
+        for nombre in ("u.csv", "u.jsonl"):
+            with self.subTest(formato=nombre):
+                ruta = self.ruta / nombre
+                intercambio.exportar(usuarios, ruta)
+                repo = RepositorioUsuarios()
+                self.assertEqual(intercambio.importar(repo, intercambio.leer(ruta)).n_errores, 0)
+                for u in usuarios:
+                    v = repo.obtener_por_email(u.email)
+                    self.assertIs(type(v), type(u))
+                    self.assertEqual((intercambio.como_dict(v), v.permisos()), (intercambio.como_dict(u), u.permisos()))
+
+    def test_nivel_invalido_es_error_de_fila(self):
+        ruta = self.ruta / "u.csv"
+        ruta.write_text("nombre,email,rol,activo,nivel\n"
+                        "M,m@x.com,moderador,,x\n"
+                        "N,n@x.com,moderador,,0\n"
+                        "O,o@x.com,moderador,,\n", encoding="utf-8")
+        repo = RepositorioUsuarios()
+        res = intercambio.importar(repo, intercambio.leer(ruta))
+        self.assertEqual(sorted(dict(res.errores)), [1, 2])
+        self.assertEqual(repo.obtener_por_email("o@x.com").nivel, 1)
+
+    def test_errores_con_numero_de_fila(self):
+        ruta = self.ruta / "u.csv"
+        ruta.write_text("nombre,email,rol,activo\n"
+                        "A,a@x.com,usuario,false\n"
+                        "B,sin-arroba,usuario,1\n"
+                        "C,A@X.com,admin,\n"
+                        "D,d@x.com,jefe,0\n"
+                        "E,e@x.com,Admin,\n", encoding="utf-8")
+        repo = RepositorioUsuarios()
+        res = intercambio.importar(repo, intercambio.leer(ruta), tam_lote=2)
+        self.assertEqual((res.filas, res.correctas, res.n_errores), (5, 2, 3))
+        errores = dict(res.errores)
+        self.assertEqual(sorted(errores), [2, 3, 4])
+        self.assertIn("Ya existe", errores[3])
+        self.assertIn("Rol inválido", errores[4])
+        self.assertFalse(repo.obtener_por_email("a@x.com").activo)
+        self.assertEqual(repo.obtener_por_email("e@x.com").rol, "admin")
+
+    def test_progreso_y_formato(self):
+        llamadas = []
+        intercambio.importar(Descarte(), sinteticos(2_500), tam_lote=300, progreso=lambda n, s: llamadas.append(n), cada=1_000)
+        self.assertEqual(llamadas, [1_200, 2_100])
+        with self.assertRaises(ValueError):
+            intercambio.formato_de("u.txt")
+
+    def test_lineas_ilegibles_no_abortan(self):
+        ruta = self.ruta / "mal.jsonl"
+        ruta.write_text('{"nombre": "A", "email": "a@x.com"}\n'
+                        '{roto\n'
+                        '\n'
+                        '[1, 2]\n'
+                        '{"nombre": "B", "email": "b@x.com", "activo": null}\n'
+                        '"texto"\n'
+                        '{"nombre": "C", "email": "c@x.com", "activo": false}\n', encoding="utf-8")
+        repo = RepositorioUsuarios()
+        res = intercambio.importar(repo, intercambio.leer(ruta), tam_lote=2)
+        self.assertEqual((res.filas, res.correctas, res.n_errores), (6, 3, 3))
+        errores = dict(res.errores)
+        self.assertEqual(sorted(errores), [2, 3, 5])
+        self.assertIn("línea 2: JSON inválido", errores[2])
+        self.assertIn("línea 4: se esperaba un objeto JSON, no list", errores[3])
+        self.assertIn("no str", errores[5])
+        self.assertEqual([u.email for u in repo], ["a@x.com", "b@x.com", "c@x.com"])
+        self.assertTrue(repo.obtener_por_email("b@x.com").activo)
+        self.assertFalse(repo.obtener_por_email("c@x.com").activo)
+
+    def test_fila_csv_corta_usa_valores_por_defecto(self):
+        ruta = self.ruta / "corta.csv"
+        ruta.write_text("nombre,email,rol,activo\n"
+                        "A,a@x.com\n"
+                        "B,b@x.com,admin\n"
+                        "C,c@x.com,usuario,no,sobra\n", encoding="utf-8")
+        repo = RepositorioUsuarios()
+        res = intercambio.importar(repo, intercambio.leer(ruta))
+        self.assertEqual((res.correctas, res.n_errores), (3, 0))
+        a, b, c = (repo.obtener_por_email(f"{x}@x.com") for x in "abc")
+        self.assertEqual((a.rol, a.activo), ("usuario", True))
+        self.assertEqual((b.rol, b.activo), ("admin", True))
+        self.assertFalse(c.activo)
+
+    def pico(self, n: int) -> int:
+        ruta = self.ruta / f"u{n}.jsonl"
+        intercambio.escribir(ruta, sinteticos(n))
+        tracemalloc.start()
+        try:
+            res = intercambio.importar(Descarte(), intercambio.leer(ruta), tam_lote=500)
+            self.assertEqual(res.correctas, n)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_memoria_plana_al_crecer_el_fichero(self):
+        pequeno, grande = self.pico(2_000), self.pico(20_000)
+        self.assertLess(grande, pequeno * 1.5 + 64 * 1024)
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        cli.repo = RepositorioUsuarios()
+
+    def ejecutar(self, *argv: str) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            cli.main(list(argv))
+        return out.getvalue()
+
+    def test_importar_y_exportar(self):
+        with tempfile.TemporaryDirectory() as d:
+            csv_, jsonl = Path(d) / "u.csv", Path(d) / "u.jsonl"
+            intercambio.escribir(csv_, sinteticos(30))
+            self.assertIn("30 de 30 filas importadas", self.ejecutar("importar", str(csv_), "--progreso", "10"))
+            cli.repo = RepositorioUsuarios()
+            self.ejecutar("exportar", str(jsonl), "--desde", str(csv_), "--solo-activos")
+            filas = [json.loads(l) for l in jsonl.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(filas, [d for d in sinteticos(30) if d["activo"]])
+
+    def test_importar_con_errores_sale_con_1(self):
+        with tempfile.TemporaryDirectory() as d:
+            ruta = Path(d) / "u.jsonl"
+            intercambio.escribir(ruta, [{"nombre": "x", "email": "mal", "rol": "usuario", "activo": True}])
+            with self.assertRaises(SystemExit) as cm:
+                self.ejecutar("importar", str(ruta))
+        self.assertEqual(cm.exception.code, 1)
+
+    def test_lote_y_progreso_positivos(self):
+        for cmd in (["importar", "u.csv"], ["exportar", "u.csv"]):
+            for opcion in ("--lote", "--progreso"):
+                with self.subTest(cmd=cmd[0], opcion=opcion), self.assertRaises(SystemExit) as cm:
+                    self.ejecutar(*cmd, opcion, "0")
+                self.assertEqual(cm.exception.code, 2)
+
+if __name__ == "__main__":
+    unittest.main()
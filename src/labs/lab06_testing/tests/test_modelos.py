@@ -1,5 +1,5 @@
 import unittest
-from app.modelos import Usuario, Admin, Moderador
+from app.modelos import Usuario, Admin, Invitado, Moderador, AdminConLogger, AdminFull
 
 class TestUsuario(unittest.TestCase):
     def test_presentarse(self):
@@ -29,5 +29,85 @@ class TestRoles(unittest.TestCase):
         m = Moderador("Carlos", "carlos@test.com", nivel=2)
         self.assertIn("borrar", m.permisos())
 
+    def test_permisos_precalculados(self):
+        a1, a2 = Admin("A", "a@corp.com"), Admin("B", "b@corp.com")
+        self.assertIsInstance(a1.permisos(), frozenset)
+        self.assertIs(a1.permisos(), a2.permisos())
+        self.assertIs(Moderador("M", "m@x.com", nivel=5).permisos(),
+                      Moderador.PERMISOS_POR_NIVEL[-1])
+
+    def test_moderador_nivel_validado_al_reasignar(self):
+        m = Moderador("M", "m@x.com", nivel=1)
+        for malo in (0, -1, "2"):
+            with self.subTest(nivel=malo), self.assertRaises(ValueError):
+                m.nivel = malo
+        self.assertEqual(m.permisos(), {"ver", "editar"})
+        m.nivel = 2
+        self.assertIn("borrar", m.permisos())
+
+    def test_tiene_permiso(self):
+        self.assertTrue(Invitado("I", "i@x.com").tiene_permiso("ver"))
+        self.assertFalse(Invitado("I", "i@x.com").tiene_permiso("editar"))
+
+    def test_rol_internado(self):
+        u1 = Usuario("A", "a@x.com", rol=" Admin ")
+        u2 = Usuario("B", "b@x.com", rol="ADMIN")
+        self.assertIs(u1.rol, u2.rol)
+
+class TestCargaMasiva(unittest.TestCase):
+    def test_equivale_a_desde_dict(self):
+        regs = [{"nombre": "Ana", "email": " ANA@test.com ", "rol": "Admin", "activo": 0},
+                {"nombre": "Luis", "email": "luis@test.com"}]
+        usuarios, errores = Usuario.desde_registros(regs)
+        self.assertEqual(errores, {})
+        self.assertEqual([repr(u) for u in usuarios],
+                         [repr(Usuario.desde_dict(d)) for d in regs])
+
+    def test_informe_de_errores(self):
+        regs = [{"email": "ok@test.com"}, {"email": "sin-arroba"},
+                {"email": "x@", "rol": "root"}, {"email": "b@test.com", "rol": "invitado"}]
+        usuarios, errores = Usuario.desde_registros(regs)
+        self.assertEqual([u.email for u in usuarios], ["ok@test.com", "b@test.com"])
+        self.assertEqual(sorted(errores), [1, 2])
+        self.assertEqual(len(errores[2]), 2)
+
+    def test_instancias_funcionales(self):
+        (u,), _ = Usuario.desde_registros([{"nombre": "Ana", "email": "ana@test.com"}])
+        self.assertFalse(u.check_password("secreta1"))
+        u.set_password("secreta1")
+        self.assertTrue(u.check_password("secreta1"))
+
+    def test_contador(self):
+        antes = Usuario.contador
+        Usuario.desde_registros([{"email": "a@x.com"}, {"email": "mal"}, {"email": "b@x.com"}])
+        self.assertEqual(Usuario.contador, antes + 2)
+
+    def test_subclases_con_sus_slots(self):
+        mods, errores = Moderador.desde_registros([{"nombre": "M", "email": "m@x.com", "nivel": 2},
+                                                   {"nombre": "N", "email": "n@x.com"},
+                                                   {"nombre": "X", "email": "x@x.com", "nivel": 0}])
+        self.assertEqual([(type(m), m.nivel, m.rol) for m in mods], [(Moderador, 2, "moderador"), (Moderador, 1, "moderador")])
+        self.assertEqual(list(errores), [2])
+        (a,), errores = Admin.desde_registros([{"nombre": "R", "email": "r@x.com", "rol": "cualquiera", "activo": 0}])
+        self.assertEqual((errores, a.rol, a.activo), ({}, "admin", False))
+
+class TestSlots(unittest.TestCase):
+    def test_sin_dict_por_instancia(self):
+        for u in (Usuario("Ana", "ana@test.com"), Admin("Root", "root@corp.com"),
+                  Invitado("Eva", "eva@test.com"), Moderador("Lucía", "lucia@test.com", nivel=2),
+                  AdminConLogger("Log", "log@corp.com"), AdminFull("Full", "full@corp.com")):
+            self.assertFalse(hasattr(u, "__dict__"), type(u).__name__)
+
+    def test_atributo_desconocido_lanza(self):
+        u = Usuario("Ana", "ana@test.com")
+        with self.assertRaises(AttributeError):
+            u.apodo = "anita"
+
+    def test_mixins_conservan_mro(self):
+        a = AdminFull("Root", "root@corp.com", activo=False)
+        a.activar()
+        self.assertTrue(a.activo)
+        self.assertEqual(a.presentarse(), "[ADMIN] Soy Root (root@corp.com)")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
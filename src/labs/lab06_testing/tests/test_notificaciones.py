@@ -0,0 +1,124 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app import notificaciones
+from app.modelos import AdminFull, NotificadorMixin
+from app.notificaciones import EnvioParcial, Mensaje, Outbox, TransporteArchivo, TransporteSMTP
+
+class TransporteFallon:
+    """Falla las primeras `fallos` llamadas y registra los lotes recibidos."""
+    def __init__(self, fallos: int = 0):
+        self.fallos = fallos
+        self.lotes: list[tuple[str, int]] = []
+        self.activos = self.max_activos = 0
+
+    async def enviar_lote(self, dominio, mensajes):
+        self.activos += 1
+        self.max_activos = max(self.max_activos, self.activos)
+        try:
+            await asyncio.sleep(0)
+            if self.fallos:
+                self.fallos -= 1
+                raise ConnectionError("smtp caído")
+            self.lotes.append((dominio, len(mensajes)))
+        finally:
+            self.activos -= 1
+
+class TransporteParcial:
+    """Entrega todo menos los destinos de `rechazar`, que fallan `veces` veces cada uno."""
+    def __init__(self, rechazar: set[str], veces: int):
+        self.pendientes = {d: veces for d in rechazar}
+        self.entregados: list[str] = []
+
+    async def enviar_lote(self, dominio, mensajes):
+        fallidos = []
+        for m in mensajes:
+            if self.pendientes.get(m.destino):
+                self.pendientes[m.destino] -= 1
+                fallidos.append(m)
+            else:
+                self.entregados.append(m.destino)
+        if fallidos:
+            raise EnvioParcial(fallidos)
+
+class TestOutbox(unittest.TestCase):
+    def test_lotes_por_dominio(self):
+        t = TransporteFallon()
+        ob = Outbox(t, lote=3)
+        for i in range(5):
+            ob.encolar(Mensaje(f"u{i}@a.com", "s", "c"))
+        ob.encolar(Mensaje("x@b.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertEqual(sorted(t.lotes), [("a.com", 2), ("a.com", 3), ("b.com", 1)])
+        self.assertEqual(ob.estadisticas()["enviados"], 6)
+
+    def test_concurrencia_acotada(self):
+        t = TransporteFallon()
+        ob = Outbox(t, concurrencia=2, lote=1)
+        for i in range(20):
+            ob.encolar(Mensaje(f"u{i}@d{i}.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertLessEqual(t.max_activos, 2)
+
+    def test_reintentos_y_fallidos(self):
+        ob = Outbox(TransporteFallon(fallos=2), reintentos=3, espera_base=0)
+        ob.encolar(Mensaje("a@x.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertEqual((ob.enviados, ob.reintentos_hechos, ob.fallidos), (1, 2, []))
+
+        ob = Outbox(TransporteFallon(fallos=10), reintentos=1, espera_base=0)
+        ob.encolar(Mensaje("a@x.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertEqual(ob.estadisticas()["fallidos"], 1)
+
+    def test_reintenta_solo_lo_no_entregado(self):
+        t = TransporteParcial({"u1@a.com", "u3@a.com"}, veces=1)
+        ob = Outbox(t, reintentos=2, espera_base=0)
+        for i in range(5):
+            ob.encolar(Mensaje(f"u{i}@a.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertEqual(sorted(t.entregados), [f"u{i}@a.com" for i in range(5)])  # sin duplicados
+        self.assertEqual((ob.enviados, ob.reintentos_hechos, ob.fallidos), (5, 1, []))
+
+        t = TransporteParcial({"u1@a.com"}, veces=10)
+        ob = Outbox(t, reintentos=2, espera_base=0)
+        for i in range(3):
+            ob.encolar(Mensaje(f"u{i}@a.com", "s", "c"))
+        asyncio.run(ob.vaciar())
+        self.assertEqual(len(t.entregados), 2)
+        self.assertEqual((ob.enviados, [m.destino for m in ob.fallidos]), (2, ["u1@a.com"]))
+
+    def test_smtp_mensaje_invalido_no_corta_el_lote(self):
+        enviados = []
+        smtp = mock.MagicMock()
+        smtp.__enter__.return_value.send_message.side_effect = lambda em: enviados.append(em["To"])
+        ob = Outbox(TransporteSMTP(), reintentos=1, espera_base=0)
+        for i, asunto in enumerate(["ok", "roto\nBcc: x@evil.com", "ok"]):
+            ob.encolar(Mensaje(f"u{i}@a.com", asunto, "c"))
+        with mock.patch.object(notificaciones.smtplib, "SMTP", return_value=smtp):
+            asyncio.run(ob.vaciar())
+        self.assertEqual(enviados, ["u0@a.com", "u2@a.com"])  # sin duplicados al reintentar
+        self.assertEqual((ob.enviados, [m.destino for m in ob.fallidos]), (2, ["u1@a.com"]))
+
+    def test_mixin_y_archivo(self):
+        with tempfile.TemporaryDirectory() as d:
+            ruta = os.path.join(d, "outbox.tsv")
+            ob = Outbox(TransporteArchivo(ruta))
+            admins = [AdminFull(f"A{i}", f"a{i}@corp.com") for i in range(3)]
+            try:
+                AdminFull.outbox = ob
+                for a in admins:
+                    a.enviar_email("Incidente", "Revisar panel")
+            finally:
+                del AdminFull.outbox
+            asyncio.run(ob.vaciar())
+            with open(ruta, encoding="utf-8") as f:
+                lineas = f.read().splitlines()
+        self.assertEqual(len(lineas), 3)
+        self.assertEqual(lineas[0], "a0@corp.com\tIncidente\tRevisar panel")
+        self.assertIsNone(NotificadorMixin.outbox)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import random
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from app.modelos import Usuario
+from app.repositorio import RepositorioUsuarios
+from app import perfilado
+from app.perfilado import (
+    N_CUBOS, Metricas, REGISTRO, cubo, informe, limite_inferior, limite_superior, metricas_de, perfilando, perfilar, volcar,
+)
+
+@perfilar(nombre="test.hoja")
+def hoja(s: float = 0.0):
+    if s:
+        time.sleep(s)
+    return 1
+
+@perfilar(nombre="test.padre")
+def padre():
+    time.sleep(0.01)
+    return hoja(0.02) + hoja()
+
+class TestHistograma(unittest.TestCase):
+    def test_cubos_contiguos_y_acotados(self):
+        rnd = random.Random(0)
+        valores = list(range(200)) + [rnd.getrandbits(rnd.randint(1, 62)) for _ in range(5_000)] + [2**63 - 1]
+        for v in valores:
+            i = cubo(v)
+            self.assertLess(i, N_CUBOS)
+            self.assertLessEqual(limite_inferior(i), v)
+            self.assertLessEqual(v, limite_superior(i))
+            self.assertLessEqual(limite_superior(i) - limite_inferior(i), max(v / 8, 1))
+        for i in range(N_CUBOS - 1):
+            self.assertEqual(limite_superior(i) + 1, limite_inferior(i + 1))
+
+    def test_percentiles(self):
+        m = Metricas("x")
+        for ns in [1_000] * 90 + [100_000] * 9 + [5_000_000]:
+            m.registrar(ns, ns)
+        self.assertAlmostEqual(m.percentil(50), 1_000, delta=1_000 / 8)
+        self.assertAlmostEqual(m.percentil(99), 100_000, delta=100_000 / 8)
+        self.assertEqual(m.percentil(100), 5_000_000)
+        self.assertEqual(Metricas("vacia").percentil(50), 0)
+
+class TestPerfilar(unittest.TestCase):
+    def test_desactivado_no_registra(self):
+        perfilado.desactivar()
+        perfilado.reiniciar()
+        self.assertEqual(hoja(), 1)
+        self.assertEqual(metricas_de(hoja).llamadas, 0)
+        self.assertEqual(hoja.__name__, "hoja")
+
+    def test_tiempo_total_y_propio(self):
+        with perfilando():
+            padre()
+        p, h = REGISTRO["test.padre"], REGISTRO["test.hoja"]
+        self.assertFalse(perfilado.activo())
+        self.assertEqual((p.llamadas, h.llamadas), (1, 2))
+        self.assertGreaterEqual(p.total_ns, 30_000_000)
+        self.assertGreaterEqual(p.total_ns - p.propio_ns, h.total_ns)  # lo de hoja no es propio de padre
+        self.assertLess(p.propio_ns, 25_000_000)
+
+    def test_excepcion_se_registra_y_propaga(self):
+        @perfilar(nombre="test.falla")
+        def falla():
+            raise KeyError("x")
+        with perfilando():
+            with self.assertRaises(KeyError):
+                falla()
+            self.assertEqual(hoja(), 1)  # la pila de marcos quedó limpia
+        self.assertEqual(REGISTRO["test.falla"].llamadas, 1)
+        self.assertEqual(REGISTRO["test.hoja"].propio_ns, REGISTRO["test.hoja"].total_ns)
+
+    def test_hilos(self):
+        def trabajo():
+            for _ in range(2_000):
+                hoja()
+        with perfilando():
+            hilos = [threading.Thread(target=trabajo) for _ in range(4)]
+            for t in hilos:
+                t.start()
+            for t in hilos:
+                t.join()
+        m = REGISTRO["test.hoja"]
+        self.assertEqual(m.llamadas, 8_000)
+        self.assertEqual(sum(m.histograma), 8_000)
+
+class TestRepositorioInstrumentado(unittest.TestCase):
+    def test_apagado_sin_envoltorio(self):
+        perfilado.desactivar()
+        original = RepositorioUsuarios.listar_activos
+        self.assertFalse(hasattr(original, "__wrapped__"))
+        with perfilando():
+            copia = RepositorioUsuarios.listar_activos
+            self.assertIs(copia.__wrapped__, original)
+        self.assertIs(RepositorioUsuarios.listar_activos, original)
+        copia(RepositorioUsuarios())  # la copia comprueba el interruptor: apagado no registra
+        self.assertEqual(metricas_de(original).llamadas, 0)
+        self.assertFalse(hasattr(original, "metricas"))  # las métricas van en el envoltorio
+
+    def test_metodos_publicos_instrumentados(self):
+        repo = RepositorioUsuarios()
+        with perfilando():
+            for i in range(50):
+                repo.agregar(Usuario(f"U{i}", f"u{i}@test.com"))
+            repo.obtener_por_email("u1@test.com")
+            repo.listar_activos()
+        nombres = {f"app.repositorio.RepositorioUsuarios.{m}": n
+                   for m, n in (("agregar", 50), ("obtener_por_email", 1), ("listar_activos", 1), ("eliminar", 0))}
+        for nombre, n in nombres.items():
+            self.assertEqual(REGISTRO[nombre].llamadas, n, nombre)
+        self.assertNotIn("app.repositorio.RepositorioUsuarios.__init__", REGISTRO)
+
+    def test_informe_y_volcado(self):
+        with perfilando():
+            RepositorioUsuarios().listar_activos()
+        texto = informe()
+        self.assertIn("RepositorioUsuarios.listar_activos", texto)
+        self.assertNotIn("RepositorioUsuarios.eliminar", texto)
+        with tempfile.TemporaryDirectory() as d:
+            datos = json.loads(volcar(Path(d) / "perfil.json").read_text(encoding="utf-8"))
+            self.assertTrue(volcar(Path(d) / "perfil.txt").read_text(encoding="utf-8").startswith("función"))
+        fila = next(f for f in datos if f["funcion"].endswith("listar_activos"))
+        self.assertEqual(fila["llamadas"], 1)
+        self.assertEqual(sum(fila["histograma"].values()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
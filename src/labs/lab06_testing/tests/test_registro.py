@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from app.modelos import AdminConLogger, LoggerMixin
+from app.registro import SinkArchivoAsync, evento
+
+class TestSinkArchivoAsync(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.dir.name, "eventos.log")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def leer(self) -> list[str]:
+        with open(self.ruta, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def test_escribe_todo_al_cerrar(self):
+        with SinkArchivoAsync(self.ruta, capacidad=50, lote=16) as sink:
+            hilos = [threading.Thread(target=lambda: [sink.emitir(evento("X", "a@x.com", "m", {}))
+                                                      for _ in range(500)]) for _ in range(4)]
+            for h in hilos: h.start()
+            for h in hilos: h.join()
+        self.assertEqual(sink.escritos, 2000)
+        self.assertEqual(sink.descartados, 0)
+        self.assertEqual(len(self.leer()), 2000)
+        self.assertGreater(sink.lotes, 1)
+
+    def test_descartar_cuenta_perdidos(self):
+        sink = SinkArchivoAsync(self.ruta, capacidad=1, politica="descartar")
+        for i in range(1000):
+            sink.emitir(evento("X", "a@x.com", f"m{i}", {}))
+        sink.cerrar()
+        self.assertEqual(sink.escritos + sink.descartados, 1000)
+        self.assertEqual(len(self.leer()), sink.escritos)
+
+    def test_politica_invalida(self):
+        with self.assertRaises(ValueError):
+            SinkArchivoAsync(self.ruta, politica="ignorar")
+
+    def test_emitir_tras_cerrar(self):
+        sink = SinkArchivoAsync(self.ruta)
+        sink.cerrar()
+        sink.cerrar()
+        with self.assertRaises(RuntimeError):
+            sink.emitir(evento("X", "a@x.com", "m", {}))
+
+    def test_cerrar_no_se_cuela_entre_comprobar_y_encolar(self):
+        class SinkLento(SinkArchivoAsync):
+            def _comprobar(self):
+                # cerrar() desde otro hilo justo después de comprobar _cerrado
+                self.cierre = threading.Thread(target=self.cerrar)
+                self.cierre.start()
+                time.sleep(0.1)
+                super()._comprobar()
+        sink = SinkLento(self.ruta)
+        sink.emitir(evento("X", "a@x.com", "m", {}))
+        sink.cierre.join()
+        self.assertEqual((sink.escritos, sink.descartados), (1, 0))  # el evento no queda detrás del fin
+        self.assertEqual(len(self.leer()), 1)
+
+    def test_lote_por_tiempo(self):
+        with SinkArchivoAsync(self.ruta, lote=1_000, intervalo=0.05) as sink:
+            for i in range(3):
+                sink.emitir(evento("X", "a@x.com", f"m{i}", {}))
+            time.sleep(0.3)
+            self.assertEqual((sink.escritos, sink.lotes), (3, 1))  # sin esperar a llenar el lote
+
+    def test_fallo_al_abrir_no_cuelga(self):
+        sink = SinkArchivoAsync(os.path.join(self.dir.name, "no", "existe.log"), capacidad=2)
+        sink._hilo.join(0.5)  # el escritor sigue vivo, vaciando la cola
+        with self.assertRaises(RuntimeError) as cm:
+            for _ in range(10):
+                sink.emitir(evento("X", "a@x.com", "m", {}))
+        self.assertIsInstance(cm.exception.__cause__, FileNotFoundError)
+        with self.assertRaises(RuntimeError):
+            sink.cerrar()
+        self.assertFalse(sink._hilo.is_alive())
+
+    def test_evento_no_formateable(self):
+        sink = SinkArchivoAsync(self.ruta, intervalo=0.01)
+        sink.emitir(("no es un timestamp", "X", "a@x.com", "m", {}))
+        for i in range(100):
+            try:
+                sink.emitir(evento("X", "a@x.com", f"m{i}", {}))
+            except RuntimeError:
+                break
+        with self.assertRaises(RuntimeError) as cm:
+            sink.cerrar()
+        self.assertIsInstance(cm.exception.__cause__, TypeError)
+        self.assertEqual(sink.escritos, 0)
+
+    def test_mixin_usa_sink(self):
+        sink = SinkArchivoAsync(self.ruta)
+        try:
+            AdminConLogger.sink = sink
+            a = AdminConLogger("Root", "root@corp.com", activo=False)
+            a.activar()
+        finally:
+            del AdminConLogger.sink
+            sink.cerrar()
+        lineas = self.leer()
+        self.assertTrue(a.activo)
+        self.assertEqual(len(lineas), 2)
+        self.assertIn("[AdminConLogger] <root@corp.com> Activando usuario…", lineas[0])
+        self.assertIs(AdminConLogger.sink, LoggerMixin.sink)
+
+if __name__ == "__main__":
+    unittest.main()
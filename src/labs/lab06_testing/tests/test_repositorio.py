@@ -1,6 +1,6 @@
 import unittest
-from app.modelos import Usuario
-from app.repositorio import RepositorioUsuarios
+from app.modelos import Usuario, Admin, Moderador
+from app.repositorio import RepositorioUsuarios, usuarios_con_permiso
 
 class TestRepositorio(unittest.TestCase):
     def test_agregar_obtener(self):
@@ -28,5 +28,14 @@ class TestRepositorio(unittest.TestCase):
         repo.agregar(u1); repo.agregar(u2)
         self.assertEqual([u.email for u in repo.listar_activos()], ["a@x.com"])
 
+    def test_usuarios_con_permiso(self):
+        repo = RepositorioUsuarios()
+        for u in (Usuario("A", "a@x.com"), Admin("R", "r@x.com"),
+                  Moderador("M1", "m1@x.com", nivel=1), Moderador("M2", "m2@x.com", nivel=2)):
+            repo.agregar(u)
+        self.assertEqual([u.email for u in usuarios_con_permiso(repo, "borrar")],
+                         ["r@x.com", "m2@x.com"])
+        self.assertEqual(len(usuarios_con_permiso(repo, "ver")), 4)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import asyncio
+import unittest
+from app.modelos import Usuario
+from app.seguridad import HasherScrypt, HasherPBKDF2, PoolHashing, verificar
+
+RAPIDO_SCRYPT = HasherScrypt(n=2**8)
+RAPIDO_PBKDF2 = HasherPBKDF2(iteraciones=100)
+
+class TestHashers(unittest.TestCase):
+    def test_hash_con_sal(self):
+        h1, h2 = RAPIDO_SCRYPT.hash("secreta1"), RAPIDO_SCRYPT.hash("secreta1")
+        self.assertNotEqual(h1, h2)
+        self.assertTrue(h1.startswith("scrypt$256$8$1$"))
+        self.assertTrue(RAPIDO_SCRYPT.verificar("secreta1", h1))
+        self.assertFalse(RAPIDO_SCRYPT.verificar("otra", h1))
+
+    def test_pbkdf2(self):
+        h = RAPIDO_PBKDF2.hash("secreta1")
+        self.assertTrue(h.startswith("pbkdf2_sha256$100$"))
+        self.assertTrue(verificar("secreta1", h))
+        self.assertFalse(verificar("otra", h))
+
+    def test_coste_leido_del_hash(self):
+        # Un hasher con otro coste verifica hashes antiguos
+        h = HasherScrypt(n=2**4).hash("secreta1")
+        self.assertTrue(RAPIDO_SCRYPT.verificar("secreta1", h))
+
+    def test_formatos_invalidos(self):
+        for malo in (None, "", "hash::secreta1", "scrypt$x", "md5$1$2"):
+            self.assertFalse(verificar("secreta1", malo))
+
+    def test_hash_corrupto_da_false(self):
+        for malo in ("scrypt$a$8$1$00$00", "scrypt$256$8$1$zz$00", "scrypt$255$8$1$00$00",
+                     "scrypt$256$0$1$00$00", "pbkdf2_sha256$x$00$00", "pbkdf2_sha256$100$zz$00",
+                     "pbkdf2_sha256$0$00$00"):
+            self.assertFalse(verificar("secreta1", malo), malo)
+
+    def test_coste_acotado(self):
+        # rechazados sin derivar: si los derivara, este test tardaría minutos
+        self.assertFalse(verificar("secreta1", f"scrypt${2**30}$8$1$00$00"))
+        self.assertFalse(verificar("secreta1", "scrypt$256$8$100000$00$00"))
+        self.assertFalse(verificar("secreta1", f"pbkdf2_sha256${10**12}$00$00"))
+
+    def test_lote_con_hash_corrupto(self):
+        with PoolHashing(RAPIDO_PBKDF2, max_workers=2) as pool:
+            h = pool.hash("secreta1").result()
+            self.assertEqual(pool.verificar_lote([("secreta1", h), ("secreta1", "pbkdf2_sha256$x$00$00")]),
+                             [True, False])
+
+    def test_n_no_potencia_de_dos(self):
+        with self.assertRaises(ValueError):
+            HasherScrypt(n=1000)
+
+class TestPoolHashing(unittest.TestCase):
+    def test_lotes(self):
+        with PoolHashing(RAPIDO_SCRYPT, max_workers=4) as pool:
+            hashes = pool.hash_lote(["a" * 6, "b" * 6, "c" * 6])
+            ok = pool.verificar_lote([("a" * 6, hashes[0]), ("x" * 6, hashes[1]),
+                                      ("c" * 6, hashes[2]), ("c" * 6, None)])
+        self.assertEqual(ok, [True, False, True, False])
+
+    def test_async(self):
+        async def flujo(pool):
+            h = await pool.ahash("secreta1")
+            return await asyncio.gather(pool.averificar("secreta1", h), pool.averificar("otra", h))
+        with PoolHashing(RAPIDO_PBKDF2, max_workers=2) as pool:
+            self.assertEqual(asyncio.run(flujo(pool)), [True, False])
+
+    def test_con_usuario(self):
+        u = Usuario("Ana", "ana@test.com")
+        with PoolHashing(RAPIDO_SCRYPT, max_workers=2) as pool:
+            u.set_password_hash(pool.hash("secreta1").result())
+            self.assertTrue(pool.verificar("secreta1", u.password_hash).result())
+        self.assertTrue(u.check_password("secreta1"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# app/analisis.py
+"""
+Análisis CPU por archivo (tokenizar, extraer con regex…) con ejecutor
+intercambiable: hilos, procesos o híbrido.
+
+Los archivos grandes se parten en fragmentos (rangos de bytes alineados a
+saltos de línea) para que un único archivo enorme también se reparta entre
+workers. Cada worker abre y lee su propio rango, así que a los procesos
+solo viaja (ruta, inicio, fin), no los datos. Los resultados parciales se
+combinan en el orden de los fragmentos: el resultado es determinista sea
+cual sea el orden en que terminan los workers.
+
+Las funciones de análisis reciben bytes y devuelven un valor combinable con
+`combinar` (por defecto `+`: int, Counter, list…). Para usar procesos deben
+ser pickleables (funciones de módulo o functools.partial de ellas).
+"""
+from __future__ import annotations
+import os
+import re
+from collections import Counter
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial, reduce
+from operator import add
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+EJECUTORES = ("hilos", "procesos", "hibrido")
+TAM_FRAGMENTO = 32 << 20       # 32 MiB por fragmento
+UMBRAL_PROCESOS = 4 << 20      # en modo híbrido, fragmentos >= esto van a procesos
+
+Fragmento = tuple[str, int, int]  # (ruta, inicio, fin) con fin exclusivo
+
+def fragmentar(ruta: str | Path, tam_fragmento: int = TAM_FRAGMENTO) -> list[Fragmento]:
+    """Parte el archivo en rangos de ~tam_fragmento bytes que empiezan y acaban en límite de línea."""
+    ruta = os.fspath(ruta)
+    tam = os.path.getsize(ruta)
+    if tam == 0:
+        return [(ruta, 0, 0)]
+    fragmentos = []
+    inicio = 0
+    with open(ruta, "rb") as f:
+        while inicio < tam:
+            fin = inicio + tam_fragmento
+            if fin >= tam:
+                fin = tam
+            else:
+                f.seek(fin - 1)
+                f.readline()  # avanza hasta justo después del siguiente b"\n"
+                fin = f.tell()
+            fragmentos.append((ruta, inicio, fin))
+            inicio = fin
+    return fragmentos
+
+def _analizar_fragmento(funcion: Callable[[bytes], Any], frag: Fragmento) -> Any:
+    ruta, inicio, fin = frag
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        return funcion(f.read(fin - inicio))
+
+def analizar_archivos(
+    archivos: Iterable[str | Path],
+    funcion: Callable[[bytes], Any],
+    ejecutor: str | Executor = "hilos",
+    max_workers: int | None = None,
+    tam_fragmento: int = TAM_FRAGMENTO,
+    combinar: Callable[[Any, Any], Any] = add,
+    umbral_procesos: int = UMBRAL_PROCESOS,
+) -> dict[str, Any]:
+    """
+    Devuelve {ruta: resultado} aplicando `funcion` a cada fragmento y
+    combinando los parciales de un mismo archivo en orden.
+
+    ejecutor: "hilos" (E/S, o funciones que liberan el GIL), "procesos"
+    (CPU puro), "hibrido" (fragmentos grandes a procesos y pequeños a hilos,
+    a la vez) o un Executor ya creado, que no se cierra al terminar.
+    """
+    fragmentos = [fr for a in archivos for fr in fragmentar(a, tam_fragmento)]
+    workers = max_workers or os.cpu_count() or 1
+    tarea = partial(_analizar_fragmento, funcion)
+    propios: list[Executor] = []
+    try:
+        if isinstance(ejecutor, Executor):
+            futuros = [ejecutor.submit(tarea, fr) for fr in fragmentos]
+        elif ejecutor == "hilos":
+            propios.append(ThreadPoolExecutor(workers))
+            futuros = [propios[0].submit(tarea, fr) for fr in fragmentos]
+        elif ejecutor == "procesos":
+            propios.append(ProcessPoolExecutor(workers))
+            futuros = [propios[0].submit(tarea, fr) for fr in fragmentos]
+        elif ejecutor == "hibrido":
+            hilos, procesos = ThreadPoolExecutor(workers), ProcessPoolExecutor(workers)
+            propios += [hilos, procesos]
+            futuros = [(procesos if fin - ini >= umbral_procesos else hilos).submit(tarea, (r, ini, fin))
+                       for r, ini, fin in fragmentos]
+        else:
+            raise ValueError(f"Ejecutor inválido: {ejecutor!r}. Válidos: {EJECUTORES}")
+        return _combinar(fragmentos, futuros, combinar)
+    finally:
+        for ex in propios:
+            ex.shutdown(wait=True)
+
+def _combinar(fragmentos: list[Fragmento], futuros: list[Future],
+              combinar: Callable[[Any, Any], Any]) -> dict[str, Any]:
+    parciales: dict[str, list[Any]] = {}
+    for (ruta, _, _), fut in zip(fragmentos, futuros):  # orden de fragmento, no de llegada
+        parciales.setdefault(ruta, []).append(fut.result())
+    return {ruta: reduce(combinar, ps) for ruta, ps in parciales.items()}
+
+# --- Funciones de análisis listas para usar (pickleables) ---
+_PALABRA = re.compile(rb"\w+")
+
+def contar_tokens(datos: bytes) -> Counter:
+    """Frecuencia de palabras (minúsculas)."""
+    return Counter(_PALABRA.findall(datos.lower()))
+
+def _extraer(patron: bytes, datos: bytes) -> Counter:
+    return Counter(re.findall(patron, datos))
+
+def extractor_regex(patron: str | bytes) -> Callable[[bytes], Counter]:
+    """Cuenta cada valor capturado por `patron` (o el match completo si no hay grupos)."""
+    return partial(_extraer, patron.encode() if isinstance(patron, str) else patron)
@@ -0,0 +1,169 @@
+# app/locks.py
+"""
+Gestor de locks con nombre para evitar el deadlock de la Fase 3.
+
+- Orden canónico global: adquirir("b", "a") y adquirir("a", "b") toman
+  siempre "a" y luego "b", así que dos hilos nunca se esperan en ciclo.
+  Anidados también: un hilo que ya tiene locks del gestor solo puede pedir
+  nombres posteriores a todos ellos; si no, RuntimeError antes de esperar.
+- Timeout opcional: si no se consiguen todos a tiempo se liberan los ya
+  tomados, se espera un backoff exponencial con jitter y se reintenta hasta
+  agotar el plazo (TimeoutError).
+- Métricas por lock: adquisiciones (una por adquirir que lo consigue, no
+  por reintento), contención (el lock estaba ocupado al pedirlo), tiempo de
+  espera (incluido el de intentos fallidos) y de retención, e intentos
+  fallidos por timeout. Se actualizan sin lock global: la ruta caliente
+  solo toca el lock pedido.
+
+    gestor = GestorLocks()
+    with gestor.adquirir("resultados", "log", timeout=1.0):
+        ...
+    print(gestor.mas_disputados())
+"""
+from __future__ import annotations
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+class MetricasLock:
+    """
+    Contadores de un lock. Los de adquisición, espera y retención solo los
+    escribe el hilo que tiene el lock, así que no necesitan más protección;
+    los de intentos fallidos (sin el lock) van bajo `_fallos`, propio de este
+    lock. Ninguno pasa por un lock global.
+    """
+    __slots__ = ("adquisiciones", "contenciones", "espera_total", "espera_max",
+                 "retencion_total", "retencion_max", "_desde",
+                 "timeouts", "espera_fallida_total", "espera_fallida_max", "_fallos")
+
+    def __init__(self):
+        self.adquisiciones = self.contenciones = self.timeouts = 0
+        self.espera_total = self.espera_max = 0.0
+        self.espera_fallida_total = self.espera_fallida_max = 0.0
+        self.retencion_total = self.retencion_max = 0.0
+        self._desde = 0.0
+        self._fallos = threading.Lock()
+
+    @property
+    def espera(self) -> float:
+        # también la de los intentos fallidos
+        return self.espera_total + self.espera_fallida_total
+
+    def como_dict(self) -> dict:
+        n = self.adquisiciones
+        return {
+            "adquisiciones": n,
+            "contenciones": self.contenciones + self.timeouts,  # un timeout siempre fue contención
+            "timeouts": self.timeouts,
+            "espera_media_ms": self.espera / n * 1000 if n else 0.0,
+            "espera_max_ms": max(self.espera_max, self.espera_fallida_max) * 1000,
+            "retencion_media_ms": self.retencion_total / n * 1000 if n else 0.0,
+            "retencion_max_ms": self.retencion_max * 1000,
+        }
+
+class GestorLocks:
+    def __init__(self, backoff_inicial: float = 0.001, backoff_max: float = 0.1):
+        self.backoff_inicial, self.backoff_max = backoff_inicial, backoff_max
+        self._locks: dict[str, tuple[threading.Lock, MetricasLock]] = {}
+        self._registro = threading.Lock()  # solo para dar de alta nombres y leer la lista
+        self._hilo = threading.local()      # .tomados: nombres que retiene cada hilo
+
+    def _lock(self, nombre: str) -> tuple[threading.Lock, MetricasLock]:
+        par = self._locks.get(nombre)
+        if par is None:
+            with self._registro:
+                par = self._locks.setdefault(nombre, (threading.Lock(), MetricasLock()))
+        return par
+
+    def _tomar(self, nombre: str, limite: float | None) -> bool:
+        lock, m = self._lock(nombre)
+        t0 = time.perf_counter()
+        contendido = not lock.acquire(blocking=False)
+        conseguido = True
+        if contendido:
+            restante = -1 if limite is None else max(0.0, limite - time.monotonic())
+            conseguido = lock.acquire(timeout=restante)
+        ahora = time.perf_counter()
+        espera = ahora - t0
+        if not conseguido:
+            with m._fallos:
+                m.timeouts += 1
+                m.espera_fallida_total += espera
+                m.espera_fallida_max = max(m.espera_fallida_max, espera)
+            return False
+        # con el lock en la mano: nadie más escribe estas métricas
+        m.contenciones += contendido
+        m.espera_total += espera
+        m.espera_max = max(m.espera_max, espera)
+        m._desde = ahora
+        return True
+
+    def _soltar(self, nombre: str, retenido: bool = True) -> None:
+        """retenido=False al deshacer un intento a medias: esa retención no cuenta."""
+        lock, m = self._locks[nombre]
+        if retenido:
+            retencion = time.perf_counter() - m._desde
+            m.retencion_total += retencion
+            m.retencion_max = max(m.retencion_max, retencion)
+        lock.release()
+
+    @contextmanager
+    def adquirir(self, *nombres: str, timeout: float | None = None,
+                 intento: float = 0.05) -> Iterator[None]:
+        """
+        Sin timeout se espera indefinidamente (el orden canónico basta para no
+        interbloquearse entre usuarios del gestor). Con timeout, cada intento
+        espera como mucho `intento` segundos por lock; si falla, suelta lo
+        tomado y reintenta tras el backoff: así tampoco se queda enganchado
+        si alguien retiene uno de estos locks fuera del gestor.
+
+        Dentro de otro adquirir del mismo hilo solo se admiten nombres
+        posteriores a los ya retenidos (RuntimeError si no): pedir uno
+        anterior, o repetir uno (los locks no son reentrantes), podría
+        interbloquear.
+        """
+        orden = sorted(set(nombres))
+        tomados_hilo: list[str] = self._hilo.__dict__.setdefault("tomados", [])
+        if tomados_hilo and orden and orden[0] <= tomados_hilo[-1]:
+            raise RuntimeError(f"Orden de locks violado: se piden {orden} reteniendo {tomados_hilo}")
+        limite = None if timeout is None else time.monotonic() + timeout
+        espera = self.backoff_inicial
+        while True:
+            limite_intento = None if limite is None else min(limite, time.monotonic() + intento)
+            tomados: list[str] = []
+            for nombre in orden:
+                if not self._tomar(nombre, limite_intento):
+                    break
+                tomados.append(nombre)
+            if len(tomados) == len(orden):
+                break
+            for nombre in reversed(tomados):
+                self._soltar(nombre, retenido=False)
+            if limite is not None and time.monotonic() >= limite:
+                raise TimeoutError(f"No se pudieron adquirir {orden} en {timeout}s")
+            time.sleep(random.uniform(0, espera))
+            espera = min(espera * 2, self.backoff_max)
+        for nombre in orden:
+            self._locks[nombre][1].adquisiciones += 1  # una por adquirir, no por intento
+        tomados_hilo.extend(orden)
+        try:
+            yield
+        finally:
+            del tomados_hilo[len(tomados_hilo) - len(orden):]
+            for nombre in reversed(orden):
+                self._soltar(nombre)
+
+    def _metricas(self) -> list[tuple[str, MetricasLock]]:
+        with self._registro:
+            return [(nombre, m) for nombre, (_, m) in self._locks.items()]
+
+    def estadisticas(self) -> dict[str, dict]:
+        """Instantánea sin parar a nadie: con hilos en marcha puede ir una llamada por detrás."""
+        return {n: m.como_dict() for n, m in sorted(self._metricas())}
+
+    def mas_disputados(self, n: int = 5) -> list[tuple[str, dict]]:
+        """Locks ordenados por tiempo total de espera (los 'calientes' primero)."""
+        orden = sorted(self._metricas(), key=lambda kv: kv[1].espera, reverse=True)
+        return [(nombre, m.como_dict()) for nombre, m in orden[:n]]
@@ -0,0 +1,208 @@
+# app/procesador.py
+from __future__ import annotations
+import mmap
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, MutableMapping
+
+TAM_BLOQUE = 1 << 20     # 1 MiB por lectura
+UMBRAL_MMAP = 64 << 20   # a partir de aquí se escanea con mmap
+_VENTANA_MMAP = 16 << 20
+_MMAP_COUNT = hasattr(mmap.mmap, "count")
+# Sin mmap.count, rebanar el mapa no gana a readinto (ver bench_mmap.py)
+_UMBRAL_LINEAS = UMBRAL_MMAP if _MMAP_COUNT else None
+
+def _contar_lineas_buffer(f, tam_bloque: int) -> int:
+    buf = bytearray(tam_bloque)
+    n = 0
+    ultimo = b"\n"
+    while True:
+        leidos = f.readinto(buf)
+        if not leidos:
+            break
+        n += buf.count(b"\n", 0, leidos)
+        ultimo = buf[leidos - 1:leidos]
+    return n + (ultimo != b"\n")
+
+def _secuencial(mm: mmap.mmap) -> None:
+    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)  # lectura anticipada más agresiva
+
+def _contar_lineas_mmap(f) -> int:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _secuencial(mm)
+        tam = len(mm)
+        if _MMAP_COUNT:  # Python >= 3.13: conteo sobre el mapa, sin copias
+            n = mm.count(b"\n")
+        else:
+            # Sin mmap.count solo queda rebanar: copia acotada por ventana,
+            # pero sin syscalls de lectura ni buffers de Python intermedios.
+            n = sum(mm[i:i + _VENTANA_MMAP].count(b"\n") for i in range(0, tam, _VENTANA_MMAP))
+        return n + (mm[tam - 1:tam] != b"\n")
+
+def contar_lineas(path: str | Path, tam_bloque: int = TAM_BLOQUE,
+                  umbral_mmap: int | None = _UMBRAL_LINEAS) -> int:
+    """
+    Cuenta las líneas de un archivo contando b"\\n" en binario (mismo resultado
+    que sum(1 for _ in f): una última línea sin salto cuenta).
+
+    Archivos < umbral_mmap: bloques con readinto en un buffer reutilizado.
+    Archivos >= umbral_mmap: mmap. umbral_mmap=None desactiva mmap; por
+    defecto solo se activa si existe mmap.count (Python >= 3.13).
+    """
+    with open(path, "rb", buffering=0) as f:
+        tam = os.fstat(f.fileno()).st_size
+        if tam == 0:
+            return 0
+        if umbral_mmap is not None and tam >= umbral_mmap:
+            return _contar_lineas_mmap(f)
+        return _contar_lineas_buffer(f, tam_bloque)
+
+def contar_lineas_mmap(path: str | Path) -> int:
+    return contar_lineas(path, umbral_mmap=0)
+
+# --- Búsqueda de coincidencias (subcadena o regex) ---
+Patron = bytes | re.Pattern
+_ANCLA_TEXTO = re.compile(rb"(?<!\\)(?:\\\\)*\\[AZz]")  # \A, \Z o \z sin escapar
+
+def _contar_en(datos, patron: Patron) -> int:
+    if isinstance(patron, bytes):
+        return datos.count(patron)
+    # Con MULTILINE, ^ y $ casan también tras el último \n, donde no empieza
+    # ninguna línea: esa coincidencia vacía final no se cuenta (ni aquí ni en
+    # cada bloque), así buffer y mmap dan lo mismo.
+    fin = len(datos) if datos[-1:] == b"\n" else -1
+    return sum(1 for m in patron.finditer(datos) if m.start() != fin)
+
+def _coincidencias_mmap(f, patron: Patron) -> int:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _secuencial(mm)
+        if not isinstance(patron, bytes):
+            return _contar_en(mm, patron)  # re trabaja sobre el mapa
+        n, pos, paso = 0, mm.find(patron), len(patron)
+        while pos != -1:
+            n += 1
+            pos = mm.find(patron, pos + paso)
+        return n
+
+def _coincidencias_buffer(f, patron: Patron, tam_bloque: int, max_linea: int = UMBRAL_MMAP) -> int:
+    # Bloques cortados en el último salto de línea: ninguna línea se parte
+    n = 0
+    resto = bytearray()  # crece amortizado, no se recopia en cada bloque
+    while True:
+        bloque = f.read(tam_bloque)
+        if not bloque:
+            break
+        corte = bloque.rfind(b"\n")
+        if corte == -1:
+            resto += bloque
+            if len(resto) > max_linea:
+                # línea enorme (o archivo sin saltos): mmap no la copia a memoria
+                return _coincidencias_mmap(f, patron)
+            continue
+        resto += bloque[:corte + 1]
+        n += _contar_en(resto, patron)
+        resto = bytearray(bloque[corte + 1:])
+    return n + (_contar_en(resto, patron) if resto else 0)
+
+def contar_coincidencias(path: str | Path, patron: bytes | str | re.Pattern,
+                         tam_bloque: int = TAM_BLOQUE,
+                         umbral_mmap: int | None = UMBRAL_MMAP) -> int:
+    """
+    Cuenta apariciones (sin solapamiento) de una subcadena bytes o de una regex
+    (str, o una regex compilada de str, se compila como regex de bytes en UTF-8
+    con sus mismos flags). El patrón no debe cruzar saltos de
+    línea: en modo buffer los bloques se cortan por líneas. Las regex se
+    evalúan siempre con re.MULTILINE (^ y $ anclan a cada línea) y no admiten
+    \\A ni \\Z, que dependerían de dónde cae cada bloque. Elige mmap o lectura
+    por bloques según el tamaño, igual que contar_lineas; ambos dan lo mismo.
+    """
+    if isinstance(patron, str):
+        patron = re.compile(patron.encode(), re.MULTILINE)
+    elif isinstance(patron, re.Pattern) and isinstance(patron.pattern, str):
+        # el archivo se lee en bytes; re.UNICODE no vale para patrones de bytes
+        patron = re.compile(patron.pattern.encode(), patron.flags & ~re.UNICODE | re.MULTILINE)
+    elif isinstance(patron, re.Pattern) and not patron.flags & re.MULTILINE:
+        patron = re.compile(patron.pattern, patron.flags | re.MULTILINE)
+    if isinstance(patron, bytes) and not patron:
+        raise ValueError("El patrón no puede estar vacío")
+    if isinstance(patron, re.Pattern) and _ANCLA_TEXTO.search(patron.pattern):
+        raise ValueError(r"\A y \Z no están soportados: usa ^ y $ (anclan a cada línea)")
+    with open(path, "rb") as f:
+        tam = os.fstat(f.fileno()).st_size
+        if tam == 0:
+            return 0
+        if umbral_mmap is not None and tam >= umbral_mmap:
+            return _coincidencias_mmap(f, patron)
+        return _coincidencias_buffer(f, patron, tam_bloque)
+
+def tarea_contar(archivo: str | Path) -> None:
+    """Tarea para ejecutar en un hilo: cuenta e imprime el resultado."""
+    n = contar_lineas(archivo)
+    print(f"[{Path(archivo).name}] líneas: {n}")
+
+def tarea_contar_guardando(
+    archivo: str | Path,
+    resultados: MutableMapping[str, int],
+    lock: threading.Lock,
+) -> None:
+    """
+    Cuenta líneas y guarda el resultado en `resultados[basename] = n`.
+    Usa `lock` para proteger la sección crítica.
+    """
+    nombre = Path(archivo).name
+    n = contar_lineas(archivo)
+    with lock:
+        resultados[nombre] = n
+
+# --- Motor de procesamiento ---
+MODOS = ("secuencial", "hilos", "pool")
+
+def _contar_lote(archivos: list[str]) -> list[int]:
+    return [contar_lineas(a) for a in archivos]
+
+def _lotes(archivos: list[str], n: int) -> list[list[str]]:
+    """Reparte en n lotes intercalados (equilibra archivos grandes y pequeños)."""
+    return [archivos[i::n] for i in range(n)]
+
+def procesar_archivos(
+    archivos: Iterable[str | Path],
+    modo: str = "pool",
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """
+    Devuelve {ruta: n_lineas}.
+
+    - secuencial: un solo hilo.
+    - hilos: un threading.Thread por archivo (patrón de la Fase 1/2).
+    - pool: ThreadPoolExecutor acotado; cada worker cuenta un lote de archivos
+      en una lista local y el hilo principal combina al final, así que no hay
+      ningún lock compartido en el camino caliente.
+    """
+    rutas = [os.fspath(a) for a in archivos]
+    if modo == "secuencial":
+        return dict(zip(rutas, _contar_lote(rutas)))
+    if modo == "hilos":
+        conteos = [0] * len(rutas)  # cada hilo escribe solo en su índice
+        def tarea(i: int) -> None:
+            conteos[i] = contar_lineas(rutas[i])
+        hilos = [threading.Thread(target=tarea, args=(i,)) for i in range(len(rutas))]
+        for t in hilos: t.start()
+        for t in hilos: t.join()
+        return dict(zip(rutas, conteos))
+    if modo == "pool":
+        workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        lotes = [l for l in _lotes(rutas, workers) if l]
+        resultados: dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="contador") as ex:
+            for lote, conteos in zip(lotes, ex.map(_contar_lote, lotes)):
+                resultados.update(zip(lote, conteos))
+        return resultados
+    raise ValueError(f"Modo inválido: {modo!r}. Válidos: {MODOS}")
+
+def descubrir_archivos(carpeta: str | Path, sufijo: str = ".txt") -> list[Path]:
+    with os.scandir(carpeta) as it:
+        return sorted(Path(e.path) for e in it if e.is_file() and e.name.endswith(sufijo))
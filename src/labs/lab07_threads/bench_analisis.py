@@ -0,0 +1,47 @@
+# bench_analisis.py
+"""
+Tokenizado (CPU) de un archivo grande y muchos pequeños con cada ejecutor.
+
+    python bench_analisis.py --mb 256 --workers 8
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from app.analisis import EJECUTORES, analizar_archivos, contar_tokens
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_analisis")
+    p.add_argument("--mb", type=int, default=256, help="Tamaño del archivo grande")
+    p.add_argument("--pequenos", type=int, default=200)
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    p.add_argument("--fragmento-mb", type=int, default=8)
+    args = p.parse_args()
+
+    linea = b"2024-01-01 INFO user=u42 pedido confirmado importe=19.90 ref=ABC123\n"
+    with tempfile.TemporaryDirectory() as d:
+        grande = os.path.join(d, "grande.log")
+        with open(grande, "wb") as f:
+            f.write(linea * ((args.mb << 20) // len(linea)))
+        archivos = [grande]
+        for i in range(args.pequenos):
+            archivos.append(os.path.join(d, f"p{i}.log"))
+            with open(archivos[-1], "wb") as f:
+                f.write(linea * 500)
+
+        referencia = None
+        for ejecutor in ("secuencial",) + EJECUTORES:
+            t0 = time.perf_counter()
+            if ejecutor == "secuencial":
+                r = {a: contar_tokens(Path(a).read_bytes()) for a in archivos}
+            else:
+                r = analizar_archivos(archivos, contar_tokens, ejecutor=ejecutor,
+                                      max_workers=args.workers, tam_fragmento=args.fragmento_mb << 20)
+            dt = time.perf_counter() - t0
+            referencia = referencia or r
+            assert r == referencia
+            print(f"{ejecutor:>10}: {dt:7.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bench_mmap.py
+"""
+Escaneo de un archivo grande: lectura por bloques frente a mmap
+(líneas, subcadena y regex).
+
+    python bench_mmap.py --mb 1024
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+from app.procesador import contar_coincidencias, contar_lineas
+
+def generar(ruta: str, mb: int) -> None:
+    bloque = "".join(f"2024-01-01T00:00:{i % 60:02d} {'ERROR' if i % 50 == 0 else 'INFO'} "
+                     f"req={i} user=u{i % 997}\n" for i in range(10_000)).encode()
+    with open(ruta, "wb") as f:
+        for _ in range(max(1, (mb << 20) // len(bloque))):
+            f.write(bloque)
+
+def medir(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    r = fn(*args, **kwargs)
+    return r, time.perf_counter() - t0
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_mmap")
+    p.add_argument("--mb", type=int, default=1024, help="Tamaño del archivo generado")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        ruta = os.path.join(d, "grande.log")
+        generar(ruta, args.mb)
+        mb = os.path.getsize(ruta) / (1 << 20)
+        casos = [
+            ("líneas", contar_lineas, ()),
+            ("subcadena", contar_coincidencias, (b"ERROR",)),
+            ("regex", contar_coincidencias, (re.compile(rb"user=u99\b"),)),
+        ]
+        print(f"archivo: {mb:,.0f} MiB")
+        for nombre, fn, extra in casos:
+            r_buf, t_buf = medir(fn, ruta, *extra, umbral_mmap=None)
+            r_mm, t_mm = medir(fn, ruta, *extra, umbral_mmap=0)
+            assert r_buf == r_mm
+            print(f"{nombre:>10}: buffer {mb / t_buf:8.0f} MiB/s | mmap {mb / t_mm:8.0f} MiB/s ({r_mm:,})")
+
+if __name__ == "__main__":
+    main()
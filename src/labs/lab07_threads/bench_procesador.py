@@ -0,0 +1,41 @@
+# bench_procesador.py
+"""
+Conteo de líneas sobre miles de archivos: secuencial, un hilo por archivo y pool.
+
+    python bench_procesador.py --archivos 5000 --lineas 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from app.procesador import MODOS, procesar_archivos
+
+def generar(carpeta: str, n: int, lineas: int) -> list[str]:
+    rutas = []
+    for i in range(n):
+        ruta = os.path.join(carpeta, f"f{i:06d}.txt")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(f"linea de ejemplo {i}\n" * (lineas + i % 7))
+        rutas.append(ruta)
+    return rutas
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_procesador")
+    p.add_argument("--archivos", type=int, default=5000)
+    p.add_argument("--lineas", type=int, default=200)
+    p.add_argument("--workers", type=int, default=None)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        rutas = generar(d, args.archivos, args.lineas)
+        referencia = None
+        for modo in MODOS:
+            t0 = time.perf_counter()
+            r = procesar_archivos(rutas, modo=modo, max_workers=args.workers)
+            dt = time.perf_counter() - t0
+            referencia = referencia or r
+            assert r == referencia
+            print(f"{modo:>10}: {dt:7.3f} s  {len(rutas) / dt:10,.0f} archivos/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# deadlock_demo.py
+import threading
+import time
+from app.locks import GestorLocks
+
+def trabajo(gestor: GestorLocks, nombres: tuple[str, ...], who: str, veces: int = 50):
+    for _ in range(veces):
+        # el gestor reordena: da igual en qué orden los pida cada hilo
+        with gestor.adquirir(*nombres, timeout=2.0):
+            time.sleep(0.001)
+    print(f"[{who}] terminó ({' -> '.join(nombres)} pedido)")
+
+def main():
+    print("=== DEMO: orden inverso con GestorLocks (sin deadlock) ===")
+    gestor = GestorLocks()
+    hilos = [
+        threading.Thread(target=trabajo, args=(gestor, ("lock1", "lock2"), "t1")),
+        threading.Thread(target=trabajo, args=(gestor, ("lock2", "lock1"), "t2")),
+        threading.Thread(target=trabajo, args=(gestor, ("lock2",), "t3")),
+    ]
+    for h in hilos: h.start()
+    for h in hilos: h.join()
+    print("Locks más disputados:")
+    for nombre, m in gestor.mas_disputados():
+        print(f"  - {nombre}: {m['contenciones']} contenciones, espera media "
+              f"{m['espera_media_ms']:.2f} ms, retención media {m['retencion_media_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
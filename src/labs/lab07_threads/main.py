@@ -0,0 +1,29 @@
+# main.py
+import argparse
+import time
+from pathlib import Path
+from app.procesador import MODOS, descubrir_archivos, procesar_archivos
+
+def main():
+    p = argparse.ArgumentParser(prog="procesador")
+    p.add_argument("carpeta", nargs="?", default="data")
+    p.add_argument("--modo", choices=MODOS, default="pool")
+    p.add_argument("--workers", type=int, default=None)
+    args = p.parse_args()
+
+    archivos = descubrir_archivos(args.carpeta)
+    if not archivos:
+        print(f"No se encontraron .txt en {args.carpeta}")
+        return
+
+    t0 = time.perf_counter()
+    resultados = procesar_archivos(archivos, modo=args.modo, max_workers=args.workers)
+    dt = time.perf_counter() - t0
+
+    print(f"✔ Procesamiento concurrente finalizado ({args.modo}, {dt:.3f} s)")
+    print("Resultados consolidados (archivo -> líneas):")
+    for ruta in sorted(resultados):
+        print(f"  - {Path(ruta).name}: {resultados[ruta]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from app.analisis import EJECUTORES, analizar_archivos, contar_tokens, extractor_regex, fragmentar
+from app.procesador import contar_lineas
+
+class TestAnalisis(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.grande = os.path.join(self.dir.name, "grande.log")
+        self.pequeno = os.path.join(self.dir.name, "pequeno.log")
+        self.vacio = os.path.join(self.dir.name, "vacio.log")
+        with open(self.grande, "w", encoding="utf-8") as f:
+            for i in range(2000):
+                f.write(f"{'ERROR' if i % 7 == 0 else 'INFO'} user=u{i % 13} msg=hola mundo {i}\n")
+            f.write("ultima sin salto user=u0")
+        with open(self.pequeno, "w", encoding="utf-8") as f:
+            f.write("Hola hola MUNDO\n")
+        open(self.vacio, "w").close()
+        with open(self.grande, "rb") as f:
+            self.datos_grande = f.read()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_fragmentos_alineados_y_completos(self):
+        frags = fragmentar(self.grande, tam_fragmento=1000)
+        self.assertGreater(len(frags), 10)
+        self.assertEqual(frags[0][1], 0)
+        self.assertEqual(frags[-1][2], len(self.datos_grande))
+        for (_, _, fin), (_, ini, _) in zip(frags, frags[1:]):
+            self.assertEqual(fin, ini)
+            self.assertEqual(self.datos_grande[fin - 1:fin], b"\n")
+        self.assertEqual(fragmentar(self.vacio), [(self.vacio, 0, 0)])
+
+    def test_ejecutores_equivalentes(self):
+        archivos = [self.grande, self.pequeno, self.vacio]
+        esperado = {a: contar_tokens(open(a, "rb").read()) for a in archivos}
+        for ejecutor in EJECUTORES:
+            r = analizar_archivos(archivos, contar_tokens, ejecutor=ejecutor, max_workers=2,
+                                  tam_fragmento=4096, umbral_procesos=2048)
+            self.assertEqual(r, esperado, ejecutor)
+        self.assertEqual(r[self.pequeno], Counter({b"hola": 2, b"mundo": 1}))
+
+    def test_extractor_regex_y_executor_externo(self):
+        extraer = extractor_regex(r"user=(u\d+)")
+        with ThreadPoolExecutor(3) as ex:
+            r = analizar_archivos([self.grande], extraer, ejecutor=ex, tam_fragmento=512)
+        self.assertEqual(r[self.grande], extraer(self.datos_grande))
+
+    def test_combinar_personalizado(self):
+        # los parciales (listas) se concatenan en orden de fragmento: determinista
+        primeras = lambda d: [d.split(b"\n", 1)[0]]
+        r = analizar_archivos([self.grande], primeras, tam_fragmento=300, max_workers=4)
+        self.assertEqual(r[self.grande][0], self.datos_grande.split(b"\n", 1)[0])
+        self.assertEqual(r[self.grande], sorted(r[self.grande], key=self.datos_grande.index))
+
+    def test_lineas_por_fragmentos(self):
+        contar = lambda d: d.count(b"\n") + (bool(d) and not d.endswith(b"\n"))
+        r = analizar_archivos([self.grande], contar, tam_fragmento=700)
+        self.assertEqual(r[self.grande], contar_lineas(self.grande))
+
+    def test_ejecutor_invalido(self):
+        with self.assertRaises(ValueError):
+            analizar_archivos([self.pequeno], contar_tokens, ejecutor="gpu")
+
+if __name__ == "__main__":
+    unittest.main()
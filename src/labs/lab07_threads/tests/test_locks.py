@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+from app.locks import GestorLocks
+
+class TestGestorLocks(unittest.TestCase):
+    def test_orden_inverso_no_interbloquea(self):
+        gestor = GestorLocks()
+        hechos = []
+
+        def trabajo(nombres, etiqueta):
+            for _ in range(200):
+                with gestor.adquirir(*nombres):
+                    hechos.append(etiqueta)
+
+        hilos = [threading.Thread(target=trabajo, args=(("lock1", "lock2"), "t1")),
+                 threading.Thread(target=trabajo, args=(("lock2", "lock1"), "t2"))]
+        for h in hilos: h.start()
+        for h in hilos: h.join(timeout=5)
+        self.assertFalse(any(h.is_alive() for h in hilos))
+        self.assertEqual(len(hechos), 400)
+        self.assertEqual(gestor.estadisticas()["lock1"]["adquisiciones"], 400)
+
+    def test_timeout_libera_lo_tomado(self):
+        gestor = GestorLocks()
+        tomado, soltar = threading.Event(), threading.Event()
+
+        def retener():
+            with gestor.adquirir("b"):
+                tomado.set()
+                soltar.wait(2)
+
+        h = threading.Thread(target=retener)
+        h.start()
+        tomado.wait(2)
+        with self.assertRaises(TimeoutError):
+            with gestor.adquirir("a", "b", timeout=0.1, intento=0.02):
+                pass
+        # "a" quedó libre pese al fallo
+        with gestor.adquirir("a", timeout=0.1):
+            pass
+        soltar.set()
+        h.join()
+        stats = gestor.estadisticas()
+        self.assertGreaterEqual(stats["b"]["timeouts"], 2)  # hubo reintentos con backoff
+        self.assertEqual(stats["a"]["timeouts"], 0)
+        self.assertEqual(stats["a"]["adquisiciones"], 1)  # los reintentos fallidos no cuentan
+        # la espera de los intentos fallidos cuenta (~0,1 s) aunque solo haya una adquisición
+        self.assertEqual(stats["b"]["contenciones"], stats["b"]["timeouts"])
+        self.assertGreater(stats["b"]["espera_media_ms"], 20)
+
+    def test_metricas_de_espera_y_retencion(self):
+        gestor = GestorLocks()
+        tomado = threading.Event()
+
+        def retener():
+            with gestor.adquirir("caliente"):
+                tomado.set()
+                time.sleep(0.05)
+
+        h = threading.Thread(target=retener)
+        h.start()
+        tomado.wait(2)
+        with gestor.adquirir("caliente", "frio"):
+            pass
+        h.join()
+        (nombre, m), _ = gestor.mas_disputados(2)
+        self.assertEqual(nombre, "caliente")
+        self.assertEqual(m["contenciones"], 1)
+        self.assertGreater(m["espera_max_ms"], 10)
+        self.assertGreater(m["retencion_max_ms"], 10)
+
+    def test_anidados_en_orden(self):
+        gestor = GestorLocks()
+        with gestor.adquirir("a"):
+            with gestor.adquirir("c", "b"):
+                pass
+            for nombres in (("a",), ("0",), ("b", "a")):
+                with self.assertRaisesRegex(RuntimeError, "Orden de locks"):
+                    with gestor.adquirir(*nombres, timeout=0.1):
+                        pass
+        with gestor.adquirir("b"):  # al salir se olvidan los retenidos
+            pass
+        self.assertEqual(gestor.estadisticas()["a"]["adquisiciones"], 1)
+
+    def test_nombres_repetidos(self):
+        gestor = GestorLocks()
+        with gestor.adquirir("x", "x"):
+            pass
+        self.assertEqual(gestor.estadisticas()["x"]["adquisiciones"], 1)
+
+    def test_ruta_caliente_sin_lock_global(self):
+        gestor = GestorLocks()
+        with gestor.adquirir("a", "b"):
+            pass
+
+        class Prohibido:
+            def __enter__(self):
+                raise AssertionError("lock global en la ruta caliente")
+            __exit__ = None
+
+        registro, gestor._registro = gestor._registro, Prohibido()
+        for _ in range(3):
+            with gestor.adquirir("a", "b", timeout=1):
+                pass
+        gestor._registro = registro
+        self.assertEqual(gestor.estadisticas()["b"]["adquisiciones"], 4)
+
+if __name__ == "__main__":
+    unittest.main()
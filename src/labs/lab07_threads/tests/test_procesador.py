@@ -0,0 +1,120 @@
+import os
+import re
+import tempfile
+import threading
+import unittest
+from app.procesador import (
+    MODOS, _coincidencias_buffer, contar_coincidencias, contar_lineas, contar_lineas_mmap, descubrir_archivos,
+    procesar_archivos, tarea_contar_guardando,
+)
+
+CONTENIDOS = {
+    "vacio.txt": "",
+    "una_sin_salto.txt": "hola",
+    "tres.txt": "a\nb\nc\n",
+    "ultima_sin_salto.txt": "a\nb\nc",
+    "lineas_vacias.txt": "\n\n\n",
+}
+
+class TestContarLineas(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        for nombre, texto in CONTENIDOS.items():
+            with open(os.path.join(self.dir.name, nombre), "w", encoding="utf-8", newline="") as f:
+                f.write(texto)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def ruta(self, nombre):
+        return os.path.join(self.dir.name, nombre)
+
+    def test_igual_que_iterar_lineas(self):
+        for nombre in CONTENIDOS:
+            with open(self.ruta(nombre), encoding="utf-8") as f:
+                esperado = sum(1 for _ in f)
+            self.assertEqual(contar_lineas(self.ruta(nombre)), esperado, nombre)
+
+    def test_bloque_pequeno(self):
+        # fuerza varias lecturas y un salto justo en el borde de bloque
+        self.assertEqual(contar_lineas(self.ruta("ultima_sin_salto.txt"), tam_bloque=2), 3)
+        self.assertEqual(contar_lineas(self.ruta("tres.txt"), tam_bloque=2), 3)
+
+    def test_mmap_igual_que_buffer(self):
+        for nombre in CONTENIDOS:
+            self.assertEqual(contar_lineas_mmap(self.ruta(nombre)),
+                             contar_lineas(self.ruta(nombre), umbral_mmap=None), nombre)
+
+    def test_modos_coinciden(self):
+        archivos = descubrir_archivos(self.dir.name)
+        esperado = {os.fspath(a): contar_lineas(a) for a in archivos}
+        for modo in MODOS:
+            self.assertEqual(procesar_archivos(archivos, modo=modo, max_workers=2), esperado, modo)
+
+    def test_modo_invalido(self):
+        with self.assertRaises(ValueError):
+            procesar_archivos([], modo="async")
+
+    def test_tarea_contar_guardando(self):
+        resultados, lock = {}, threading.Lock()
+        tarea_contar_guardando(self.ruta("tres.txt"), resultados, lock)
+        self.assertEqual(resultados, {"tres.txt": 3})
+
+class TestContarCoincidencias(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.dir.name, "app.log")
+        lineas = [f"{i} {'ERROR' if i % 3 == 0 else 'INFO'} id=user{i % 10}" for i in range(1000)]
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            f.write("\n".join(lineas))  # sin salto final
+        self.texto = "\n".join(lineas).encode()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_subcadena(self):
+        esperado = self.texto.count(b"ERROR")
+        for umbral in (0, None):
+            for bloque in (7, 1 << 20):
+                self.assertEqual(contar_coincidencias(self.ruta, b"ERROR", tam_bloque=bloque,
+                                                      umbral_mmap=umbral), esperado)
+
+    def test_regex(self):
+        esperado = len(re.findall(rb"id=user[13]\b", self.texto))
+        for umbral in (0, None):
+            self.assertEqual(contar_coincidencias(self.ruta, r"id=user[13]\b", tam_bloque=64,
+                                                  umbral_mmap=umbral), esperado)
+
+    def test_anclas_iguales_en_ambos_modos(self):
+        # ^ ancla a cada línea con bloques de 4 KiB y con mmap (antes mmap daba 1)
+        esperado = sum(1 for l in self.texto.split(b"\n") if l.split(b" ")[1] == b"ERROR")
+        for patron in (r"^\d+ ERROR", re.compile(rb"^\d+ ERROR"), re.compile(r"^\d+ error", re.I),
+                       r"ERROR id=user\d$"):
+            for umbral in (0, None):
+                for bloque in (64, 4096):
+                    self.assertEqual(contar_coincidencias(self.ruta, patron, tam_bloque=bloque,
+                                                          umbral_mmap=umbral), esperado, (patron, umbral, bloque))
+        with open(self.ruta, "ab") as f:
+            f.write(b"\n\n")  # una línea vacía y salto final
+        for umbral in (0, None):
+            self.assertEqual(contar_coincidencias(self.ruta, r"^$", tam_bloque=64, umbral_mmap=umbral), 1)
+        with self.assertRaises(ValueError):
+            contar_coincidencias(self.ruta, r"\AERROR")
+        self.assertEqual(contar_coincidencias(self.ruta, r"\\AERROR"), 0)  # barra escapada: no es ancla
+        with self.assertRaises(ValueError):
+            contar_coincidencias(self.ruta, re.compile(r"\AERROR"))  # también compilada de str
+
+    def test_archivo_sin_saltos(self):
+        with open(self.ruta, "wb") as f:
+            f.write(b"ab" * 5_000)
+        for umbral in (0, None):
+            self.assertEqual(contar_coincidencias(self.ruta, b"ba", tam_bloque=7, umbral_mmap=umbral), 4_999)
+        with open(self.ruta, "rb") as f:  # por encima de max_linea pasa a mmap
+            self.assertEqual(_coincidencias_buffer(f, re.compile(rb"ab"), 7, max_linea=100), 5_000)
+
+    def test_patron_vacio(self):
+        with self.assertRaises(ValueError):
+            contar_coincidencias(self.ruta, b"")
+
+if __name__ == "__main__":
+    unittest.main()
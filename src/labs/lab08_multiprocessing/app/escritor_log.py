@@ -0,0 +1,187 @@
+# app/escritor_log.py
+"""
+Log multiproceso sin Lock compartido: los workers envían líneas por una
+multiprocessing.Queue a un único proceso escritor, que las agrupa en
+escrituras grandes y hace fsync periódicamente. Al haber un solo escritor,
+las líneas nunca se intercalan. Las latencias (put -> escrito) van a un
+histograma de tamaño fijo, así que un logger de larga vida no acumula memoria.
+
+    with EscritorLog("log.txt") as log:
+        cliente = log.cliente()           # esto es lo que se pasa a los workers
+        Process(target=worker, args=(cliente,)).start()
+    print(log.estadisticas)
+"""
+from __future__ import annotations
+import os
+import queue
+import time
+from multiprocessing import Process, Queue
+
+_FIN = None
+_NADA = object()
+
+class Histograma:
+    """
+    Latencias en µs en cubos log-lineales (8 por potencia de 2, error relativo
+    < 12,5 %): registrar es O(1) y la memoria no depende de cuántas se registren.
+    """
+    __slots__ = ("cubos", "n", "maximo")
+    _SUB = 8
+    _LINEAL = 16  # por debajo cada µs tiene su cubo
+
+    def __init__(self):
+        self.cubos = [0] * (self._SUB * 64)
+        self.n = self.maximo = 0
+
+    @classmethod
+    def cubo(cls, us: int) -> int:
+        if us < cls._LINEAL:
+            return max(us, 0)
+        desp = us.bit_length() - 4
+        return cls._SUB * desp + (us >> desp)
+
+    @classmethod
+    def limite_inferior(cls, i: int) -> int:
+        if i < cls._LINEAL:
+            return i
+        desp = i // cls._SUB - 1
+        return (i - cls._SUB * desp) << desp
+
+    def registrar(self, us: int) -> None:
+        self.cubos[self.cubo(us)] += 1
+        self.n += 1
+        if us > self.maximo:
+            self.maximo = us
+
+    def percentil(self, p: float) -> int:
+        """µs (punto medio del cubo) por debajo de los que queda el p % de las muestras."""
+        if not self.n:
+            return 0
+        objetivo = max(1, -(-self.n * p // 100))
+        acumulado = 0
+        for i, c in enumerate(self.cubos):
+            acumulado += c
+            if acumulado >= objetivo:
+                return min((self.limite_inferior(i) + self.limite_inferior(i + 1) - 1) // 2, self.maximo)
+        return self.maximo
+
+class ClienteLog:
+    """Lado productor; pickleable, se pasa a cada proceso worker."""
+    __slots__ = ("_cola",)
+
+    def __init__(self, cola: Queue):
+        self._cola = cola
+
+    def escribir(self, linea: str) -> None:
+        self._cola.put((time.monotonic(), (linea,)))
+
+    def escribir_lote(self, lineas: list[str]) -> None:
+        """Un solo put para varias líneas: amortiza el coste de la Queue."""
+        self._cola.put((time.monotonic(), tuple(lineas)))
+
+def _escritor(ruta: str, cola: Queue, stats: Queue, lote: int, intervalo_fsync: float) -> None:
+    escritas = lotes = fsyncs = 0
+    latencias = Histograma()
+    registrar = latencias.registrar
+    ultimo_fsync = time.monotonic()
+    with open(ruta, "a", encoding="utf-8") as f:
+        fin = False
+        while not fin:
+            try:
+                msg = cola.get(timeout=intervalo_fsync)
+            except queue.Empty:
+                msg = _NADA  # cola vacía: solo se comprueba si toca fsync
+            pendientes: list[str] = []
+            enviados: list[float] = []
+            while msg is not _NADA:
+                if msg is _FIN:
+                    fin = True
+                    break
+                t_envio, lineas = msg
+                pendientes.extend(lineas)
+                enviados.append(t_envio)
+                if len(pendientes) >= lote:
+                    break
+                try:
+                    msg = cola.get_nowait()
+                except queue.Empty:
+                    msg = _NADA
+            if pendientes:
+                f.write("\n".join(pendientes) + "\n")
+                f.flush()
+                ahora = time.monotonic()
+                for t in enviados:
+                    registrar(int((ahora - t) * 1e6))
+                escritas += len(pendientes)
+                lotes += 1
+            if fin or time.monotonic() - ultimo_fsync >= intervalo_fsync:
+                os.fsync(f.fileno())
+                fsyncs += 1
+                ultimo_fsync = time.monotonic()
+    stats.put({"lineas": escritas, "lotes": lotes, "fsyncs": fsyncs,
+               "latencia_p50_ms": latencias.percentil(50) / 1000, "latencia_p99_ms": latencias.percentil(99) / 1000,
+               "latencia_p999_ms": latencias.percentil(99.9) / 1000})
+
+class EscritorLog:
+    def __init__(self, ruta: str | os.PathLike, lote: int = 5_000, intervalo_fsync: float = 1.0,
+                 capacidad: int = 0):
+        self.ruta = os.fspath(ruta)
+        self._cola: Queue = Queue(capacidad)
+        self._stats: Queue = Queue()
+        self._proceso = Process(target=_escritor, name="escritor-log",
+                                args=(self.ruta, self._cola, self._stats, lote, intervalo_fsync))
+        self.estadisticas: dict | None = None
+
+    def iniciar(self) -> "EscritorLog":
+        self._proceso.start()
+        return self
+
+    def cliente(self) -> ClienteLog:
+        return ClienteLog(self._cola)
+
+    def cerrar(self, timeout: float | None = 30.0) -> dict:
+        """
+        Espera a que se escriba todo lo encolado, hace fsync y devuelve estadísticas.
+        Si el escritor no se inició o ha muerto lanza RuntimeError en vez de
+        bloquear; si no termina en `timeout` segundos, TimeoutError.
+        """
+        if self.estadisticas is not None:
+            return self.estadisticas
+        proceso = self._proceso
+        if proceso.pid is None:
+            raise RuntimeError("EscritorLog no iniciado")
+        limite = None if timeout is None else time.monotonic() + timeout
+
+        def comprobar() -> None:
+            if not proceso.is_alive():
+                raise RuntimeError(f"El proceso escritor terminó (exitcode={proceso.exitcode}) sin cerrar el log")
+            if limite is not None and time.monotonic() > limite:
+                raise TimeoutError(f"El escritor no terminó en {timeout} s")
+
+        while True:
+            comprobar()
+            try:
+                self._cola.put(_FIN, timeout=0.2)  # con capacidad, la cola puede estar llena
+                break
+            except queue.Full:
+                pass
+        while self.estadisticas is None:
+            try:
+                self.estadisticas = self._stats.get(timeout=0.2)
+            except queue.Empty:
+                if not proceso.is_alive():
+                    # pudo publicar las estadísticas justo antes de salir
+                    try:
+                        self.estadisticas = self._stats.get(timeout=0.5)
+                    except queue.Empty:
+                        comprobar()
+                else:
+                    comprobar()
+        proceso.join(None if limite is None else max(limite - time.monotonic(), 0))
+        return self.estadisticas
+
+    def __enter__(self) -> "EscritorLog":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
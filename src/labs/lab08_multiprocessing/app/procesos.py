@@ -0,0 +1,36 @@
+# app/procesos.py
+from __future__ import annotations
+from multiprocessing import Value, Lock
+from pathlib import Path
+import time
+
+def incrementar(contador: Value, n_iter: int = 100_000, lock: Lock | None = None) -> None:
+    if lock is None:
+        for _ in range(n_iter):
+            contador.value += 1
+    else:
+        for _ in range(n_iter):
+            with lock:
+                contador.value += 1
+
+def escribir_log(path: str | Path, mensaje: str) -> None:
+    """
+    Escribe una línea en un archivo compartido SIN sincronización.
+    Bajo contención, pueden aparecer líneas mezcladas o truncadas.
+    """
+    p = Path(path)
+    # Simula trabajo para aumentar la probabilidad de intercalado
+    time.sleep(0.001)
+    with p.open("a", encoding="utf-8") as f:
+        f.write(mensaje + "\n")
+
+def escribir_log_seguro(path: str | Path, mensaje: str, lock: Lock) -> None:
+    """
+    Escribe una línea en un archivo compartido con protección por Lock.
+    Garantiza atomicidad a nivel lógico para cada línea.
+    """
+    p = Path(path)
+    time.sleep(0.001)
+    with lock:
+        with p.open("a", encoding="utf-8") as f:
+            f.write(mensaje + "\n")
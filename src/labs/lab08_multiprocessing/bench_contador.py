@@ -0,0 +1,47 @@
+# bench_contador.py
+"""
+N procesos × M incrementos: Value sin lock (con carrera), Value con Lock por
+incremento y ContadorFragmentado.
+
+    python bench_contador.py --procesos 4 --iter 100000
+"""
+import argparse
+import time
+from multiprocessing import Lock, Process, Value
+from app.procesos import incrementar
+from app.contadores import ContadorFragmentado, incrementar_fragmentado
+
+def lanzar(objetivo, args_por_proceso) -> float:
+    procesos = [Process(target=objetivo, args=a) for a in args_por_proceso]
+    t0 = time.perf_counter()
+    for p in procesos: p.start()
+    for p in procesos: p.join()
+    return time.perf_counter() - t0
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_contador")
+    p.add_argument("--procesos", type=int, default=4)
+    p.add_argument("--iter", type=int, default=100_000)
+    args = p.parse_args()
+    n, it = args.procesos, args.iter
+    esperado = n * it
+
+    racy = Value("q", 0, lock=False)
+    t_racy = lanzar(incrementar, [(racy, it)] * n)
+
+    bloqueado, lock = Value("q", 0, lock=False), Lock()
+    t_lock = lanzar(incrementar, [(bloqueado, it, lock)] * n)
+
+    with ContadorFragmentado(n) as frag:
+        t_frag = lanzar(incrementar_fragmentado, [(frag, i, it) for i in range(n)])
+        v_frag = frag.valor()
+
+    print(f"{n} procesos × {it:,} incrementos (esperado {esperado:,})")
+    for nombre, t, v in (("Value sin lock", t_racy, racy.value),
+                         ("Value + Lock", t_lock, bloqueado.value),
+                         ("Fragmentado", t_frag, v_frag)):
+        estado = "ok" if v == esperado else f"PERDIDOS {esperado - v:,}"
+        print(f"  {nombre:>15}: {t:7.3f} s  {esperado / t:12,.0f} inc/s  valor={v:,} [{estado}]")
+
+if __name__ == "__main__":
+    main()
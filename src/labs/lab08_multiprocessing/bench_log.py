@@ -0,0 +1,92 @@
+# bench_log.py
+"""
+Log multiproceso: Lock por línea (abrir/escribir/cerrar bajo lock, como en la
+Fase 3) frente a EscritorLog (cola + proceso escritor), línea a línea y por
+lotes. Reporta líneas/s y, medida igual en todas las variantes, la latencia
+p50/p99/p99.9 de cada llamada del productor (escritura bajo lock, put o
+put de lote). Para EscritorLog añade la latencia de put a escrito en disco,
+que mide el proceso escritor y no tiene equivalente con Lock.
+
+    python bench_log.py --procesos 8 --lineas 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+from multiprocessing import Lock, Process, Queue
+from statistics import quantiles
+from app.escritor_log import EscritorLog
+
+def percentiles_ms(lat: list[float]) -> tuple[float, float, float]:
+    q = quantiles(lat, n=1000)
+    return q[499] * 1000, q[989] * 1000, q[998] * 1000
+
+def worker_lock(ruta: str, lock, idx: int, n: int, salida: Queue) -> None:
+    lat = []
+    for j in range(n):
+        t0 = time.monotonic()
+        with lock:
+            with open(ruta, "a", encoding="utf-8") as f:
+                f.write(f"P{idx:02d} L{j:06d} evento de prueba\n")
+        lat.append(time.monotonic() - t0)
+    salida.put(lat)
+
+def worker_cola(cliente, idx: int, n: int, lote: int, salida: Queue) -> None:
+    lat = []
+    if lote <= 1:
+        for j in range(n):
+            t0 = time.monotonic()
+            cliente.escribir(f"P{idx:02d} L{j:06d} evento de prueba")
+            lat.append(time.monotonic() - t0)
+        salida.put(lat)
+        return
+    buf = []
+    for j in range(n):
+        buf.append(f"P{idx:02d} L{j:06d} evento de prueba")
+        if len(buf) == lote or j == n - 1:
+            t0 = time.monotonic()
+            cliente.escribir_lote(buf)
+            lat.append(time.monotonic() - t0)
+            buf = []
+    salida.put(lat)
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_log")
+    p.add_argument("--procesos", type=int, default=8)
+    p.add_argument("--lineas", type=int, default=20_000, help="Líneas por proceso")
+    args = p.parse_args()
+    total = args.procesos * args.lineas
+
+    with tempfile.TemporaryDirectory() as d:
+        ruta = os.path.join(d, "lock.txt")
+        lock, salida = Lock(), Queue()
+        procesos = [Process(target=worker_lock, args=(ruta, lock, i, args.lineas, salida))
+                    for i in range(args.procesos)]
+        t0 = time.perf_counter()
+        for pr in procesos: pr.start()
+        lat = [x for _ in procesos for x in salida.get()]
+        for pr in procesos: pr.join()
+        dt = time.perf_counter() - t0
+        print(f"{'Lock por línea':>22}: {total / dt:10,.0f} líneas/s  "
+              "llamada p50/p99/p99.9 = {:.3f}/{:.3f}/{:.3f} ms".format(*percentiles_ms(lat)))
+
+        for nombre, lote in (("EscritorLog (línea)", 1), ("EscritorLog (lote 100)", 100)):
+            ruta = os.path.join(d, f"cola{lote}.txt")
+            t0 = time.perf_counter()
+            with EscritorLog(ruta) as log:
+                procesos = [Process(target=worker_cola, args=(log.cliente(), i, args.lineas, lote, salida))
+                            for i in range(args.procesos)]
+                for pr in procesos: pr.start()
+                lat = [x for _ in procesos for x in salida.get()]
+                for pr in procesos: pr.join()
+            dt = time.perf_counter() - t0
+            s = log.estadisticas
+            assert s["lineas"] == total
+            print(f"{nombre:>22}: {total / dt:10,.0f} líneas/s  "
+                  "llamada p50/p99/p99.9 = {:.3f}/{:.3f}/{:.3f} ms".format(*percentiles_ms(lat)))
+            print(f"{'':>22}  put→disco p50/p99/p99.9 = "
+                  f"{s['latencia_p50_ms']:.3f}/{s['latencia_p99_ms']:.3f}/{s['latencia_p999_ms']:.3f} ms  "
+                  f"({s['lotes']} escrituras, {s['fsyncs']} fsync)")
+
+if __name__ == "__main__":
+    main()
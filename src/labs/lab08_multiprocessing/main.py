@@ -0,0 +1,67 @@
+# main.py
+from multiprocessing import Process, Value, Lock
+from pathlib import Path
+from app.procesos import incrementar, escribir_log_seguro
+from app.contadores import ContadorFragmentado, incrementar_fragmentado
+from app.escritor_log import EscritorLog
+
+N_PROCESOS = 4
+N_ITER = 100_000
+N_LINEAS_POR_PROCESO = 200
+
+def fase1_contador_sin_lock():
+    contador = Value('i', 0, lock=False)
+    procesos = [Process(target=incrementar, args=(contador, N_ITER)) for _ in range(N_PROCESOS)]
+    for p in procesos: p.start()
+    for p in procesos: p.join()
+    print(f"Fase 1 (sin lock): {contador.value} (esperado {N_PROCESOS * N_ITER})")
+
+def fase2_contador_con_lock():
+    contador = Value('i', 0, lock=False)
+    lock = Lock()
+    procesos = [Process(target=incrementar, args=(contador, N_ITER, lock)) for _ in range(N_PROCESOS)]
+    for p in procesos: p.start()
+    for p in procesos: p.join()
+    print(f"Fase 2 (con lock): {contador.value} (esperado {N_PROCESOS * N_ITER})")
+
+def contador_fragmentado():
+    with ContadorFragmentado(N_PROCESOS) as contador:
+        procesos = [Process(target=incrementar_fragmentado, args=(contador, i, N_ITER))
+                    for i in range(N_PROCESOS)]
+        for p in procesos: p.start()
+        for p in procesos: p.join()
+        print(f"Fragmentado (sin lock, un slot por proceso): {contador.valor()} "
+              f"(esperado {N_PROCESOS * N_ITER})")
+
+def _worker_lock(path, lock, idx):
+    for j in range(N_LINEAS_POR_PROCESO):
+        escribir_log_seguro(path, f"[SEG] P{idx:02d} L{j:04d}", lock)
+
+def _worker_cola(cliente, idx):
+    for j in range(N_LINEAS_POR_PROCESO):
+        cliente.escribir(f"[COLA] P{idx:02d} L{j:04d}")
+
+def fase3_log_con_lock():
+    path = Path("log_con_lock.txt")
+    if path.exists(): path.unlink()
+    lock = Lock()
+    procesos = [Process(target=_worker_lock, args=(path, lock, i)) for i in range(N_PROCESOS)]
+    for p in procesos: p.start()
+    for p in procesos: p.join()
+    print(f"Fase 3 (con lock) → revisa {path}")
+
+def log_con_escritor():
+    path = Path("log_escritor.txt")
+    if path.exists(): path.unlink()
+    with EscritorLog(path) as log:
+        procesos = [Process(target=_worker_cola, args=(log.cliente(), i)) for i in range(N_PROCESOS)]
+        for p in procesos: p.start()
+        for p in procesos: p.join()
+    print(f"Escritor único (cola, sin lock) → revisa {path}: {log.estadisticas}")
+
+if __name__ == "__main__":
+    fase1_contador_sin_lock()
+    fase2_contador_con_lock()
+    contador_fragmentado()
+    fase3_log_con_lock()
+    log_con_escritor()
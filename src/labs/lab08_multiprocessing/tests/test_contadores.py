@@ -0,0 +1,44 @@
+import pickle
+import unittest
+from multiprocessing import Process, get_context
+from app.contadores import ContadorFragmentado, incrementar_fragmentado
+
+class TestContadorFragmentado(unittest.TestCase):
+    def test_procesos_suman_exacto(self):
+        with ContadorFragmentado(4) as c:
+            procesos = [Process(target=incrementar_fragmentado, args=(c, i, 5000)) for i in range(4)]
+            for p in procesos: p.start()
+            for p in procesos: p.join()
+            self.assertEqual(c.valor(), 20_000)
+            self.assertEqual(c.valores(), [5000] * 4)
+
+    def test_spawn_se_adjunta_por_nombre(self):
+        ctx = get_context("spawn")
+        with ContadorFragmentado(2) as c:
+            procesos = [ctx.Process(target=incrementar_fragmentado, args=(c, i, 100)) for i in range(2)]
+            for p in procesos: p.start()
+            for p in procesos: p.join()
+            self.assertEqual(c.valor(), 200)
+
+    def test_slot_en_el_mismo_proceso(self):
+        with ContadorFragmentado(3) as c:
+            c.slot(0).incrementar()
+            c.slot(2).incrementar(10)
+            self.assertEqual(c.valores(), [1, 0, 10])
+            self.assertEqual(c.slot(2).valor, 10)
+            with self.assertRaises(IndexError):
+                c.slot(3)
+
+    def test_pickle_comparte_bloque(self):
+        with ContadorFragmentado(2) as c:
+            copia = pickle.loads(pickle.dumps(c))
+            copia.slot(1).incrementar(7)
+            self.assertEqual(c.valor(), 7)
+            copia.cerrar()
+
+    def test_n_slots_invalido(self):
+        with self.assertRaises(ValueError):
+            ContadorFragmentado(0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import Process
+from app.escritor_log import EscritorLog, Histograma
+
+def worker(cliente, idx, n, por_lotes=False):
+    lineas = [f"P{idx:02d} L{j:05d} " + "x" * 50 for j in range(n)]
+    if por_lotes:
+        for i in range(0, n, 100):
+            cliente.escribir_lote(lineas[i:i + 100])
+    else:
+        for linea in lineas:
+            cliente.escribir(linea)
+
+class TestEscritorLog(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.dir.name, "log.txt")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def lanzar(self, por_lotes):
+        with EscritorLog(self.ruta, lote=256, intervalo_fsync=0.05) as log:
+            procesos = [Process(target=worker, args=(log.cliente(), i, 1000, por_lotes)) for i in range(4)]
+            for p in procesos: p.start()
+            for p in procesos: p.join()
+        return log.estadisticas
+
+    def comprobar_lineas(self):
+        with open(self.ruta, encoding="utf-8") as f:
+            lineas = f.read().splitlines()
+        self.assertEqual(len(lineas), 4000)
+        self.assertTrue(all(len(l) == 61 and l.endswith("x" * 50) for l in lineas))
+        for i in range(4):  # el orden de cada productor se conserva
+            propias = [l for l in lineas if l.startswith(f"P{i:02d}")]
+            self.assertEqual(propias, sorted(propias))
+
+    def test_lineas_completas_sin_intercalar(self):
+        stats = self.lanzar(por_lotes=False)
+        self.comprobar_lineas()
+        self.assertEqual(stats["lineas"], 4000)
+        self.assertGreaterEqual(stats["fsyncs"], 1)
+        self.assertLess(stats["lotes"], 4000)
+        self.assertLessEqual(stats["latencia_p50_ms"], stats["latencia_p99_ms"])
+
+    def test_escribir_lote(self):
+        stats = self.lanzar(por_lotes=True)
+        self.comprobar_lineas()
+        self.assertEqual(stats["lineas"], 4000)
+
+    def test_cerrar_idempotente(self):
+        log = EscritorLog(self.ruta).iniciar()
+        log.cliente().escribir("hola")
+        self.assertEqual(log.cerrar(), log.cerrar())
+        with open(self.ruta, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "hola\n")
+
+    def test_cerrar_no_bloquea_si_el_escritor_no_vive(self):
+        with self.assertRaises(RuntimeError):
+            EscritorLog(self.ruta).cerrar()
+        log = EscritorLog(self.ruta).iniciar()
+        log._proceso.terminate()
+        log._proceso.join()
+        with self.assertRaisesRegex(RuntimeError, "exitcode"):
+            log.cerrar(timeout=5)
+
+class TestHistograma(unittest.TestCase):
+    def test_percentiles_con_memoria_fija(self):
+        h = Histograma()
+        tam = len(h.cubos)
+        for us in [100] * 900 + [10_000] * 99 + [2_000_000]:
+            h.registrar(us)
+        self.assertEqual(len(h.cubos), tam)
+        self.assertAlmostEqual(h.percentil(50), 100, delta=100 / 8)
+        self.assertAlmostEqual(h.percentil(99), 10_000, delta=10_000 / 8)
+        self.assertEqual(h.percentil(100), 2_000_000)
+        self.assertEqual(Histograma().percentil(50), 0)
+
+    def test_cubos_contiguos(self):
+        for us in range(5_000):
+            i = Histograma.cubo(us)
+            self.assertLessEqual(Histograma.limite_inferior(i), us)
+            self.assertLess(us, Histograma.limite_inferior(i + 1))
+
+if __name__ == "__main__":
+    unittest.main()
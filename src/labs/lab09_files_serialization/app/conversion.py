@@ -0,0 +1,472 @@
+# app/conversion.py
+from __future__ import annotations
+from pathlib import Path
+from array import array
+from typing import Callable, Iterable, Iterator
+import json, mmap, pickle, struct, sys
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from .esquema import coaccionar, inferir_esquema
+
+try:  # opcional: solo para TablaColumnar.numpy()
+    import numpy as np
+except ImportError:
+    np = None
+
+# ---------- JSON ----------
+def guardar_json(datos: list[dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+def cargar_json(path: Path) -> list[dict]:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ---------- Pickle ----------
+def guardar_pickle(datos: list[dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        pickle.dump(datos, f)
+
+def cargar_pickle(path: Path) -> list[dict]:
+    with path.open("rb") as f:
+        return pickle.load(f)
+
+# ---------- XML ----------
+def guardar_xml(datos: list[dict], path: Path, root_name: str = "items", item_name: str = "item") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    root = ET.Element(root_name)
+    for row in datos:
+        node = ET.SubElement(root, item_name)
+        for k, v in row.items():
+            el = ET.SubElement(node, str(k))
+            el.text = "" if v is None else str(v)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+def cargar_xml(path: Path, item_name: str = "item") -> list[dict]:
+    tree = ET.parse(path)
+    root = tree.getroot()
+    out: list[dict] = []
+    for node in root.findall(item_name):
+        row: dict = {}
+        for child in list(node):
+            row[child.tag] = child.text
+        out.append(row)
+    return out
+
+# ---------- Utilidades de equivalencia ----------
+def normalizar_tipos(dataset: list[dict]) -> list[dict]:
+    """
+    Normaliza valores para comparar equivalencia entre formatos (XML guarda todo como texto).
+    Infiere el tipo de cada columna con todo el dataset y convierte columna a columna
+    (ver app.esquema). Solo a tipos que existen en JSON: las fechas se quedan como
+    texto, que es como las guarda JSON.
+    """
+    esquema = {c: "str" if t == "date" else t for c, t in inferir_esquema(dataset, None).items()}
+    return coaccionar(dataset, esquema)[0]
+
+# ---------- Streaming (memoria constante) ----------
+# Los lectores son generadores de dicts y los escritores consumen cualquier
+# iterable de dicts y devuelven cuántos registros escribieron: así se puede
+# convertir entre formatos sin tener nunca el dataset entero en memoria.
+
+def escribir_jsonl(registros: Iterable[dict], path: Path) -> int:
+    """JSON Lines: un objeto JSON por línea."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with path.open("w", encoding="utf-8") as f:
+        for row in registros:
+            f.write(dumps(row))
+            f.write("\n")
+            n += 1
+    return n
+
+def leer_jsonl(path: Path) -> Iterator[dict]:
+    loads = json.JSONDecoder().decode
+    with path.open("r", encoding="utf-8") as f:
+        for linea in f:
+            if linea.strip():
+                yield loads(linea)
+
+def escribir_xml_stream(registros: Iterable[dict], path: Path,
+                        root_name: str = "items", item_name: str = "item") -> int:
+    """
+    Mismo formato que guardar_xml, pero serializando registro a registro.
+    Se escapa el texto a mano: crear un Element y llamar a tostring por
+    registro cuesta más que la propia escritura.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    with path.open("w", encoding="utf-8") as f:
+        f.write(f"<?xml version='1.0' encoding='utf-8'?>\n<{root_name}>")
+        for row in registros:
+            partes = [f"<{item_name}>"]
+            for k, v in row.items():
+                partes.append(f"<{k}>{escape(str(v))}</{k}>" if v is not None and v != "" else f"<{k} />")
+            partes.append(f"</{item_name}>")
+            f.write("".join(partes))
+            n += 1
+        f.write(f"</{root_name}>")
+    return n
+
+def leer_xml_stream(path: Path, item_name: str = "item") -> Iterator[dict]:
+    """
+    iterparse liberando cada elemento al procesarlo (y sus referencias desde
+    la raíz), de modo que el árbol nunca crece. Los valores son texto, como
+    en cargar_xml.
+    """
+    contexto = ET.iterparse(path, events=("start", "end"))
+    _, root = next(contexto)
+    for evento, el in contexto:
+        if evento == "end" and el.tag == item_name:
+            yield {child.tag: child.text for child in el}
+            el.clear()
+            root.clear()
+
+TAM_TRAMA_PICKLE = 1_000  # registros por trama
+
+def escribir_pickle_stream(registros: Iterable[dict], path: Path,
+                           tam_trama: int = TAM_TRAMA_PICKLE) -> int:
+    """
+    Pickle por tramas: una secuencia de pickle.dump de listas de hasta
+    `tam_trama` registros. Agrupar amortiza el coste por llamada sin perder
+    la lectura incremental. Como todo pickle, cargar solo ficheros de confianza.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n = 0
+    trama: list[dict] = []
+    with path.open("wb") as f:
+        p = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+        for row in registros:
+            trama.append(row)
+            if len(trama) >= tam_trama:
+                p.dump(trama)
+                p.clear_memo()
+                n += len(trama)
+                trama = []
+        if trama:
+            p.dump(trama)
+            n += len(trama)
+    return n
+
+def leer_pickle_stream(path: Path) -> Iterator[dict]:
+    # pickle.load por trama: un Unpickler reutilizado acumula su memo entre tramas
+    with path.open("rb") as f:
+        while True:
+            try:
+                trama = pickle.load(f)
+            except EOFError:
+                return
+            yield from trama
+
+# ---------- Columnar binario ----------
+# Fichero = MAGIA + longitud (u32 LE) + cabecera JSON + buffers alineados a 64 B.
+# Cada columna es un buffer contiguo little-endian (int64 'q', float64 'd',
+# bool 'B') o, para texto, un blob UTF-8 más un buffer de offsets int64 (n+1).
+# Los nulos van en una máscara de bytes aparte, solo si la columna los tiene.
+# Leer = mmap + memoryview.cast / numpy.frombuffer: sin copias ni deserializar.
+# El escritor acumula columnas compactas (arrays, no dicts), así que su memoria
+# crece con el dataset aunque mucho más despacio que una list[dict].
+
+MAGIA_COLUMNAR = b"LABCOL\x00\x01"
+ALINEACION = 64
+TIPOS_COLUMNAR = {"int64": "q", "float64": "d", "bool": "B", "str": None}
+DTYPES_COLUMNAR = {"int64": "<i8", "float64": "<f8", "bool": "u1"}
+TAM_BLOQUE_COLUMNAR = 10_000  # filas por bloque al iterar registros
+
+def _alinear(n: int) -> int:
+    return n + (-n % ALINEACION)
+
+def _tipo_de(v) -> str:
+    if isinstance(v, bool):
+        return "bool"
+    if isinstance(v, int):
+        return "int64"
+    if isinstance(v, float):
+        return "float64"
+    if isinstance(v, str):
+        return "str"
+    raise TypeError(f"Tipo no soportado en formato columnar: {type(v).__name__}")
+
+def _a_bool(v) -> bool:
+    if isinstance(v, str):
+        return v.strip().lower() in ("1", "true", "t", "si", "sí", "yes")
+    return bool(v)
+
+class _Columna:
+    """Acumulador de una columna. Infiere el tipo del primer valor no nulo; int→float se promociona."""
+    __slots__ = ("nombre", "tipo", "forzado", "datos", "offsets", "nulos", "n", "hay_nulos")
+
+    def __init__(self, nombre: str, tipo: str | None = None, nulos_previos: int = 0):
+        if tipo is not None and tipo not in TIPOS_COLUMNAR:
+            raise ValueError(f"Tipo inválido para {nombre!r}: {tipo!r}. Válidos: {sorted(TIPOS_COLUMNAR)}")
+        self.nombre, self.tipo, self.forzado = nombre, None, tipo is not None
+        self.datos = self.offsets = None
+        self.nulos, self.n, self.hay_nulos = bytearray(), 0, False
+        if tipo:
+            self._fijar(tipo)
+        for _ in range(nulos_previos):
+            self.agregar(None)
+
+    def _fijar(self, tipo: str) -> None:
+        self.tipo = tipo
+        if tipo == "str":
+            self.datos, self.offsets = bytearray(), array("q", [0]) * (self.n + 1)
+        else:
+            self.datos = array(TIPOS_COLUMNAR[tipo], [0]) * self.n
+
+    def agregar(self, v) -> None:
+        if v is None:
+            self.nulos.append(1)
+            self.hay_nulos = True
+            if self.tipo == "str":
+                self.offsets.append(len(self.datos))
+            elif self.tipo:
+                self.datos.append(0)
+            self.n += 1
+            return
+        if self.tipo is None:
+            self._fijar(_tipo_de(v))
+        elif not self.forzado and (t := _tipo_de(v)) != self.tipo:
+            if self.tipo == "int64" and t == "float64":
+                self.datos, self.tipo = array("d", self.datos), "float64"
+            elif not (self.tipo == "float64" and t == "int64"):
+                raise TypeError(f"Columna {self.nombre!r}: valor {t} en columna {self.tipo} (usa tipos= para forzar)")
+        if self.tipo == "str":
+            self.datos += str(v).encode("utf-8")
+            self.offsets.append(len(self.datos))
+        elif self.tipo == "bool":
+            self.datos.append(_a_bool(v))
+        elif self.tipo == "int64":
+            self.datos.append(int(v))
+        else:
+            self.datos.append(float(v))
+        self.nulos.append(0)
+        self.n += 1
+
+def _nativo_a_le(buf):
+    if sys.byteorder == "little" or not isinstance(buf, array):
+        return buf
+    copia = array(buf.typecode, buf)
+    copia.byteswap()
+    return copia
+
+def escribir_columnar(registros: Iterable[dict], path: Path, tipos: dict[str, str] | None = None) -> int:
+    """
+    Escribe registros en formato columnar. `tipos` fuerza (y convierte) el tipo
+    de columnas concretas, p. ej. {"edad": "int64"} para texto venido de XML.
+    Claves ausentes en un registro se guardan como nulos.
+    """
+    tipos = tipos or {}
+    cols: dict[str, _Columna] = {}
+    n = 0
+    for row in registros:
+        for k, v in row.items():
+            c = cols.get(k)
+            if c is None:
+                c = cols[k] = _Columna(str(k), tipos.get(k), nulos_previos=n)
+            c.agregar(v)
+        n += 1
+        if len(row) < len(cols):
+            for c in cols.values():
+                if c.n < n:
+                    c.agregar(None)
+
+    bloques: list = []
+    pos = 0
+    def reservar(buf) -> list[int]:
+        nonlocal pos
+        buf = _nativo_a_le(buf)
+        lon = len(buf) * (buf.itemsize if isinstance(buf, array) else 1)
+        ref = [pos, lon]
+        bloques.append(buf)
+        relleno = -lon % ALINEACION
+        if relleno:
+            bloques.append(bytes(relleno))
+        pos += lon + relleno
+        return ref
+
+    meta = []
+    for c in cols.values():
+        if c.tipo is None:  # columna solo con nulos
+            c._fijar(tipos.get(c.nombre, "str"))
+        meta.append({
+            "nombre": c.nombre, "tipo": c.tipo, "datos": reservar(c.datos),
+            "offsets": reservar(c.offsets) if c.tipo == "str" else None,
+            "nulos": reservar(c.nulos) if c.hay_nulos else None,
+        })
+    cabecera = json.dumps({"version": 1, "n": n, "columnas": meta}, ensure_ascii=False).encode("utf-8")
+    inicio = _alinear(len(MAGIA_COLUMNAR) + 4 + len(cabecera))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        f.write(MAGIA_COLUMNAR)
+        f.write(struct.pack("<I", len(cabecera)))
+        f.write(cabecera)
+        f.write(bytes(inicio - len(MAGIA_COLUMNAR) - 4 - len(cabecera)))
+        for buf in bloques:
+            f.write(buf)
+    return n
+
+class TablaColumnar:
+    """
+    Fichero columnar abierto con mmap. columna() devuelve un memoryview tipado
+    sobre el propio fichero (sin copia); numpy() lo mismo como ndarray de solo
+    lectura. Los memoryview dejan de ser válidos tras cerrar().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._vistas: dict[tuple[str, str], memoryview | array] = {}
+        self._f = self.path.open("rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # fichero vacío
+            self._f.close()
+            raise ValueError(f"{self.path} no es un fichero columnar") from None
+        if self._mm[:len(MAGIA_COLUMNAR)] != MAGIA_COLUMNAR:
+            self.cerrar()
+            raise ValueError(f"{self.path} no es un fichero columnar")
+        base = len(MAGIA_COLUMNAR)
+        (lon,) = struct.unpack_from("<I", self._mm, base)
+        cab = json.loads(self._mm[base + 4:base + 4 + lon])
+        self.n: int = cab["n"]
+        self._inicio = _alinear(base + 4 + lon)
+        self._cols = {c["nombre"]: c for c in cab["columnas"]}
+
+    @property
+    def columnas(self) -> list[str]:
+        return list(self._cols)
+
+    @property
+    def tipos(self) -> dict[str, str]:
+        return {k: c["tipo"] for k, c in self._cols.items()}
+
+    def _meta(self, nombre: str) -> dict:
+        try:
+            return self._cols[nombre]
+        except KeyError:
+            raise KeyError(f"Columna desconocida: {nombre!r}. Disponibles: {self.columnas}") from None
+
+    def _vista(self, nombre: str, parte: str, codigo: str):
+        clave = (nombre, parte)
+        if clave not in self._vistas:
+            off, lon = self._meta(nombre)[parte]
+            mv = memoryview(self._mm)[self._inicio + off:self._inicio + off + lon].cast(codigo)
+            if sys.byteorder != "little" and codigo != "B":
+                mv = array(codigo, mv)
+                mv.byteswap()
+            self._vistas[clave] = mv
+        return self._vistas[clave]
+
+    def columna(self, nombre: str):
+        """int64/float64/bool: memoryview sin copia (los nulos valen 0). str: lista decodificada."""
+        c = self._meta(nombre)
+        if c["tipo"] == "str":
+            return self._valores(nombre, 0, self.n)
+        return self._vista(nombre, "datos", TIPOS_COLUMNAR[c["tipo"]])
+
+    def nulos(self, nombre: str) -> memoryview | None:
+        """Máscara de nulos (1 = nulo) o None si la columna no tiene ninguno."""
+        return self._vista(nombre, "nulos", "B") if self._meta(nombre)["nulos"] else None
+
+    def numpy(self, nombre: str):
+        """ndarray de solo lectura sobre el mmap (numpy.frombuffer, sin copia)."""
+        if np is None:
+            raise RuntimeError("NumPy no está instalado: usa columna() para un memoryview")
+        c = self._meta(nombre)
+        if c["tipo"] == "str":
+            raise TypeError(f"La columna {nombre!r} es de texto; usa columna()")
+        off, lon = c["datos"]
+        return np.frombuffer(self._mm, dtype=DTYPES_COLUMNAR[c["tipo"]], count=self.n, offset=self._inicio + off)
+
+    def _valores(self, nombre: str, i: int, j: int) -> list:
+        c = self._meta(nombre)
+        if c["tipo"] == "str":
+            offs = self._vista(nombre, "offsets", "q")
+            a, b = offs[i], offs[j]
+            blob = bytes(self._vista(nombre, "datos", "B")[a:b])
+            vals = [blob[offs[k] - a:offs[k + 1] - a].decode("utf-8") for k in range(i, j)]
+        else:
+            vals = self._vista(nombre, "datos", TIPOS_COLUMNAR[c["tipo"]])[i:j].tolist()
+            if c["tipo"] == "bool":
+                vals = [v == 1 for v in vals]
+        if c["nulos"]:
+            mascara = self._vista(nombre, "nulos", "B")[i:j]
+            vals = [None if m else v for v, m in zip(vals, mascara)]
+        return vals
+
+    def valores(self, nombre: str) -> list:
+        """Copia de la columna como lista de Python, con None en los nulos."""
+        return self._valores(nombre, 0, self.n)
+
+    def registros(self, columnas: Iterable[str] | None = None) -> Iterator[dict]:
+        """Itera dicts por bloques de TAM_BLOQUE_COLUMNAR filas, solo con las columnas pedidas."""
+        nombres = list(columnas) if columnas is not None else self.columnas
+        for nombre in nombres:
+            self._meta(nombre)
+        for i in range(0, self.n, TAM_BLOQUE_COLUMNAR):
+            j = min(i + TAM_BLOQUE_COLUMNAR, self.n)
+            bloque = [self._valores(nombre, i, j) for nombre in nombres]
+            for fila in zip(*bloque):
+                yield dict(zip(nombres, fila))
+
+    def cerrar(self) -> None:
+        for v in self._vistas.values():
+            if isinstance(v, memoryview):
+                v.release()
+        self._vistas.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # quedan ndarrays vivos: el mapeo se libera cuando los recoja el GC
+        self._f.close()
+
+    def __enter__(self) -> "TablaColumnar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+def leer_columnar(path: Path, columnas: Iterable[str] | None = None) -> dict[str, list]:
+    """Carga las columnas pedidas (todas por defecto) como listas de Python."""
+    with TablaColumnar(path) as t:
+        return {c: t.valores(c) for c in (columnas if columnas is not None else t.columnas)}
+
+def leer_columnar_registros(path: Path, columnas: Iterable[str] | None = None) -> Iterator[dict]:
+    with TablaColumnar(path) as t:
+        yield from t.registros(columnas)
+
+LECTORES: dict[str, Callable[..., Iterator[dict]]] = {
+    "jsonl": leer_jsonl,
+    "xml": leer_xml_stream,
+    "pickle": leer_pickle_stream,
+    "columnar": leer_columnar_registros,
+}
+ESCRITORES: dict[str, Callable[..., int]] = {
+    "jsonl": escribir_jsonl,
+    "xml": escribir_xml_stream,
+    "pickle": escribir_pickle_stream,
+    "columnar": escribir_columnar,
+}
+EXTENSIONES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".xml": "xml", ".pkl": "pickle", ".pickle": "pickle", ".col": "columnar"}
+
+def formato_de(path: Path) -> str:
+    try:
+        return EXTENSIONES[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Extensión no reconocida: {path.suffix!r}. Válidas: {sorted(EXTENSIONES)}") from None
+
+def convertir(origen: Path, destino: Path, formato_origen: str | None = None,
+              formato_destino: str | None = None, item_name: str = "item") -> int:
+    """Convierte entre jsonl/xml/pickle/columnar en streaming. Formatos por extensión si no se indican."""
+    fo = formato_origen or formato_de(origen)
+    fd = formato_destino or formato_de(destino)
+    if fo not in LECTORES or fd not in ESCRITORES:
+        raise ValueError(f"Formato inválido: {fo!r} → {fd!r}. Válidos: {sorted(LECTORES)}")
+    lector = LECTORES[fo](origen, item_name=item_name) if fo == "xml" else LECTORES[fo](origen)
+    if fd == "xml":
+        return ESCRITORES[fd](lector, destino, item_name=item_name)
+    return ESCRITORES[fd](lector, destino)
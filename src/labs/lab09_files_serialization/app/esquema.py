@@ -0,0 +1,166 @@
+# app/esquema.py
+"""
+Coerción de tipos guiada por esquema (XML y CSV lo guardan todo como texto).
+
+1. inferir_esquema: tipo de cada columna a partir de una muestra, probando
+   bool → int → float → date → str con map sobre la columna entera.
+2. coaccionar_columnas: convierte columna a columna por lotes con map y el
+   conversor nativo (int, float, date.fromisoformat). Un valor que falla se
+   trata aparte y el map se reanuda detrás de él.
+
+Los valores que no encajan no lanzan excepción: quedan como None y se anotan
+en el informe (ErrorTipo), igual que los nulos ("" o None) no cuentan como error.
+"""
+from __future__ import annotations
+from datetime import date
+from itertools import chain, islice, repeat
+from operator import itemgetter
+from typing import Callable, Iterable, NamedTuple
+
+TAM_LOTE = 4096
+TAM_MUESTRA = 1000
+MAX_ERRORES = 1000
+_AUSENTE = object()  # clave que no aparece en un registro (≠ None)
+
+_BOOLS = {"true": True, "false": False, "True": True, "False": False, "TRUE": True, "FALSE": False}
+
+def _bool(v) -> bool:
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, str) and (b := _BOOLS.get(v.strip().lower())) is not None:
+        return b
+    raise ValueError(f"no es booleano: {v!r}")
+
+def _int(v) -> int:
+    if isinstance(v, (bool, float)):
+        raise ValueError(f"no es entero: {v!r}")
+    return int(v)
+
+def _float(v) -> float:
+    if isinstance(v, bool):
+        raise ValueError(f"no es real: {v!r}")
+    return float(v)
+
+def _fecha(v) -> date:
+    return v if isinstance(v, date) else date.fromisoformat(v)
+
+def _texto(v) -> str:
+    return v if isinstance(v, str) else str(v)
+
+# Orden de inferencia: el primero que acepta toda la muestra gana
+CONVERSORES: dict[str, Callable] = {"bool": _bool, "int": _int, "float": _float, "date": _fecha, "str": _texto}
+# Conversores en C para el camino rápido (columna solo con texto)
+_RAPIDOS: dict[str, Callable] = {"bool": _BOOLS.__getitem__, "int": int, "float": float, "date": date.fromisoformat}
+_NATIVOS = {"bool": {bool}, "int": {int}, "float": {float}, "date": {date}, "str": {str}}
+
+class ErrorTipo(NamedTuple):
+    fila: int
+    columna: str
+    valor: object
+    tipo: str
+
+class InformeTipos(NamedTuple):
+    esquema: dict[str, str]
+    errores: list[ErrorTipo]        # los primeros MAX_ERRORES
+    por_columna: dict[str, int]     # total de errores por columna
+
+    @property
+    def total(self) -> int:
+        return sum(self.por_columna.values())
+
+def _es_nulo(v) -> bool:
+    return v is None or v is _AUSENTE or v == ""
+
+def _tipo_columna(valores: list) -> str:
+    valores = [v for v in valores if not _es_nulo(v)]
+    if not valores:
+        return "str"
+    for tipo, conv in CONVERSORES.items():
+        try:
+            for _ in map(conv, valores):
+                pass
+            return tipo
+        except (ValueError, TypeError):
+            continue
+    return "str"
+
+def inferir_esquema(filas: Iterable[dict], tam_muestra: int | None = TAM_MUESTRA) -> dict[str, str]:
+    """Tipo por columna a partir de las primeras `tam_muestra` filas (None = todas)."""
+    muestra = list(islice(filas, tam_muestra)) if tam_muestra is not None else list(filas)
+    columnas = dict.fromkeys(k for f in muestra for k in f)
+    return {c: _tipo_columna([f.get(c) for f in muestra]) for c in columnas}
+
+def _convertir_valor(columna: str, v, tipo: str, fila: int,
+                     errores: list[ErrorTipo], conteo: dict[str, int]):
+    if v is None or v is _AUSENTE or (v == "" and tipo != "str"):
+        return v if v is _AUSENTE else None
+    try:
+        return CONVERSORES[tipo](v)
+    except (ValueError, TypeError):
+        conteo[columna] = conteo.get(columna, 0) + 1
+        if len(errores) < MAX_ERRORES:
+            errores.append(ErrorTipo(fila, columna, v, tipo))
+        return None
+
+def _convertir_lote(columna: str, valores: list, tipo: str, inicio: int,
+                    errores: list[ErrorTipo], conteo: dict[str, int]) -> list:
+    presentes = set(map(type, valores))
+    if presentes <= _NATIVOS[tipo] and (tipo == "str" or "" not in valores):
+        return valores
+    if tipo == "str" or presentes != {str}:
+        return [_convertir_valor(columna, v, tipo, i, errores, conteo) for i, v in enumerate(valores, inicio)]
+    # Solo texto: map con el conversor en C. Si un valor falla (nulo o inválido),
+    # list.extend conserva lo ya convertido y el iterador queda justo detrás del
+    # fallo: se trata ese valor aparte y se reanuda el map.
+    rapido = _RAPIDOS[tipo]
+    out: list = []
+    it = iter(valores)
+    while True:
+        try:
+            out.extend(map(rapido, it))
+            return out
+        except (ValueError, KeyError):
+            i = len(out)
+            out.append(_convertir_valor(columna, valores[i], tipo, inicio + i, errores, conteo))
+
+def coaccionar_columnas(columnas: dict[str, list], esquema: dict[str, str]) -> tuple[dict[str, list], InformeTipos]:
+    """Convierte cada columna al tipo del esquema; las columnas fuera del esquema se dejan igual."""
+    for c, tipo in esquema.items():
+        if tipo not in CONVERSORES:
+            raise ValueError(f"Tipo inválido para {c!r}: {tipo!r}. Válidos: {list(CONVERSORES)}")
+    errores: list[ErrorTipo] = []
+    conteo: dict[str, int] = {}
+    out = {}
+    for c, valores in columnas.items():
+        tipo = esquema.get(c)
+        if tipo is None:
+            out[c] = valores
+            continue
+        convertida = []
+        for i in range(0, len(valores), TAM_LOTE):
+            convertida += _convertir_lote(c, valores[i:i + TAM_LOTE], tipo, i, errores, conteo)
+        out[c] = convertida
+    return out, InformeTipos(dict(esquema), errores, conteo)
+
+def coaccionar(filas: list[dict], esquema: dict[str, str] | None = None,
+               tam_muestra: int | None = TAM_MUESTRA) -> tuple[list[dict], InformeTipos]:
+    """
+    Versión por filas: transpone a columnas, convierte y reconstruye los dicts.
+    Sin esquema se infiere de las primeras `tam_muestra` filas.
+    """
+    if esquema is None:
+        esquema = inferir_esquema(filas, tam_muestra)
+    claves = list(dict.fromkeys(chain.from_iterable(filas)))
+    # Caso habitual: todas las filas con las mismas claves → transponer con itemgetter
+    uniformes = set(map(len, filas)) <= {len(claves)}
+    if uniformes:
+        columnas = {c: list(map(itemgetter(c), filas)) for c in claves}
+    else:
+        columnas = {c: [f.get(c, _AUSENTE) for f in filas] for c in claves}
+    convertidas, informe = coaccionar_columnas(columnas, esquema)
+    if uniformes:
+        nuevas = list(map(dict, map(zip, repeat(claves), zip(*convertidas.values()))))
+    else:
+        nuevas = [{k: v for k, v in zip(claves, fila) if v is not _AUSENTE}
+                  for fila in zip(*convertidas.values())]
+    return nuevas, informe
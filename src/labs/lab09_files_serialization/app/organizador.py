@@ -0,0 +1,144 @@
+# app/organizador.py
+"""
+Organización de ficheros por tipo (extensión) y fecha (YYYY-MM).
+
+Se trabaja en dos pasos: primero se calcula un plan (lista de Movimiento)
+recorriendo con os.scandir, que da el tipo de cada entrada sin llamar a
+stat y cachea el stat de DirEntry; después se ejecuta. El plan sirve
+también como modo simulación (dry_run). Al ejecutar:
+
+- mismo sistema de ficheros: os.rename (solo metadatos, en serie);
+- otro dispositivo: copia + borrado (shutil.move) en un pool de hilos.
+"""
+from __future__ import annotations
+import errno
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+class Movimiento(NamedTuple):
+    origen: str
+    destino: str
+    mismo_fs: bool
+
+class Resumen(NamedTuple):
+    renombrados: int
+    copiados: int
+    carpetas_creadas: int
+
+def _tipo(nombre: str) -> str:
+    ext = os.path.splitext(nombre)[1]
+    return ext[1:].lower() or "otros"
+
+def _mes(ts: float, cache: dict[tuple[int, int], str]) -> str:
+    # localtime resuelve zona y cambio de hora para cada fichero; la cadena
+    # "YYYY-MM" se formatea una vez por mes
+    t = time.localtime(ts)
+    clave = (t.tm_year, t.tm_mon)
+    mes = cache.get(clave)
+    if mes is None:
+        mes = cache[clave] = f"{t.tm_year:04d}-{t.tm_mon:02d}"
+    return mes
+
+def _dispositivo(path: str, cache: dict[str, int]) -> int:
+    """st_dev del ancestro existente más cercano (el destino puede no existir aún)."""
+    p = os.path.abspath(path)
+    while p not in cache:
+        try:
+            cache[p] = os.stat(p).st_dev
+        except FileNotFoundError:
+            padre = os.path.dirname(p)
+            if padre == p:
+                raise
+            p = padre
+    cache[path] = cache[p]
+    return cache[p]
+
+def planificar(src: str | Path, dst: str | Path, por_fecha: bool = True) -> list[Movimiento]:
+    """
+    Plan para mover los ficheros de `src` a dst/<ext>[/<YYYY-MM>]/<nombre>
+    en una sola pasada (equivale a organizar_por_tipo + organizar_por_fecha).
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    devs: dict[str, int] = {}
+    meses: dict[tuple[int, int], str] = {}
+    dev_src = _dispositivo(src, devs)
+    plan = []
+    with os.scandir(src) as it:
+        for e in it:
+            if not e.is_file(follow_symlinks=False):
+                continue
+            carpeta = os.path.join(dst, _tipo(e.name))
+            if por_fecha:
+                carpeta = os.path.join(carpeta, _mes(e.stat(follow_symlinks=False).st_mtime, meses))
+            plan.append(Movimiento(e.path, os.path.join(carpeta, e.name),
+                                   _dispositivo(carpeta, devs) == dev_src))
+    return plan
+
+def planificar_por_fecha(base: str | Path) -> list[Movimiento]:
+    """Plan de la Fase 2: dentro de cada carpeta de tipo de `base`, mover a YYYY-MM/."""
+    base = os.fspath(base)
+    if not os.path.isdir(base):
+        return []
+    meses: dict[tuple[int, int], str] = {}
+    plan = []
+    with os.scandir(base) as tipos:
+        for carpeta in tipos:
+            if not carpeta.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(carpeta.path) as it:
+                for e in it:
+                    if e.is_file(follow_symlinks=False):
+                        mes = _mes(e.stat(follow_symlinks=False).st_mtime, meses)
+                        plan.append(Movimiento(e.path, os.path.join(carpeta.path, mes, e.name), True))
+    return plan
+
+def ejecutar(plan: list[Movimiento], max_workers: int = 8) -> Resumen:
+    carpetas = {os.path.dirname(m.destino) for m in plan}
+    for c in carpetas:
+        os.makedirs(c, exist_ok=True)
+    entre_dispositivos: list[Movimiento] = []
+    renombrados = 0
+    for m in plan:
+        if not m.mismo_fs:
+            entre_dispositivos.append(m)
+            continue
+        try:
+            os.rename(m.origen, m.destino)
+            renombrados += 1
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            entre_dispositivos.append(m)
+    if entre_dispositivos:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="copia") as ex:
+            # list() propaga la primera excepción de cualquier copia
+            list(ex.map(lambda m: shutil.move(m.origen, m.destino), entre_dispositivos))
+    return Resumen(renombrados, len(entre_dispositivos), len(carpetas))
+
+def organizar_por_tipo(src: Path, dst: Path, dry_run: bool = False) -> list[Movimiento]:
+    """Organiza archivos de src en carpetas según su extensión dentro de dst. Devuelve el plan."""
+    plan = planificar(src, dst, por_fecha=False)
+    if not dry_run:
+        ejecutar(plan)
+    return plan
+
+def organizar_por_fecha(base: Path, dry_run: bool = False) -> list[Movimiento]:
+    """
+    Dentro de cada carpeta de tipo en `base`, mueve los archivos a subcarpetas YYYY-MM
+    según su fecha de modificación (mtime). Devuelve el plan.
+    """
+    plan = planificar_por_fecha(base)
+    if not dry_run:
+        ejecutar(plan)
+    return plan
+
+def organizar(src: Path, dst: Path, dry_run: bool = False, max_workers: int = 8) -> list[Movimiento]:
+    """Fases 1 y 2 en una sola pasada: cada fichero se mueve una única vez."""
+    plan = planificar(src, dst, por_fecha=True)
+    if not dry_run:
+        ejecutar(plan, max_workers=max_workers)
+    return plan
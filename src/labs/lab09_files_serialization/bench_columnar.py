@@ -0,0 +1,78 @@
+# bench_columnar.py
+"""
+Dataset numérico de N filas guardado en JSON, XML, pickle y columnar:
+tamaño en disco, carga completa y suma de una sola columna (lo típico en
+análisis). Columnar sirve la columna con mmap sin deserializar el resto.
+
+    python bench_columnar.py -n 1000000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from app.conversion import (
+    TablaColumnar, cargar_json, cargar_pickle, cargar_xml, escribir_columnar,
+    guardar_json, guardar_pickle, guardar_xml, leer_columnar, np,
+)
+
+CATEGORIAS = ("libros", "música", "hogar", "jardín")
+
+def generar(n: int) -> list[dict]:
+    return [{"id": i, "precio": round(i % 997 * 1.25, 2), "cantidad": i % 13,
+             "activo": i % 3 != 0, "categoria": CATEGORIAS[i % 4]} for i in range(n)]
+
+def cronometrar(fn):
+    t0 = time.perf_counter()
+    res = fn()
+    return time.perf_counter() - t0, res
+
+def suma_columnar(path: Path) -> float:
+    with TablaColumnar(path) as t:
+        return sum(t.columna("precio"))
+
+def suma_numpy(path: Path) -> float:
+    with TablaColumnar(path) as t:
+        return float(t.numpy("precio").sum())
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_columnar")
+    p.add_argument("-n", type=int, default=200_000)
+    args = p.parse_args()
+
+    datos = generar(args.n)
+    esperado = sum(r["precio"] for r in datos)
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        rutas = {"json": base / "d.json", "xml": base / "d.xml", "pickle": base / "d.pkl", "columnar": base / "d.col"}
+        guardar_json(datos, rutas["json"])
+        guardar_xml(datos, rutas["xml"])
+        guardar_pickle(datos, rutas["pickle"])
+        escribir_columnar(datos, rutas["columnar"])
+        del datos
+
+        cargas = {
+            "json": lambda: cargar_json(rutas["json"]),
+            "xml": lambda: cargar_xml(rutas["xml"]),
+            "pickle": lambda: cargar_pickle(rutas["pickle"]),
+            "columnar": lambda: leer_columnar(rutas["columnar"]),
+        }
+        una_columna = {
+            "json": lambda: sum(r["precio"] for r in cargar_json(rutas["json"])),
+            "xml": lambda: sum(float(r["precio"]) for r in cargar_xml(rutas["xml"])),
+            "pickle": lambda: sum(r["precio"] for r in cargar_pickle(rutas["pickle"])),
+            "columnar": lambda: suma_columnar(rutas["columnar"]),
+        }
+        if np is not None:
+            una_columna["columnar+numpy"] = lambda: suma_numpy(rutas["columnar"])
+
+        print(f"n={args.n:,}")
+        print(f"  {'formato':>14} {'tamaño':>10} {'carga completa':>15} {'suma(precio)':>13}")
+        for fmt, fn in una_columna.items():
+            ruta = rutas[fmt.split("+")[0]]
+            t_carga = f"{cronometrar(cargas[fmt])[0]:13.3f} s" if fmt in cargas else f"{'-':>15}"
+            t_col, total = cronometrar(fn)
+            assert abs(total - esperado) < 1e-6 * max(1.0, esperado)
+            print(f"  {fmt:>14} {ruta.stat().st_size / 1e6:8.1f} MB {t_carga} {t_col:11.3f} s")
+
+if __name__ == "__main__":
+    main()
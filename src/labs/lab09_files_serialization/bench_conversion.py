@@ -0,0 +1,55 @@
+# bench_conversion.py
+"""
+Convertir un dataset de N registros entre cada par de formatos en streaming
+(jsonl, xml, pickle por tramas) y medir el throughput en MB/s de entrada.
+
+    python bench_conversion.py -n 1000000
+"""
+import argparse
+import itertools
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from app.conversion import ESCRITORES, convertir
+
+EXT = {"jsonl": ".jsonl", "xml": ".xml", "pickle": ".pkl"}
+
+def generar(n: int):
+    for i in range(n):
+        yield {"id": str(i), "nombre": f"usuario{i}", "email": f"u{i}@test.com",
+               "ciudad": ("Madrid", "León", "Málaga")[i % 3], "saldo": f"{i * 1.5:.2f}"}
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_conversion")
+    p.add_argument("-n", type=int, default=200_000)
+    p.add_argument("--memoria", action="store_true", help="Mide también el pico con tracemalloc (más lento)")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        fuentes = {}
+        for fmt, escribir in ESCRITORES.items():
+            fuentes[fmt] = base / f"origen{EXT[fmt]}"
+            escribir(generar(args.n), fuentes[fmt])
+
+        print(f"n={args.n:,}")
+        for f_origen, f_destino in itertools.permutations(ESCRITORES, 2):
+            origen = fuentes[f_origen]
+            destino = base / f"destino_{f_origen}{EXT[f_destino]}"
+            mb = origen.stat().st_size / 1e6
+            if args.memoria:
+                tracemalloc.start()
+            t0 = time.perf_counter()
+            n = convertir(origen, destino)
+            t = time.perf_counter() - t0
+            pico = ""
+            if args.memoria:
+                pico = f"  pico {tracemalloc.get_traced_memory()[1] / 1e6:6.2f} MB"
+                tracemalloc.stop()
+            assert n == args.n
+            print(f"  {f_origen:>6} → {f_destino:<6}: {mb:8.1f} MB en {t:6.2f} s  {mb / t:7.1f} MB/s{pico}")
+            destino.unlink()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_organizador.py
+"""
+Organizar N ficheros pequeños por tipo y fecha: versión del lab (iterdir +
+stat + shutil.move en dos pasadas) frente a organizar() (scandir, una
+pasada, os.rename).
+
+    python bench_organizador.py -n 100000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from app.organizador import organizar
+
+EXTS = ["txt", "csv", "jpg", "py", "json", "log"]
+
+def generar(carpeta: Path, n: int) -> None:
+    carpeta.mkdir(parents=True)
+    base = datetime(2024, 1, 1).timestamp()
+    for i in range(n):
+        p = carpeta / f"f{i:07d}.{EXTS[i % len(EXTS)]}"
+        p.write_bytes(b"x")
+        ts = base + (i % 600) * 86400
+        os.utime(p, (ts, ts))
+
+def organizar_lab(src: Path, dst: Path) -> None:
+    """Fases 1 y 2 tal como las propone el enunciado (sin los print)."""
+    dst.mkdir(parents=True, exist_ok=True)
+    for archivo in src.iterdir():
+        if archivo.is_file():
+            ext = archivo.suffix.lstrip(".").lower() or "otros"
+            carpeta_destino = dst / ext
+            carpeta_destino.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(archivo), carpeta_destino / archivo.name)
+    for carpeta_tipo in dst.iterdir():
+        if not carpeta_tipo.is_dir():
+            continue
+        for archivo in list(carpeta_tipo.iterdir()):
+            if not archivo.is_file():
+                continue
+            yyyymm = datetime.fromtimestamp(archivo.stat().st_mtime).strftime("%Y-%m")
+            destino = carpeta_tipo / yyyymm
+            destino.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(archivo), destino / archivo.name)
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_organizador")
+    p.add_argument("-n", type=int, default=100_000)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        resultados = {}
+        for nombre, fn in (("lab (2 pasadas)", organizar_lab), ("organizar()", organizar)):
+            src, dst = base / nombre / "entrada", base / nombre / "organizado"
+            generar(src, args.n)
+            t0 = time.perf_counter()
+            fn(src, dst)
+            resultados[nombre] = time.perf_counter() - t0
+            arbol = sorted(str(q.relative_to(dst)) for q in dst.rglob("*") if q.is_file())
+            assert len(arbol) == args.n
+        generar(base / "plan", args.n)
+        t0 = time.perf_counter()
+        organizar(base / "plan", base / "plan_out", dry_run=True)
+        t_plan = time.perf_counter() - t0
+
+    print(f"n={args.n:,}")
+    for nombre, t in resultados.items():
+        print(f"  {nombre:>16}: {t:7.2f} s  {args.n / t:10,.0f} ficheros/s")
+    print(f"  {'solo plan':>16}: {t_plan:7.2f} s  (dry_run)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_tipos.py
+"""
+Coerción de tipos de N filas "como vienen de XML" (todo texto, ~0.1 % de
+valores inválidos): normalizar_tipos original del lab (isdigit fila a fila),
+conversión fila a fila con esquema, y las versiones por columnas de app.esquema.
+
+    python bench_tipos.py -n 1000000
+"""
+import argparse
+import gc
+import time
+from app.esquema import CONVERSORES, coaccionar, coaccionar_columnas, inferir_esquema
+
+def generar(n: int) -> list[dict]:
+    filas = [{"id": str(i), "precio": f"{i % 997 * 1.25:.2f}", "cantidad": str(i % 13),
+              "activo": "True" if i % 3 else "False", "alta": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+              "nombre": f"cliente{i}"} for i in range(n)]
+    for i in range(5_000, n, 1000):  # fuera de la muestra de inferencia
+        filas[i]["precio"] = "N/D"
+    return filas
+
+def normalizar_lab(dataset: list[dict]) -> list[dict]:
+    """Versión del enunciado (solo enteros, fila a fila)."""
+    norm = []
+    for row in dataset:
+        conv = {}
+        for k, v in row.items():
+            if isinstance(v, str) and v.isdigit():
+                conv[k] = int(v)
+            else:
+                conv[k] = v
+        norm.append(conv)
+    return norm
+
+def por_filas(dataset: list[dict], esquema: dict[str, str]) -> tuple[list[dict], int]:
+    """Misma semántica que coaccionar, pero valor a valor."""
+    errores = 0
+    out = []
+    for row in dataset:
+        conv = {}
+        for k, v in row.items():
+            try:
+                conv[k] = CONVERSORES[esquema[k]](v)
+            except ValueError:
+                conv[k] = None
+                errores += 1
+        out.append(conv)
+    return out, errores
+
+def medir(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    res = fn()
+    return time.perf_counter() - t0, res
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_tipos")
+    p.add_argument("-n", type=int, default=1_000_000)
+    args = p.parse_args()
+
+    filas = generar(args.n)
+    esquema = inferir_esquema(filas)
+    columnas = {c: [f[c] for f in filas] for c in esquema}
+    print(f"n={args.n:,}  esquema={esquema}")
+
+    casos = {
+        "lab (isdigit)": lambda: normalizar_lab(filas),
+        "por filas": lambda: por_filas(filas, esquema)[1],
+        "coaccionar": lambda: coaccionar(filas, esquema)[1].total,
+        "coaccionar_columnas": lambda: coaccionar_columnas(columnas, esquema)[1].total,
+    }
+    for nombre, fn in casos.items():
+        t, res = medir(fn)
+        errores = f"  errores={res}" if isinstance(res, int) else ""
+        print(f"  {nombre:>20}: {t:6.2f} s  {args.n / t:12,.0f} filas/s{errores}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# main.py
+import argparse
+from pathlib import Path
+from app.organizador import organizar_por_tipo, organizar_por_fecha, organizar
+from app.conversion import convertir
+
+ENTRADA = Path("data/entrada")
+SALIDA = Path("data/organizado")
+
+def fase1(dry_run: bool = False):
+    print("== Fase 1: organizar por tipo ==")
+    plan = organizar_por_tipo(ENTRADA, SALIDA, dry_run=dry_run)
+    for m in plan:
+        print(f"{'Plan' if dry_run else 'Movido'}: {m.origen} → {m.destino}")
+    print(f"✔ {len(plan)} archivos organizados por extensión")
+
+def fase2(dry_run: bool = False):
+    print("== Fase 2: organizar por fecha (YYYY-MM) ==")
+    plan = organizar_por_fecha(SALIDA, dry_run=dry_run)
+    print(f"✔ {len(plan)} archivos organizados por fecha dentro de cada tipo")
+
+def fases_1_y_2(dry_run: bool = False):
+    print("== Fases 1+2 en una pasada ==")
+    plan = organizar(ENTRADA, SALIDA, dry_run=dry_run)
+    print(f"✔ {len(plan)} archivos {'planificados' if dry_run else 'movidos'} a tipo/YYYY-MM")
+
+def fase3(origen: Path, destino: Path):
+    print("== Fase 3: conversión en streaming ==")
+    n = convertir(origen, destino)
+    print(f"✔ {n} registros convertidos: {origen} → {destino}")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(prog="lab9")
+    p.add_argument("fase", choices=["1", "2", "12", "3"], nargs="?", default="12")
+    p.add_argument("--dry-run", action="store_true", help="Solo muestra el plan")
+    p.add_argument("--origen", type=Path, help="Fase 3: fichero .jsonl/.xml/.pkl de entrada")
+    p.add_argument("--destino", type=Path, help="Fase 3: fichero de salida (formato por extensión)")
+    args = p.parse_args()
+    if args.fase == "3":
+        if not (args.origen and args.destino):
+            p.error("la fase 3 requiere --origen y --destino")
+        fase3(args.origen, args.destino)
+    else:
+        {"1": fase1, "2": fase2, "12": fases_1_y_2}[args.fase](args.dry_run)
@@ -0,0 +1,154 @@
+import itertools
+import mmap
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from app.conversion import (
+    ESCRITORES, LECTORES, cargar_xml, convertir, escribir_jsonl, escribir_xml_stream,
+    guardar_xml, leer_pickle_stream, leer_xml_stream, escribir_pickle_stream,
+    TablaColumnar, escribir_columnar, leer_columnar, np,
+)
+
+USUARIOS = [
+    {"nombre": "Ana", "edad": "30", "ciudad": "Málaga <sur> & co"},
+    {"nombre": "Luis", "edad": "25", "ciudad": None},
+    {"nombre": "Marta", "edad": "28", "ciudad": "León"},
+]
+EXT = {"jsonl": ".jsonl", "xml": ".xml", "pickle": ".pkl", "columnar": ".col"}
+EXT_A_FORMATO = {v: k for k, v in EXT.items()}
+
+def generar(n):
+    for i in range(n):
+        yield {"id": str(i), "nombre": f"usuario{i}", "email": f"u{i}@test.com", "saldo": f"{i * 1.5:.2f}"}
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.dir.name)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_ida_y_vuelta_por_formato(self):
+        for fmt in LECTORES:
+            p = self.base / f"u{EXT[fmt]}"
+            self.assertEqual(ESCRITORES[fmt](iter(USUARIOS), p), 3)
+            self.assertEqual(list(LECTORES[fmt](p)), USUARIOS, fmt)
+
+    def test_xml_compatible_con_el_lab(self):
+        p1, p2 = self.base / "stream.xml", self.base / "lab.xml"
+        escribir_xml_stream(USUARIOS, p1, root_name="usuarios", item_name="usuario")
+        guardar_xml(USUARIOS, p2, root_name="usuarios", item_name="usuario")
+        self.assertEqual(cargar_xml(p1, item_name="usuario"), cargar_xml(p2, item_name="usuario"))
+        self.assertEqual(list(leer_xml_stream(p2, item_name="usuario")), cargar_xml(p2, item_name="usuario"))
+
+    def test_todas_las_parejas(self):
+        origen = self.base / "origen.jsonl"
+        escribir_jsonl(generar(2500), origen)
+        esperado = list(generar(2500))
+        for a, b in itertools.permutations(LECTORES, 2):
+            pa, pb = self.base / f"{a}_{b}_a{EXT[a]}", self.base / f"{a}_{b}_b{EXT[b]}"
+            convertir(origen, pa)
+            self.assertEqual(convertir(pa, pb), 2500)
+            self.assertEqual(list(LECTORES[b](pb)), esperado, f"{a}->{b}")
+
+    def test_pickle_por_tramas(self):
+        p = self.base / "t.pkl"
+        escribir_pickle_stream(generar(25), p, tam_trama=10)
+        self.assertEqual(len(list(leer_pickle_stream(p))), 25)
+
+    def pico_conversion(self, n: int, destino: str, origen: str = ".jsonl") -> int:
+        origen = self.base / f"{n}{origen}"
+        if not origen.exists():
+            ESCRITORES[EXT_A_FORMATO[origen.suffix]](generar(n), origen)
+        tracemalloc.start()
+        convertir(origen, self.base / f"{n}{destino}")
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return pico
+
+    def test_memoria_constante(self):
+        # cuadruplicar el dataset no debe cuadruplicar el pico de memoria
+        for destino in (".xml", ".pkl"):
+            pequeno, grande = self.pico_conversion(4_000, destino), self.pico_conversion(16_000, destino)
+            self.assertLess(grande, pequeno * 1.5 + (64 << 10), destino)
+        pequeno = self.pico_conversion(4_000, ".pkl", ".jsonl")
+        grande = self.pico_conversion(16_000, ".pkl", ".jsonl")
+        self.assertLess(grande, pequeno * 1.5 + (64 << 10), "pickle → jsonl")
+        tracemalloc.start()
+        n = sum(1 for _ in leer_xml_stream(self.base / "16000.xml"))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(n, 16_000)
+        self.assertLess(pico, 512 << 10)
+
+    def test_extension_desconocida(self):
+        with self.assertRaises(ValueError):
+            convertir(self.base / "a.csv", self.base / "b.jsonl")
+
+
+VENTAS = [
+    {"id": 1, "precio": 9.5, "activo": True, "categoria": "libros"},
+    {"id": 2, "precio": None, "activo": False, "categoria": "café ☕"},
+    {"id": 3, "precio": 12.25, "activo": True, "categoria": None},
+]
+
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / "ventas.col"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_ida_y_vuelta_con_tipos_y_nulos(self):
+        self.assertEqual(escribir_columnar(VENTAS, self.path), 3)
+        with TablaColumnar(self.path) as t:
+            self.assertEqual(t.tipos, {"id": "int64", "precio": "float64", "activo": "bool", "categoria": "str"})
+            self.assertEqual(list(t.registros()), VENTAS)
+            self.assertEqual(list(t.nulos("precio")), [0, 1, 0])
+            self.assertIsNone(t.nulos("id"))
+
+    def test_columna_sin_copia_sobre_mmap(self):
+        escribir_columnar(VENTAS, self.path)
+        with TablaColumnar(self.path) as t:
+            ids = t.columna("id")
+            self.assertIsInstance(ids, memoryview)
+            self.assertIsInstance(ids.obj, mmap.mmap)
+            self.assertEqual((ids.format, sum(ids)), ("q", 6))
+        with self.assertRaises(ValueError):
+            ids[0]  # liberado al cerrar
+
+    def test_seleccion_de_columnas(self):
+        escribir_columnar(VENTAS, self.path)
+        self.assertEqual(leer_columnar(self.path, ["categoria", "id"]),
+                         {"categoria": ["libros", "café ☕", None], "id": [1, 2, 3]})
+        with TablaColumnar(self.path) as t:
+            self.assertEqual(next(t.registros(["precio"])), {"precio": 9.5})
+            with self.assertRaises(KeyError):
+                t.columna("nope")
+
+    def test_promocion_tipos_forzados_y_claves_ausentes(self):
+        filas = [{"a": 1, "b": "7"}, {"a": 2.5}, {"c": "x", "b": "8"}]
+        escribir_columnar(filas, self.path, tipos={"b": "int64"})
+        self.assertEqual(leer_columnar(self.path), {"a": [1.0, 2.5, None], "b": [7, None, 8], "c": [None, None, "x"]})
+        with self.assertRaises(TypeError):
+            escribir_columnar([{"a": 1}, {"a": "uno"}], self.path)
+
+    def test_fichero_no_columnar(self):
+        self.path.write_bytes(b"no soy columnar")
+        with self.assertRaises(ValueError):
+            TablaColumnar(self.path)
+
+    @unittest.skipIf(np is None, "NumPy no instalado")
+    def test_numpy_frombuffer(self):
+        escribir_columnar(({"x": i * 0.5} for i in range(1000)), self.path)
+        with TablaColumnar(self.path) as t:
+            x = t.numpy("x")
+            self.assertFalse(x.flags.writeable)
+            self.assertEqual(float(x.sum()), sum(i * 0.5 for i in range(1000)))
+            del x
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app import esquema
+from app.conversion import cargar_xml, guardar_xml, normalizar_tipos
+from app.esquema import ErrorTipo, coaccionar, coaccionar_columnas, inferir_esquema
+
+USUARIOS = [
+    {"nombre": "Ana", "edad": 30, "activo": True, "saldo": 10.5, "alta": "2025-09-05"},
+    {"nombre": "Luis", "edad": 25, "activo": False, "saldo": 0.0, "alta": "2024-01-31"},
+    {"nombre": "Marta", "edad": 28, "activo": True, "saldo": 3.25, "alta": "2023-12-01"},
+]
+
+class TestEsquema(unittest.TestCase):
+    def test_inferencia(self):
+        filas = [{"a": "1", "b": "1.5", "c": "true", "d": "2025-01-02", "e": "x", "f": ""},
+                 {"a": "", "b": "2", "c": "False", "d": None, "e": "3", "f": None}]
+        self.assertEqual(inferir_esquema(filas),
+                         {"a": "int", "b": "float", "c": "bool", "d": "date", "e": "str", "f": "str"})
+
+    def test_tipos_nativos_no_se_confunden(self):
+        self.assertEqual(inferir_esquema([{"a": 1, "b": 1.0, "c": True}]), {"a": "int", "b": "float", "c": "bool"})
+
+    def test_normalizar_xml_equivale_a_json(self):
+        with tempfile.TemporaryDirectory() as d:
+            p = Path(d) / "u.xml"
+            guardar_xml(USUARIOS, p, root_name="usuarios", item_name="usuario")
+            normalizados = normalizar_tipos(cargar_xml(p, item_name="usuario"))
+        self.assertEqual(normalizados, USUARIOS)  # las fechas siguen como texto, igual que en JSON
+
+    def test_errores_al_informe_sin_lanzar(self):
+        filas = [{"id": str(i), "precio": f"{i}.5"} for i in range(10)]
+        filas[7]["precio"] = "N/D"
+        filas[9]["id"] = "diez"
+        nuevas, informe = coaccionar(filas, tam_muestra=5)
+        self.assertEqual(informe.esquema, {"id": "int", "precio": "float"})
+        self.assertEqual(informe.errores, [ErrorTipo(9, "id", "diez", "int"), ErrorTipo(7, "precio", "N/D", "float")])
+        self.assertEqual((informe.total, informe.por_columna), (2, {"id": 1, "precio": 1}))
+        self.assertIsNone(nuevas[7]["precio"])
+        self.assertEqual(nuevas[8], {"id": 8, "precio": 8.5})
+
+    def test_lotes_y_claves_ausentes(self):
+        n = esquema.TAM_LOTE * 2 + 10
+        columnas = {"x": [str(i) for i in range(n)]}
+        columnas["x"][esquema.TAM_LOTE + 3] = ""
+        conv, informe = coaccionar_columnas(columnas, {"x": "int"})
+        self.assertEqual(informe.total, 0)
+        self.assertIsNone(conv["x"][esquema.TAM_LOTE + 3])
+        self.assertEqual(sum(v for v in conv["x"] if v is not None), sum(range(n)) - (esquema.TAM_LOTE + 3))
+
+        nuevas, _ = coaccionar([{"a": "1"}, {"b": "x"}])
+        self.assertEqual(nuevas, [{"a": 1}, {"b": "x"}])
+
+    def test_esquema_explicito(self):
+        nuevas, _ = coaccionar([{"cp": "08001", "n": "3"}], esquema={"cp": "str"})
+        self.assertEqual(nuevas, [{"cp": "08001", "n": "3"}])
+        with self.assertRaises(ValueError):
+            coaccionar([{"a": "1"}], esquema={"a": "entero"})
+
+if __name__ == "__main__":
+    unittest.main()
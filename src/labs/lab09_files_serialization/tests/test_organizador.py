@@ -0,0 +1,101 @@
+import calendar
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+from app import organizador
+from app.organizador import (
+    ejecutar, organizar, organizar_por_fecha, organizar_por_tipo, planificar,
+)
+
+FICHEROS = {
+    "informe.txt": datetime(2025, 9, 15, 12, 0),
+    "ventas.csv": datetime(2024, 12, 1, 8, 30),
+    "foto.JPG": datetime(2023, 7, 4, 20, 0),
+    "LEEME": datetime(2025, 9, 1, 0, 5),
+}
+
+class TestOrganizador(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        base = Path(self.dir.name)
+        self.entrada, self.salida = base / "entrada", base / "organizado"
+        self.entrada.mkdir()
+        (self.entrada / "subcarpeta").mkdir()
+        for nombre, fecha in FICHEROS.items():
+            p = self.entrada / nombre
+            p.write_text(nombre, encoding="utf-8")
+            ts = fecha.timestamp()
+            os.utime(p, (ts, ts))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def arbol(self) -> set[str]:
+        return {str(p.relative_to(self.salida)) for p in self.salida.rglob("*") if p.is_file()}
+
+    def test_dry_run_no_toca_nada(self):
+        plan = organizar(self.entrada, self.salida, dry_run=True)
+        self.assertEqual(len(plan), 4)
+        self.assertFalse(self.salida.exists())
+        self.assertTrue(all(m.mismo_fs for m in plan))
+
+    def test_una_pasada_tipo_y_fecha(self):
+        organizar(self.entrada, self.salida)
+        self.assertEqual(self.arbol(), {"txt/2025-09/informe.txt", "csv/2024-12/ventas.csv",
+                                        "jpg/2023-07/foto.JPG", "otros/2025-09/LEEME"})
+        self.assertEqual(sorted(os.listdir(self.entrada)), ["subcarpeta"])
+
+    def test_fases_del_lab(self):
+        organizar_por_tipo(self.entrada, self.salida)
+        self.assertEqual(self.arbol(), {"txt/informe.txt", "csv/ventas.csv", "jpg/foto.JPG", "otros/LEEME"})
+        organizar_por_fecha(self.salida)
+        self.assertEqual(self.arbol(), {"txt/2025-09/informe.txt", "csv/2024-12/ventas.csv",
+                                        "jpg/2023-07/foto.JPG", "otros/2025-09/LEEME"})
+
+    def test_rutas_relativas(self):
+        cwd = os.getcwd()
+        os.chdir(self.dir.name)
+        try:
+            plan = organizar(Path("entrada"), Path("organizado"), dry_run=True)
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(len(plan), 4)
+
+    def test_entre_dispositivos_usa_copia(self):
+        plan = [m._replace(mismo_fs=False) for m in planificar(self.entrada, self.salida)]
+        resumen = ejecutar(plan, max_workers=2)
+        self.assertEqual((resumen.renombrados, resumen.copiados), (0, 4))
+        self.assertEqual(len(self.arbol()), 4)
+
+    def test_rename_exdev_cae_a_copia(self):
+        plan = planificar(self.entrada, self.salida, por_fecha=False)
+        exdev = OSError(18, "Invalid cross-device link")
+        exdev.errno = organizador.errno.EXDEV
+        with mock.patch.object(organizador.os, "rename", side_effect=exdev):
+            resumen = ejecutar(plan)
+        self.assertEqual(resumen.copiados, 4)
+        self.assertEqual(len(self.arbol()), 4)
+
+    @unittest.skipUnless(hasattr(time, "tzset") and os.path.exists("/usr/share/zoneinfo/Europe/Madrid"), "sin tzdata")
+    def test_mes_con_desfase_historico(self):
+        # hora media local de Madrid (-0:14:44): no es múltiplo de 15 min
+        previa = os.environ.get("TZ")
+        os.environ["TZ"] = "Europe/Madrid"
+        time.tzset()
+        try:
+            ts = calendar.timegm((1890, 1, 1, 0, 0, 0))  # 1889-12-31 23:45:16 local
+            cache = {}
+            self.assertEqual((organizador._mes(ts, cache), organizador._mes(ts + 890, cache)), ("1889-12", "1890-01"))
+        finally:
+            if previa is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = previa
+            time.tzset()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+# app/agregados.py
+"""
+Agregados materializados para los informes de la Fase 3.
+
+etl_pandas.informes() vuelve a agrupar todas las ventas en cada ejecución;
+aquí los totales viven en dos tablas de resumen y los informes solo las leen:
+
+- resumen_cliente(id_cliente, importe, uds, n)
+- resumen_producto(id_producto, importe, uds, n)
+
+Dos modos de mantenimiento (instalar_resumenes(pool, modo=...)):
+
+- "triggers": cada INSERT/UPDATE/DELETE en ventas y cada cambio de precio
+  en productos actualiza los resúmenes en la misma transacción. Siempre al
+  día, a cambio de unas escrituras algo más caras.
+- "incremental": sin triggers; refrescar() suma las ventas con id mayor que
+  la marca guardada en resumen_estado. Pensado para cargas masivas que solo
+  añaden filas: no ve borrados, cambios de ventas ni de precios (para eso,
+  reconstruir()).
+
+reconstruir() recalcula todo desde ventas en una transacción y verificar()
+compara los resúmenes con un GROUP BY completo. El importe usa el precio
+actual del producto, como etl_pandas.
+"""
+from __future__ import annotations
+import sqlite3
+from typing import NamedTuple
+from .datos import PoolConexiones
+from .sql_demo import sentencias
+
+MODOS = ("triggers", "incremental")
+
+ESQUEMA_RESUMEN = """
+CREATE TABLE IF NOT EXISTS resumen_cliente (
+  id_cliente INTEGER PRIMARY KEY,
+  importe REAL NOT NULL,
+  uds INTEGER NOT NULL,
+  n INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resumen_producto (
+  id_producto INTEGER PRIMARY KEY,
+  importe REAL NOT NULL,
+  uds INTEGER NOT NULL,
+  n INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resumen_estado (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  modo TEXT NOT NULL,
+  ultimo_id INTEGER NOT NULL
+)
+"""
+
+# --- triggers ---
+def _sumar(fila: str, signo: str) -> str:
+    """Sentencias que suman (signo '+') o restan ('-') la venta NEW/OLD a ambos resúmenes."""
+    importe = f"{fila}.cantidad * (SELECT precio FROM productos WHERE id = {fila}.id_producto)"
+    sql = []
+    for tabla, clave in (("resumen_cliente", "id_cliente"), ("resumen_producto", "id_producto")):
+        sql.append(f"""
+  INSERT INTO {tabla}({clave}, importe, uds, n)
+    VALUES ({fila}.{clave}, {signo}{importe}, {signo}{fila}.cantidad, {signo}1)
+  ON CONFLICT({clave}) DO UPDATE SET importe = importe + excluded.importe,
+                                     uds = uds + excluded.uds, n = n + excluded.n;""")
+        if signo == "-":
+            sql.append(f"\n  DELETE FROM {tabla} WHERE {clave} = {fila}.{clave} AND n = 0;")
+    return "".join(sql)
+
+TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS tr_resumen_ventas_ins AFTER INSERT ON ventas BEGIN{_sumar("NEW", "+")}
+  UPDATE resumen_estado SET ultimo_id = NEW.id WHERE NEW.id > ultimo_id;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_resumen_ventas_del AFTER DELETE ON ventas BEGIN{_sumar("OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS tr_resumen_ventas_upd AFTER UPDATE OF id_cliente, id_producto, cantidad ON ventas
+BEGIN{_sumar("OLD", "-")}{_sumar("NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS tr_resumen_precio AFTER UPDATE OF precio ON productos
+WHEN NEW.precio IS NOT OLD.precio BEGIN
+  UPDATE resumen_cliente
+     SET importe = importe + (NEW.precio - OLD.precio) *
+         (SELECT SUM(v.cantidad) FROM ventas v
+           WHERE v.id_producto = NEW.id AND v.id_cliente = resumen_cliente.id_cliente)
+   WHERE id_cliente IN (SELECT id_cliente FROM ventas WHERE id_producto = NEW.id);
+  UPDATE resumen_producto SET importe = uds * NEW.precio WHERE id_producto = NEW.id;
+END
+"""
+
+NOMBRES_TRIGGERS = ("tr_resumen_ventas_ins", "tr_resumen_ventas_del", "tr_resumen_ventas_upd", "tr_resumen_precio")
+
+def _triggers(script: str) -> list[str]:
+    # sentencias() parte por ';' y los cuerpos de los triggers también los llevan
+    return ["CREATE TRIGGER" + s for s in script.split("CREATE TRIGGER")[1:]]
+
+# --- mantenimiento ---
+_SQL_RECONSTRUIR = """
+DELETE FROM resumen_cliente;
+DELETE FROM resumen_producto;
+INSERT INTO resumen_cliente(id_cliente, importe, uds, n)
+  SELECT v.id_cliente, SUM(v.cantidad * p.precio), SUM(v.cantidad), COUNT(*)
+  FROM ventas v JOIN productos p ON p.id = v.id_producto
+  GROUP BY v.id_cliente;
+INSERT INTO resumen_producto(id_producto, importe, uds, n)
+  SELECT v.id_producto, SUM(v.cantidad) * p.precio, SUM(v.cantidad), COUNT(*)
+  FROM ventas v JOIN productos p ON p.id = v.id_producto
+  GROUP BY v.id_producto;
+UPDATE resumen_estado SET ultimo_id = (SELECT IFNULL(MAX(id), 0) FROM ventas)
+"""
+
+# Las ventas nuevas se agregan antes de fusionarlas: una fila de upsert por
+# cliente/producto afectado, no por venta.
+_SQL_REFRESCAR = """
+INSERT INTO resumen_cliente(id_cliente, importe, uds, n)
+  SELECT v.id_cliente, SUM(v.cantidad * p.precio), SUM(v.cantidad), COUNT(*)
+  FROM ventas v JOIN productos p ON p.id = v.id_producto
+  WHERE v.id > :desde AND v.id <= :hasta
+  GROUP BY v.id_cliente
+ON CONFLICT(id_cliente) DO UPDATE SET importe = importe + excluded.importe,
+                                      uds = uds + excluded.uds, n = n + excluded.n;
+INSERT INTO resumen_producto(id_producto, importe, uds, n)
+  SELECT v.id_producto, SUM(v.cantidad) * p.precio, SUM(v.cantidad), COUNT(*)
+  FROM ventas v JOIN productos p ON p.id = v.id_producto
+  WHERE v.id > :desde AND v.id <= :hasta
+  GROUP BY v.id_producto
+ON CONFLICT(id_producto) DO UPDATE SET importe = importe + excluded.importe,
+                                       uds = uds + excluded.uds, n = n + excluded.n
+"""
+
+def instalar_resumenes(pool: PoolConexiones, modo: str = "triggers") -> None:
+    """Crea (o cambia de modo) los resúmenes y los reconstruye desde ventas."""
+    if modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {modo!r}. Válidos: {MODOS}")
+    with pool.transaccion() as conn:
+        for stmt in sentencias(ESQUEMA_RESUMEN):
+            conn.execute(stmt)
+        for nombre in NOMBRES_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+        conn.execute("INSERT INTO resumen_estado(id, modo, ultimo_id) VALUES (1, ?, 0) "
+                     "ON CONFLICT(id) DO UPDATE SET modo = excluded.modo", (modo,))
+        if modo == "triggers":
+            for stmt in _triggers(TRIGGERS):
+                conn.execute(stmt)
+        _reconstruir(conn)
+
+def _reconstruir(conn: sqlite3.Connection) -> None:
+    for stmt in sentencias(_SQL_RECONSTRUIR):
+        conn.execute(stmt)
+
+def reconstruir(pool: PoolConexiones) -> None:
+    """Recalcula los resúmenes desde cero. BEGIN IMMEDIATE: nadie escribe ventas mientras tanto."""
+    with pool.transaccion() as conn:
+        _reconstruir(conn)
+
+def instalados(pool: PoolConexiones) -> bool:
+    with pool.conexion() as conn:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resumen_estado'").fetchone() is not None
+
+def estado(pool: PoolConexiones) -> tuple[str, int]:
+    """(modo, último id de ventas incluido en los resúmenes)."""
+    with pool.conexion() as conn:
+        fila = conn.execute("SELECT modo, ultimo_id FROM resumen_estado WHERE id = 1").fetchone()
+    if fila is None:
+        raise RuntimeError("Resúmenes no instalados: llama antes a instalar_resumenes()")
+    return fila["modo"], fila["ultimo_id"]
+
+def refrescar(pool: PoolConexiones) -> int:
+    """Incorpora las ventas nuevas desde la marca. Devuelve cuántas. En modo triggers no hay nada que hacer."""
+    if estado(pool)[0] == "triggers":
+        return 0  # sin tomar el bloqueo de escritura: los informes solo leen
+    with pool.transaccion() as conn:
+        # se relee dentro de la transacción por si otro proceso refrescó entretanto
+        desde = conn.execute("SELECT ultimo_id FROM resumen_estado WHERE id = 1").fetchone()[0]
+        hasta, nuevas = conn.execute("SELECT IFNULL(MAX(id), 0), COUNT(*) FROM ventas WHERE id > ?",
+                                     (desde,)).fetchone()
+        if not nuevas:
+            return 0
+        for stmt in sentencias(_SQL_REFRESCAR):
+            conn.execute(stmt, {"desde": desde, "hasta": hasta})
+        conn.execute("UPDATE resumen_estado SET ultimo_id = ? WHERE id = 1", (hasta,))
+        return nuevas
+
+# --- informes ---
+def informe_por_cliente(pool: PoolConexiones, refrescar_antes: bool = True) -> list[sqlite3.Row]:
+    """(id_cliente, nombre, importe) de mayor a menor importe, como etl_pandas.informes."""
+    if refrescar_antes:
+        refrescar(pool)
+    with pool.conexion() as conn:
+        return conn.execute("""
+            SELECT r.id_cliente, c.nombre, r.importe
+            FROM resumen_cliente r JOIN clientes c ON c.id = r.id_cliente
+            ORDER BY r.importe DESC, r.id_cliente""").fetchall()
+
+def informe_por_producto(pool: PoolConexiones, refrescar_antes: bool = True) -> list[sqlite3.Row]:
+    """(producto, uds) de más a menos unidades."""
+    if refrescar_antes:
+        refrescar(pool)
+    with pool.conexion() as conn:
+        return conn.execute("""
+            SELECT p.nombre AS producto, r.uds
+            FROM resumen_producto r JOIN productos p ON p.id = r.id_producto
+            ORDER BY r.uds DESC, r.id_producto""").fetchall()
+
+def informes(pool: PoolConexiones) -> tuple[list[sqlite3.Row], list[sqlite3.Row]]:
+    refrescar(pool)
+    return informe_por_cliente(pool, False), informe_por_producto(pool, False)
+
+# --- verificación ---
+class Discrepancia(NamedTuple):
+    tabla: str
+    clave: int
+    esperado: tuple | None      # (importe, uds, n) según ventas; None si no debería existir
+    materializado: tuple | None  # (importe, uds, n) en el resumen; None si falta
+
+_SQL_VERIFICAR = """
+WITH real AS (
+  SELECT v.{clave} AS clave, SUM(v.cantidad * p.precio) AS importe, SUM(v.cantidad) AS uds, COUNT(*) AS n
+  FROM ventas v JOIN productos p ON p.id = v.id_producto
+  GROUP BY v.{clave}
+)
+SELECT r.clave, r.importe, r.uds, r.n, m.importe AS m_importe, m.uds AS m_uds, m.n AS m_n
+FROM real r LEFT JOIN {tabla} m ON m.{clave} = r.clave
+WHERE m.{clave} IS NULL OR m.uds <> r.uds OR m.n <> r.n
+   OR ABS(m.importe - r.importe) > :tol * MAX(1.0, ABS(r.importe))
+UNION ALL
+SELECT m.{clave}, NULL, NULL, NULL, m.importe, m.uds, m.n
+FROM {tabla} m
+WHERE NOT EXISTS (SELECT 1 FROM ventas v WHERE v.{clave} = m.{clave})
+"""
+
+def verificar(pool: PoolConexiones, tolerancia: float = 1e-9, reparar: bool = False) -> list[Discrepancia]:
+    """
+    Compara los resúmenes con un GROUP BY sobre ventas. El importe se compara
+    con tolerancia relativa (las sumas incrementales acumulan redondeo). Con
+    reparar=True, si hay discrepancias se reconstruye todo.
+    """
+    errores = []
+    with pool.conexion() as conn:
+        conn.execute("BEGIN")  # una sola instantánea para las dos tablas
+        try:
+            for tabla, clave in (("resumen_cliente", "id_cliente"), ("resumen_producto", "id_producto")):
+                for f in conn.execute(_SQL_VERIFICAR.format(tabla=tabla, clave=clave), {"tol": tolerancia}):
+                    esperado = None if f["n"] is None else (f["importe"], f["uds"], f["n"])
+                    materializado = None if f["m_n"] is None else (f["m_importe"], f["m_uds"], f["m_n"])
+                    errores.append(Discrepancia(tabla, f["clave"], esperado, materializado))
+        finally:
+            conn.rollback()
+    if errores and reparar:
+        reconstruir(pool)
+    return errores
@@ -0,0 +1,271 @@
+# app/datos.py
+"""
+Capa de acceso a datos sobre SQLite para el CRUD de la Fase 1.
+
+sql_demo abre una conexión por operación y hace commit por sentencia; aquí:
+
+- PoolConexiones: conexiones reutilizables y seguras entre hilos (cada una
+  la usa un solo hilo a la vez), configuradas una vez con PRAGMAS.
+- transaccion(): BEGIN IMMEDIATE explícito; commit al salir, rollback si hay
+  excepción. Un lote entero es atómico y paga un único fsync.
+- Operaciones masivas con executemany, que consume iterables sin
+  materializarlos: crear_clientes, crear_productos, crear_ventas,
+  actualizar_emails, borrar_clientes.
+- ventas_detalle(): el JOIN de la Fase 1 servido por lotes con fetchmany y
+  resuelto con índices cubrientes (ver INDICES).
+
+    with PoolConexiones(DB_PATH) as pool:
+        init_db(pool)
+        crear_clientes(pool, [("Ana", "ana@test.com"), ...])
+"""
+from __future__ import annotations
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+from .sql_demo import DDL, sentencias
+
+# WAL: los lectores no bloquean al escritor. synchronous=NORMAL: con WAL solo
+# se sincroniza en los checkpoints (no se pierde integridad, como mucho las
+# últimas transacciones si cae el sistema). cache_size negativo = KiB.
+PRAGMAS: dict[str, object] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64_000,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+    "busy_timeout": 5_000,
+}
+
+def configurar(conn: sqlite3.Connection, pragmas: dict[str, object] = PRAGMAS) -> None:
+    for nombre, valor in pragmas.items():
+        conn.execute(f"PRAGMA {nombre} = {valor}")
+
+class PoolConexiones:
+    """
+    Pool de tamaño fijo. Las conexiones se crean bajo demanda y vuelven al pool
+    al salir de conexion(); si se devuelven con una transacción abierta se
+    deshace. check_same_thread=False porque pasan de un hilo a otro, pero el
+    pool garantiza que nunca las usan dos hilos a la vez.
+    """
+
+    def __init__(self, path: Path | str, tam: int = 4, pragmas: dict[str, object] = PRAGMAS,
+                 timeout: float | None = 30.0):
+        if tam < 1:
+            raise ValueError("tam debe ser >= 1")
+        self.path = Path(path)
+        self.tam = tam
+        self.pragmas = dict(pragmas)
+        self.timeout = timeout
+        self._libres: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._todas: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+    def _nueva(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: sin transacciones implícitas, las abrimos nosotros
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        configurar(conn, self.pragmas)
+        return conn
+
+    def _obtener(self, timeout: float | None) -> sqlite3.Connection:
+        if self._cerrado:
+            raise RuntimeError("Pool cerrado")
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._todas) < self.tam:
+                conn = self._nueva()
+                self._todas.append(conn)
+                return conn
+        try:
+            return self._libres.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Sin conexiones libres tras {timeout} s (tam={self.tam})") from None
+
+    @contextmanager
+    def conexion(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        """Presta una conexión; timeout=None usa el del pool."""
+        conn = self._obtener(self.timeout if timeout is None else timeout)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._cerrado:
+                conn.close()
+            else:
+                self._libres.put(conn)
+
+    @contextmanager
+    def transaccion(self, timeout: float | None = None) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE: toma el lock de escritura al empezar, no a mitad del lote."""
+        with self.conexion(timeout) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @property
+    def abiertas(self) -> int:
+        return len(self._todas)
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones libres; las que estén en uso se cierran al devolverse."""
+        self._cerrado = True
+        while True:
+            try:
+                self._libres.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "PoolConexiones":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+# --- esquema ---
+# Índices cubrientes: cada uno contiene todas las columnas de ventas que usa el
+# JOIN, así que SQLite no vuelve a la tabla. Los de sql_demo (una columna) son
+# prefijo de estos y solo encarecen las escrituras: init_db no los crea y aquí
+# se borran de las bases que vengan de sql_demo.
+INDICES = """
+CREATE INDEX IF NOT EXISTS ix_ventas_cliente_cubre  ON ventas(id_cliente, id_producto, cantidad);
+CREATE INDEX IF NOT EXISTS ix_ventas_producto_cubre ON ventas(id_producto, id_cliente, cantidad);
+CREATE INDEX IF NOT EXISTS ix_clientes_nombre ON clientes(nombre);
+DROP INDEX IF EXISTS ix_ventas_cliente;
+DROP INDEX IF EXISTS ix_ventas_producto;
+"""
+
+_SUSTITUIDOS = {"ix_ventas_cliente", "ix_ventas_producto"}
+_NOMBRE_INDICE = re.compile(r"CREATE\s+INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+def _es_sustituido(stmt: str) -> bool:
+    m = _NOMBRE_INDICE.match(stmt)
+    return m is not None and m.group(1) in _SUSTITUIDOS
+
+# DDL de sql_demo sin PRAGMAs (los aplica el pool) ni los índices de una columna:
+# crearlos para borrarlos después era construir un índice entero en cada arranque.
+ESQUEMA = [s for s in sentencias(DDL) if not s.upper().startswith("PRAGMA") and not _es_sustituido(s)]
+
+def init_db(pool: PoolConexiones, indices: bool = True) -> None:
+    """Crea el esquema. Para cargas masivas: indices=False y crear_indices() al final."""
+    with pool.transaccion() as conn:
+        for stmt in ESQUEMA:
+            conn.execute(stmt)
+    if indices:
+        crear_indices(pool)
+
+def crear_indices(pool: PoolConexiones) -> None:
+    with pool.transaccion() as conn:
+        for stmt in sentencias(INDICES):
+            conn.execute(stmt)
+    with pool.conexion() as conn:
+        conn.execute("PRAGMA optimize")
+
+# --- operaciones masivas (una transacción por llamada) ---
+def _ejecutar_lote(pool: PoolConexiones, sql: str, filas: Iterable[tuple]) -> int:
+    with pool.transaccion() as conn:
+        return conn.executemany(sql, filas).rowcount
+
+def crear_clientes(pool: PoolConexiones, filas: Iterable[tuple[str, str]]) -> int:
+    """filas: (nombre, email). Si un email está repetido no se inserta ninguno."""
+    return _ejecutar_lote(pool, "INSERT INTO clientes(nombre, email) VALUES (?, ?)", filas)
+
+def crear_productos(pool: PoolConexiones, filas: Iterable[tuple[str, float]]) -> int:
+    """filas: (nombre, precio)."""
+    return _ejecutar_lote(pool, "INSERT INTO productos(nombre, precio) VALUES (?, ?)", filas)
+
+def crear_ventas(pool: PoolConexiones, filas: Iterable[tuple[int, int, int]]) -> int:
+    """filas: (id_cliente, id_producto, cantidad)."""
+    return _ejecutar_lote(pool, "INSERT INTO ventas(id_cliente, id_producto, cantidad) VALUES (?, ?, ?)", filas)
+
+def actualizar_emails(pool: PoolConexiones, cambios: Iterable[tuple[int, str]]) -> int:
+    """cambios: (id_cliente, nuevo_email). Devuelve las filas modificadas."""
+    return _ejecutar_lote(pool, "UPDATE clientes SET email = ?2 WHERE id = ?1", cambios)
+
+def borrar_clientes(pool: PoolConexiones, ids: Iterable[int]) -> int:
+    return _ejecutar_lote(pool, "DELETE FROM clientes WHERE id = ?", ((i,) for i in ids))
+
+# --- operaciones unitarias (equivalentes a las de sql_demo, pero con el pool) ---
+def create_cliente(pool: PoolConexiones, nombre: str, email: str) -> int:
+    with pool.transaccion() as conn:
+        return conn.execute("INSERT INTO clientes(nombre, email) VALUES (?, ?)", (nombre, email)).lastrowid
+
+def read_clientes(pool: PoolConexiones) -> list[sqlite3.Row]:
+    with pool.conexion() as conn:
+        return conn.execute("SELECT * FROM clientes ORDER BY id").fetchall()
+
+# --- consultas ---
+TAM_LOTE = 1_000
+
+# CROSS JOIN fija el orden de los bucles: se recorren los clientes por nombre
+# (ix_clientes_nombre) y para cada uno sus ventas (ix_ventas_cliente_cubre), así
+# que solo hay que ordenar los productos de cada cliente y las filas salen sin
+# esperar a ordenar la tabla entera.
+SQL_VENTAS_DETALLE = """
+SELECT
+  c.nombre   AS cliente,
+  p.nombre   AS producto,
+  v.cantidad,
+  p.precio,
+  (v.cantidad * p.precio) AS importe
+FROM clientes c
+CROSS JOIN ventas v ON v.id_cliente = c.id
+JOIN productos p    ON p.id = v.id_producto
+{where}
+ORDER BY c.nombre, p.nombre
+"""
+
+# Sin orden basta recorrer ventas una vez (es el plan más barato para volcarla entera)
+SQL_VENTAS_DETALLE_SIN_ORDEN = """
+SELECT
+  c.nombre   AS cliente,
+  p.nombre   AS producto,
+  v.cantidad,
+  p.precio,
+  (v.cantidad * p.precio) AS importe
+FROM ventas v
+JOIN clientes c  ON c.id = v.id_cliente
+JOIN productos p ON p.id = v.id_producto
+"""
+
+def sql_ventas_detalle(ordenado: bool = True, id_cliente: int | None = None) -> tuple[str, tuple]:
+    if not ordenado:
+        if id_cliente is not None:
+            return SQL_VENTAS_DETALLE_SIN_ORDEN + "WHERE v.id_cliente = ?", (id_cliente,)
+        return SQL_VENTAS_DETALLE_SIN_ORDEN, ()
+    if id_cliente is not None:
+        return SQL_VENTAS_DETALLE.format(where="WHERE c.id = ?"), (id_cliente,)
+    return SQL_VENTAS_DETALLE.format(where=""), ()
+
+def ventas_detalle(pool: PoolConexiones, tam_lote: int = TAM_LOTE, ordenado: bool = True,
+                   id_cliente: int | None = None) -> Iterator[list[sqlite3.Row]]:
+    """
+    Genera lotes de hasta `tam_lote` filas (cliente, producto, cantidad, precio,
+    importe). La conexión queda prestada hasta agotar o cerrar el generador.
+    """
+    sql, params = sql_ventas_detalle(ordenado, id_cliente)
+    with pool.conexion() as conn:
+        cur = conn.execute(sql, params)
+        try:
+            while filas := cur.fetchmany(tam_lote):
+                yield filas
+        finally:
+            cur.close()
+
+def plan_consulta(pool: PoolConexiones, sql: str, params: tuple = ()) -> list[str]:
+    """Líneas de EXPLAIN QUERY PLAN (p. ej. 'SEARCH v USING COVERING INDEX ...')."""
+    with pool.conexion() as conn:
+        return [fila["detail"] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
@@ -0,0 +1,614 @@
+# app/documentos.py
+"""
+Almacén de documentos embebido que imita la parte de pymongo que usa la
+Fase 2, para ejecutarla (y sus tests) sin un MongoDB en marcha.
+
+    db = BaseDocumentos()
+    ventas = db["ventas"]
+    ventas.create_index("id_cliente")
+    ventas.insert_many([...])
+    ventas.find({"id_cliente": 1}, {"_id": 0}).sort("cantidad", -1)
+    ventas.aggregate([{"$lookup": ...}, {"$unwind": ...}, {"$group": ...}])
+
+Cubre: insert_one/insert_many, find/find_one con igualdad, $eq $ne $gt $gte
+$lt $lte $in $nin $exists, $and y $or, proyección, sort/skip/limit;
+update_one/update_many ($set $inc $unset), delete_one/delete_many,
+count_documents, create_index (hash, opcionalmente unique) y aggregate con
+$match $lookup $unwind $addFields/$set $project $group $sort $skip $limit
+$count.
+
+Índices hash por campo: valor → ids en orden de inserción. find y un $match
+inicial los usan para igualdad e $in. $lookup usa el índice de foreignField
+en la colección destino (o _id, siempre indexado); sin índice recorre la
+colección entera por cada documento, como hace MongoDB.
+Los documentos se copian (copia superficial) al insertar y al devolverlos.
+"""
+from __future__ import annotations
+import json
+import secrets
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, NamedTuple
+
+class ErrorClaveDuplicada(Exception):
+    """Equivalente a pymongo.errors.DuplicateKeyError."""
+
+class ResultadoInsercionUno(NamedTuple):
+    inserted_id: Any
+
+class ResultadoInsercion(NamedTuple):
+    inserted_ids: list
+
+class ResultadoActualizacion(NamedTuple):
+    matched_count: int
+    modified_count: int
+
+class ResultadoBorrado(NamedTuple):
+    deleted_count: int
+
+_FALTA = object()  # campo ausente (≠ None)
+
+def _obtener(doc: dict, ruta: str):
+    for parte in ruta.split("."):
+        if not isinstance(doc, dict) or parte not in doc:
+            return _FALTA
+        doc = doc[parte]
+    return doc
+
+# _asignar y _quitar copian cada dict anidado del camino antes de tocarlo
+# (copy-on-write): `doc` es una copia superficial de un documento guardado y
+# comparte con él los subdocumentos, que no deben cambiar.
+def _asignar(doc: dict, ruta: str, valor) -> None:
+    *padres, ultimo = ruta.split(".")
+    for parte in padres:
+        hijo = doc.get(parte, _FALTA)
+        if hijo is _FALTA:
+            hijo = {}
+        elif isinstance(hijo, dict):
+            hijo = dict(hijo)
+        else:
+            raise ValueError(f"No se puede asignar {ruta!r}: {parte!r} no es un subdocumento")
+        doc[parte] = hijo
+        doc = hijo
+    doc[ultimo] = valor
+
+def _quitar(doc: dict, ruta: str) -> None:
+    *padres, ultimo = ruta.split(".")
+    nodo = doc
+    for parte in padres:
+        nodo = nodo.get(parte)
+        if not isinstance(nodo, dict):
+            return
+    if ultimo not in nodo:
+        return  # nada que quitar: no se copia nada
+    for parte in padres:
+        hijo = dict(doc[parte])
+        doc[parte] = hijo
+        doc = hijo
+    del doc[ultimo]
+
+def _clave_indice(valor):
+    # campo ausente y null comparten clave, como en MongoDB
+    valor = None if valor is _FALTA else valor
+    try:
+        hash(valor)
+    except TypeError:
+        return _FALTA  # no indexable: se guarda aparte y siempre es candidato
+    return valor
+
+def _clave_orden(valor):
+    # None/ausente primero, luego números, luego texto; evita comparar tipos distintos
+    if valor is _FALTA or valor is None:
+        return (0, 0)
+    if isinstance(valor, (int, float)):
+        return (1, valor)
+    return (2, str(valor))
+
+# --- filtros ---
+_COMPARADORES = {
+    "$eq": lambda v, c: v == c,
+    "$ne": lambda v, c: v != c,
+    "$gt": lambda v, c: v is not None and v > c,
+    "$gte": lambda v, c: v is not None and v >= c,
+    "$lt": lambda v, c: v is not None and v < c,
+    "$lte": lambda v, c: v is not None and v <= c,
+    "$in": lambda v, c: v in c,
+    "$nin": lambda v, c: v not in c,
+}
+
+def _cumple_condicion(valor, cond) -> bool:
+    if isinstance(cond, dict) and cond and all(k.startswith("$") for k in cond):
+        for op, arg in cond.items():
+            if op == "$exists":
+                if (valor is not _FALTA) != bool(arg):
+                    return False
+                continue
+            if op not in _COMPARADORES:
+                raise ValueError(f"Operador no soportado: {op}")
+            v = None if valor is _FALTA else valor
+            try:
+                if not _COMPARADORES[op](v, arg):
+                    return False
+            except TypeError:
+                return False
+        return True
+    return (None if valor is _FALTA else valor) == cond
+
+def coincide(doc: dict, filtro: dict) -> bool:
+    for clave, cond in filtro.items():
+        if clave == "$and":
+            if not all(coincide(doc, f) for f in cond):
+                return False
+        elif clave == "$or":
+            if not any(coincide(doc, f) for f in cond):
+                return False
+        elif not _cumple_condicion(_obtener(doc, clave), cond):
+            return False
+    return True
+
+# --- expresiones de agregación ---
+def evaluar(expr, doc: dict):
+    if isinstance(expr, str) and expr.startswith("$"):
+        v = _obtener(doc, expr[1:])
+        return None if v is _FALTA else v
+    if isinstance(expr, list):
+        return [evaluar(e, doc) for e in expr]
+    if isinstance(expr, dict):
+        if len(expr) == 1:
+            (op, args), = expr.items()
+            if op.startswith("$"):
+                return _operador(op, args, doc)
+        return {k: evaluar(v, doc) for k, v in expr.items()}
+    return expr
+
+def _operador(op: str, args, doc: dict):
+    vals = evaluar(args, doc) if isinstance(args, list) else [evaluar(args, doc)]
+    if op == "$ifNull":
+        return next((v for v in vals if v is not None), None)
+    if op == "$concat":
+        return None if any(v is None for v in vals) else "".join(vals)
+    if any(v is None for v in vals):
+        return None
+    if op == "$multiply":
+        r = 1
+        for v in vals:
+            r *= v
+        return r
+    if op == "$add":
+        return sum(vals)
+    if op == "$subtract":
+        return vals[0] - vals[1]
+    if op == "$divide":
+        return vals[0] / vals[1]
+    raise ValueError(f"Operador de expresión no soportado: {op}")
+
+def _proyectar(doc: dict, proyeccion: dict | None) -> dict:
+    if not proyeccion:
+        return dict(doc)
+    incluir_id = bool(proyeccion.get("_id", 1))
+    resto = {k: v for k, v in proyeccion.items() if k != "_id"}
+    if not resto or all(v in (0, False) for v in resto.values()):
+        out = dict(doc)
+        for k in resto:
+            _quitar(out, k)
+    else:
+        out = {}
+        for k, v in resto.items():
+            if v in (1, True):
+                valor = _obtener(doc, k)
+                if valor is not _FALTA:
+                    _asignar(out, k, valor)
+            else:
+                _asignar(out, k, evaluar(v, doc))
+    if incluir_id and "_id" in doc:
+        out = {"_id": doc["_id"], **out}
+    elif not incluir_id:
+        out.pop("_id", None)
+    return out
+
+def _ordenar(docs: list[dict], orden: list[tuple[str, int]]) -> list[dict]:
+    # sort estable: se ordena de la última clave a la primera
+    for campo, sentido in reversed(orden):
+        docs.sort(key=lambda d: _clave_orden(_obtener(d, campo)), reverse=sentido < 0)
+    return docs
+
+def _normalizar_orden(clave, sentido: int = 1) -> list[tuple[str, int]]:
+    if isinstance(clave, str):
+        return [(clave, sentido)]
+    if isinstance(clave, dict):
+        return list(clave.items())
+    return [(c, s) for c, s in clave]
+
+class Indice:
+    __slots__ = ("campo", "unico", "claves", "no_indexables")
+
+    def __init__(self, campo: str, unico: bool = False):
+        self.campo, self.unico = campo, unico
+        self.claves: dict[Any, dict] = {}  # valor → {_id: None} (conjunto ordenado)
+        self.no_indexables: dict = {}
+
+    def comprobar(self, doc: dict, ignorar_id=_FALTA) -> None:
+        if not self.unico:
+            return
+        k = _clave_indice(_obtener(doc, self.campo))
+        ids = self.claves.get(k) if k is not _FALTA else None
+        if ids and any(i != ignorar_id for i in ids):
+            raise ErrorClaveDuplicada(f"Clave duplicada en índice único {self.campo!r}: {k!r}")
+
+    def agregar(self, doc: dict) -> None:
+        k = _clave_indice(_obtener(doc, self.campo))
+        (self.no_indexables if k is _FALTA else self.claves.setdefault(k, {}))[doc["_id"]] = None
+
+    def quitar(self, doc: dict) -> None:
+        k = _clave_indice(_obtener(doc, self.campo))
+        if k is _FALTA:
+            self.no_indexables.pop(doc["_id"], None)
+            return
+        ids = self.claves.get(k)
+        if ids is not None:
+            ids.pop(doc["_id"], None)
+            if not ids:
+                del self.claves[k]
+
+    def buscar(self, valores: Iterable) -> Iterator:
+        vistos = set()
+        for v in valores:
+            for i in self.claves.get(_clave_indice(v), ()):
+                if i not in vistos:
+                    vistos.add(i)
+                    yield i
+        yield from self.no_indexables
+
+class Cursor:
+    """Resultado perezoso de find(): admite sort, skip y limit encadenados."""
+
+    def __init__(self, docs: Iterable[dict], proyeccion: dict | None):
+        self._docs, self._proyeccion = docs, proyeccion
+        self._orden: list[tuple[str, int]] = []
+        self._skip, self._limit = 0, 0
+
+    def sort(self, clave, sentido: int = 1) -> "Cursor":
+        self._orden = _normalizar_orden(clave, sentido)
+        return self
+
+    def skip(self, n: int) -> "Cursor":
+        self._skip = n
+        return self
+
+    def limit(self, n: int) -> "Cursor":
+        self._limit = n
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        docs: Iterable[dict] = self._docs
+        if self._orden:
+            docs = _ordenar(list(docs), self._orden)
+        docs = iter(docs)
+        for _ in range(self._skip):
+            if next(docs, _FALTA) is _FALTA:
+                return
+        for n, doc in enumerate(docs, 1):
+            yield _proyectar(doc, self._proyeccion)
+            if n == self._limit:
+                return
+
+class Coleccion:
+    def __init__(self, db: "BaseDocumentos", nombre: str):
+        self.db, self.name = db, nombre
+        self._docs: dict[Any, dict] = {}
+        self._indices: dict[str, Indice] = {}
+
+    # --- índices ---
+    def create_index(self, claves, unique: bool = False) -> str:
+        campos = _normalizar_orden(claves)
+        if len(campos) != 1:
+            raise ValueError("Solo se admiten índices de un campo")
+        campo = campos[0][0]
+        if campo == "_id":
+            return "_id_"
+        if campo not in self._indices:
+            indice = Indice(campo, unique)
+            for doc in self._docs.values():
+                indice.comprobar(doc)
+                indice.agregar(doc)
+            self._indices[campo] = indice
+        return f"{campo}_1"
+
+    def drop_index(self, campo: str) -> None:
+        self._indices.pop(campo.removesuffix("_1"), None)
+
+    def index_information(self) -> dict[str, dict]:
+        info = {"_id_": {"key": [("_id", 1)]}}
+        for campo, ind in self._indices.items():
+            info[f"{campo}_1"] = {"key": [(campo, 1)], "unique": ind.unico}
+        return info
+
+    # --- escritura ---
+    def insert_one(self, doc: dict) -> ResultadoInsercionUno:
+        return ResultadoInsercionUno(self._insertar([doc])[0])
+
+    def insert_many(self, docs: Iterable[dict]) -> ResultadoInsercion:
+        return ResultadoInsercion(self._insertar(docs))
+
+    def _insertar(self, docs: Iterable[dict]) -> list:
+        ids = []
+        for doc in docs:
+            doc = dict(doc)
+            if "_id" not in doc:
+                doc["_id"] = secrets.token_hex(12)
+            if doc["_id"] in self._docs:
+                raise ErrorClaveDuplicada(f"_id duplicado en {self.name!r}: {doc['_id']!r}")
+            for ind in self._indices.values():
+                ind.comprobar(doc)
+            self._docs[doc["_id"]] = doc
+            for ind in self._indices.values():
+                ind.agregar(doc)
+            ids.append(doc["_id"])
+        return ids
+
+    def _aplicar(self, doc: dict, cambios: dict) -> dict:
+        nuevo = dict(doc)
+        for op, campos in cambios.items():
+            for campo, valor in campos.items():
+                if campo == "_id":
+                    raise ValueError("No se puede modificar _id")
+                if op == "$set":
+                    _asignar(nuevo, campo, valor)
+                elif op == "$inc":
+                    actual = _obtener(nuevo, campo)
+                    _asignar(nuevo, campo, (0 if actual is _FALTA else actual) + valor)
+                elif op == "$unset":
+                    _quitar(nuevo, campo)
+                else:
+                    raise ValueError(f"Operador de actualización no soportado: {op}")
+        return nuevo
+
+    def _actualizar(self, filtro: dict, cambios: dict, uno: bool) -> ResultadoActualizacion:
+        if not cambios or not all(k.startswith("$") for k in cambios):
+            raise ValueError("La actualización debe usar operadores ($set, $inc, $unset)")
+        encontrados = modificados = 0
+        for doc in list(islice(self._candidatos(filtro), 1 if uno else None)):
+            encontrados += 1
+            nuevo = self._aplicar(doc, cambios)
+            if nuevo != doc:
+                for ind in self._indices.values():
+                    ind.comprobar(nuevo, ignorar_id=doc["_id"])
+                for ind in self._indices.values():
+                    ind.quitar(doc)
+                    ind.agregar(nuevo)
+                self._docs[doc["_id"]] = nuevo
+                modificados += 1
+        return ResultadoActualizacion(encontrados, modificados)
+
+    def update_one(self, filtro: dict, cambios: dict) -> ResultadoActualizacion:
+        return self._actualizar(filtro, cambios, uno=True)
+
+    def update_many(self, filtro: dict, cambios: dict) -> ResultadoActualizacion:
+        return self._actualizar(filtro, cambios, uno=False)
+
+    def _borrar(self, filtro: dict, uno: bool) -> ResultadoBorrado:
+        n = 0
+        for doc in list(islice(self._candidatos(filtro), 1 if uno else None)):
+            for ind in self._indices.values():
+                ind.quitar(doc)
+            del self._docs[doc["_id"]]
+            n += 1
+        return ResultadoBorrado(n)
+
+    def delete_one(self, filtro: dict) -> ResultadoBorrado:
+        return self._borrar(filtro, uno=True)
+
+    def delete_many(self, filtro: dict) -> ResultadoBorrado:
+        return self._borrar(filtro, uno=False)
+
+    # --- lectura ---
+    def _plan(self, filtro: dict) -> Iterable | None:
+        """Ids candidatos según el primer campo indexado con igualdad o $in; None = recorrido completo."""
+        for campo, cond in filtro.items():
+            if campo.startswith("$"):
+                continue
+            if isinstance(cond, dict) and any(k.startswith("$") for k in cond):
+                if set(cond) == {"$eq"}:
+                    valores = [cond["$eq"]]
+                elif set(cond) == {"$in"}:
+                    valores = list(cond["$in"])
+                else:
+                    continue
+            else:
+                valores = [cond]
+            if campo == "_id":
+                return [v for v in valores if _clave_indice(v) is not _FALTA and v in self._docs]
+            if campo in self._indices:
+                return self._indices[campo].buscar(valores)
+        return None
+
+    def _candidatos(self, filtro: dict | None) -> Iterator[dict]:
+        filtro = filtro or {}
+        ids = self._plan(filtro)
+        docs = self._docs.values() if ids is None else (self._docs[i] for i in ids)
+        if not filtro:
+            yield from docs
+            return
+        for doc in docs:
+            if coincide(doc, filtro):
+                yield doc
+
+    def find(self, filtro: dict | None = None, proyeccion: dict | None = None) -> Cursor:
+        return Cursor(self._candidatos(filtro), proyeccion)
+
+    def find_one(self, filtro: dict | None = None, proyeccion: dict | None = None) -> dict | None:
+        return next(iter(self.find(filtro, proyeccion).limit(1)), None)
+
+    def count_documents(self, filtro: dict | None = None) -> int:
+        if not filtro:
+            return len(self._docs)
+        return sum(1 for _ in self._candidatos(filtro))
+
+    def usa_indice(self, filtro: dict) -> bool:
+        """True si find(filtro) no recorre la colección entera (equivale a mirar explain())."""
+        return self._plan(filtro) is not None
+
+    # --- agregación ---
+    def aggregate(self, pipeline: list[dict]) -> Iterator[dict]:
+        etapas = list(pipeline)
+        if etapas and "$match" in etapas[0]:
+            docs: Iterable[dict] = (dict(d) for d in self._candidatos(etapas.pop(0)["$match"]))
+        else:
+            docs = (dict(d) for d in self._docs.values())
+        for etapa in etapas:
+            (op, arg), = etapa.items()
+            if op not in self.ETAPAS:
+                raise ValueError(f"Etapa de agregación no soportada: {op}")
+            docs = getattr(self, self.ETAPAS[op])(docs, arg)
+        return iter(docs)
+
+    def _etapa_match(self, docs, filtro):
+        return (d for d in docs if coincide(d, filtro))
+
+    def _etapa_lookup(self, docs, arg):
+        destino = self.db[arg["from"]]
+        local, foraneo, como = arg["localField"], arg["foreignField"], arg["as"]
+        for doc in docs:
+            valor = _obtener(doc, local)
+            valor = None if valor is _FALTA else valor
+            valores = valor if isinstance(valor, list) else [valor]
+            filtro = {foraneo: {"$in": valores}}
+            doc[como] = [dict(d) for d in destino._candidatos(filtro)]
+            yield doc
+
+    def _etapa_unwind(self, docs, arg):
+        ruta = arg if isinstance(arg, str) else arg["path"]
+        conservar = isinstance(arg, dict) and arg.get("preserveNullAndEmptyArrays", False)
+        campo = ruta.lstrip("$")
+        for doc in docs:
+            valor = _obtener(doc, campo)
+            if isinstance(valor, list) and valor:
+                for elem in valor:
+                    nuevo = dict(doc)
+                    _asignar(nuevo, campo, elem)
+                    yield nuevo
+            elif isinstance(valor, list) or valor is _FALTA or valor is None:
+                if conservar:
+                    if isinstance(valor, list):
+                        nuevo = dict(doc)
+                        _quitar(nuevo, campo)
+                        yield nuevo
+                    else:
+                        yield doc
+            else:
+                yield doc
+
+    def _etapa_add_fields(self, docs, campos):
+        for doc in docs:
+            for campo, expr in campos.items():
+                _asignar(doc, campo, evaluar(expr, doc))
+            yield doc
+
+    def _etapa_project(self, docs, proyeccion):
+        return (_proyectar(d, proyeccion) for d in docs)
+
+    def _etapa_group(self, docs, arg):
+        expr_id = arg["_id"]
+        acumuladores = {k: next(iter(v.items())) for k, v in arg.items() if k != "_id"}
+        grupos: dict = {}
+        for doc in docs:
+            clave = evaluar(expr_id, doc)
+            h = json.dumps(clave, sort_keys=True, default=str) if isinstance(clave, (dict, list)) else clave
+            estado = grupos.get(h)
+            if estado is None:
+                estado = grupos[h] = {"_id": clave, **{k: [] if op in ("$push", "$avg") else _FALTA
+                                                       for k, (op, _) in acumuladores.items()}}
+            for campo, (op, expr) in acumuladores.items():
+                v = evaluar(expr, doc)
+                actual = estado[campo]
+                if op == "$sum":
+                    estado[campo] = (0 if actual is _FALTA else actual) + (v if isinstance(v, (int, float)) else 0)
+                elif op == "$avg" or op == "$push":
+                    if op == "$push" or isinstance(v, (int, float)):
+                        actual.append(v)
+                elif op == "$min":
+                    if v is not None and (actual is _FALTA or v < actual):
+                        estado[campo] = v
+                elif op == "$max":
+                    if v is not None and (actual is _FALTA or v > actual):
+                        estado[campo] = v
+                elif op == "$first":
+                    if actual is _FALTA:
+                        estado[campo] = v
+                elif op == "$last":
+                    estado[campo] = v
+                else:
+                    raise ValueError(f"Acumulador no soportado: {op}")
+        for estado in grupos.values():
+            for campo, (op, _) in acumuladores.items():
+                if op == "$avg":
+                    vals = estado[campo]
+                    estado[campo] = sum(vals) / len(vals) if vals else None
+                elif estado[campo] is _FALTA:
+                    estado[campo] = 0 if op == "$sum" else None
+            yield estado
+
+    def _etapa_sort(self, docs, orden):
+        return iter(_ordenar(list(docs), _normalizar_orden(orden)))
+
+    def _etapa_skip(self, docs, n):
+        for i, d in enumerate(docs):
+            if i >= n:
+                yield d
+
+    def _etapa_limit(self, docs, n):
+        for i, d in enumerate(docs):
+            if i >= n:
+                return
+            yield d
+
+    def _etapa_count(self, docs, campo):
+        yield {campo: sum(1 for _ in docs)}
+
+    ETAPAS = {
+        "$match": "_etapa_match", "$lookup": "_etapa_lookup", "$unwind": "_etapa_unwind",
+        "$addFields": "_etapa_add_fields", "$set": "_etapa_add_fields", "$project": "_etapa_project",
+        "$group": "_etapa_group", "$sort": "_etapa_sort", "$skip": "_etapa_skip",
+        "$limit": "_etapa_limit", "$count": "_etapa_count",
+    }
+
+class BaseDocumentos:
+    """Base de datos: db["nombre"] crea la colección si no existe."""
+
+    def __init__(self, nombre: str = "lab10"):
+        self.name = nombre
+        self._colecciones: dict[str, Coleccion] = {}
+
+    def __getitem__(self, nombre: str) -> Coleccion:
+        if nombre not in self._colecciones:
+            self._colecciones[nombre] = Coleccion(self, nombre)
+        return self._colecciones[nombre]
+
+    def list_collection_names(self) -> list[str]:
+        return list(self._colecciones)
+
+    def drop_collection(self, nombre: str) -> None:
+        self._colecciones.pop(nombre, None)
+
+    # --- persistencia: un .jsonl por colección + índices en meta.json ---
+    def guardar(self, carpeta: Path) -> None:
+        carpeta.mkdir(parents=True, exist_ok=True)
+        meta = {}
+        for nombre, col in self._colecciones.items():
+            with (carpeta / f"{nombre}.jsonl").open("w", encoding="utf-8") as f:
+                for doc in col._docs.values():
+                    f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+            meta[nombre] = [[ind.campo, ind.unico] for ind in col._indices.values()]
+        (carpeta / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def cargar(cls, carpeta: Path, nombre: str = "lab10") -> "BaseDocumentos":
+        db = cls(nombre)
+        meta = json.loads((carpeta / "meta.json").read_text(encoding="utf-8"))
+        for col_nombre, indices in meta.items():
+            col = db[col_nombre]
+            for campo, unico in indices:
+                col.create_index(campo, unique=unico)
+            with (carpeta / f"{col_nombre}.jsonl").open(encoding="utf-8") as f:
+                col.insert_many(json.loads(linea) for linea in f if linea.strip())
+        return db
@@ -0,0 +1,166 @@
+# app/etl.py
+"""
+ETL por trozos para la Fase 3 (etl_pandas carga tablas enteras en memoria).
+
+- exportar_tabla_csv / export_sqlite_to_csv: SELECT ordenado por id servido
+  con fetchmany y escrito con csv.writer lote a lote; el fichero se escribe
+  aparte y se renombra al final, así nunca queda un CSV a medias.
+- exportar_incremental: solo las filas con id > marca de agua. El estado
+  (último id y tamaño del CSV) se guarda tras fsync del CSV; si una ejecución
+  se corta, la siguiente trunca lo escrito de más y repite desde la marca.
+- leer_tabla / cargar_y_unir: pd.read_sql con chunksize y reducción de tipos
+  (category, int32, float32) trozo a trozo. pandas es opcional: sin él solo
+  funciona la parte CSV.
+"""
+from __future__ import annotations
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+from .datos import PoolConexiones
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+EXPORT_DIR = Path("data/export")
+TAM_LOTE = 10_000
+TABLAS = ("clientes", "productos", "ventas")
+
+def _tabla(nombre: str) -> str:
+    # el nombre va interpolado en el SQL: solo se aceptan tablas conocidas
+    if nombre not in TABLAS:
+        raise ValueError(f"Tabla desconocida: {nombre!r}. Válidas: {TABLAS}")
+    return nombre
+
+def _volcar(pool: PoolConexiones, tabla: str, f, desde_id: int, tam_lote: int,
+            cabecera: bool) -> tuple[int, int]:
+    """Escribe en f las filas con id > desde_id. Devuelve (filas, último id)."""
+    n, ultimo = 0, desde_id
+    with pool.conexion() as conn:
+        cur = conn.execute(f"SELECT * FROM {tabla} WHERE id > ? ORDER BY id", (desde_id,))
+        w = csv.writer(f)
+        if cabecera:
+            w.writerow([d[0] for d in cur.description])
+        while lote := cur.fetchmany(tam_lote):
+            w.writerows(lote)
+            n += len(lote)
+            ultimo = lote[-1]["id"]
+    return n, ultimo
+
+def exportar_tabla_csv(pool: PoolConexiones, tabla: str, destino: Path, tam_lote: int = TAM_LOTE) -> int:
+    """Exporta la tabla completa a `destino` con memoria constante."""
+    tabla = _tabla(tabla)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_name(destino.name + ".tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        n, _ = _volcar(pool, tabla, f, 0, tam_lote, cabecera=True)
+    os.replace(tmp, destino)
+    return n
+
+def export_sqlite_to_csv(pool: PoolConexiones, destino_dir: Path = EXPORT_DIR,
+                         tam_lote: int = TAM_LOTE) -> dict[str, int]:
+    """Versión por lotes de etl_pandas.export_sqlite_to_csv. Devuelve filas por tabla."""
+    return {t: exportar_tabla_csv(pool, t, destino_dir / f"{t}.csv", tam_lote) for t in TABLAS}
+
+def _leer_estado(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"ultimo_id": 0, "bytes": 0}
+
+def _guardar_estado(path: Path, estado: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(estado), encoding="utf-8")
+    os.replace(tmp, path)
+
+def exportar_incremental(pool: PoolConexiones, tabla: str = "ventas", destino_dir: Path = EXPORT_DIR,
+                         tam_lote: int = TAM_LOTE) -> tuple[int, int]:
+    """
+    Añade a destino_dir/<tabla>.csv solo las filas nuevas desde la última
+    ejecución. Devuelve (filas nuevas, marca de agua). Se apoya en que los id
+    de AUTOINCREMENT crecen y no se reutilizan, y en que SQLite serializa las
+    escrituras: no puede aparecer después un id menor que la marca.
+    """
+    tabla = _tabla(tabla)
+    destino_dir.mkdir(parents=True, exist_ok=True)
+    destino = destino_dir / f"{tabla}.csv"
+    estado_path = destino_dir / f".{tabla}.hwm.json"
+    estado = _leer_estado(estado_path)
+    if estado["bytes"] and (not destino.exists() or destino.stat().st_size < estado["bytes"]):
+        raise RuntimeError(f"{destino} no coincide con la marca de agua de {estado_path}: "
+                           "borra ambos para reexportar desde cero")
+
+    with open(destino, "a+b") as fb:
+        fb.truncate(estado["bytes"])  # descarta lo escrito por una ejecución interrumpida
+    with destino.open("a", newline="", encoding="utf-8") as f:
+        n, ultimo = _volcar(pool, tabla, f, estado["ultimo_id"], tam_lote, cabecera=estado["bytes"] == 0)
+        f.flush()
+        os.fsync(f.fileno())
+        tam = f.tell()
+    _guardar_estado(estado_path, {"ultimo_id": ultimo, "bytes": tam})
+    return n, ultimo
+
+# --- pandas (opcional) ---
+def _requiere_pandas():
+    if pd is None:
+        raise RuntimeError("pandas no está instalado: usa las funciones de exportación a CSV")
+    return pd
+
+def reducir_tipos(df, max_ratio_categorias: float = 0.5):
+    """
+    int64 → el entero más pequeño que quepa (int32 para ids), float64 → float32,
+    texto con pocos valores distintos → category. Modifica y devuelve df.
+    """
+    pd = _requiere_pandas()
+    for col in df.columns:
+        serie = df[col]
+        if pd.api.types.is_integer_dtype(serie):
+            df[col] = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_float_dtype(serie):
+            df[col] = serie.astype("float32")
+        elif serie.dtype == object and len(serie) and serie.nunique() / len(serie) <= max_ratio_categorias:
+            df[col] = serie.astype("category")
+    return df
+
+def leer_tabla(pool: PoolConexiones, tabla: str, chunksize: int = TAM_LOTE * 10,
+               columnas: str = "*") -> Iterator:
+    """Trozos de DataFrame con tipos reducidos (pd.read_sql con chunksize)."""
+    pd = _requiere_pandas()
+    tabla = _tabla(tabla)
+    with pool.conexion() as conn:
+        factory, conn.row_factory = conn.row_factory, None  # pandas espera tuplas
+        try:
+            for trozo in pd.read_sql(f"SELECT {columnas} FROM {tabla} ORDER BY id", conn, chunksize=chunksize):
+                yield reducir_tipos(trozo)
+        finally:
+            conn.row_factory = factory
+
+def cargar_y_unir(pool: PoolConexiones, chunksize: int = TAM_LOTE * 10):
+    """
+    Como etl_pandas.cargar_y_unir pero leyendo de SQLite por trozos: las
+    dimensiones (clientes, productos) se cargan una vez y cada trozo de ventas
+    se une y se reduce antes de concatenar, así nunca conviven las ventas con
+    tipos de 64 bits. nombre/producto salen como category.
+    """
+    pd = _requiere_pandas()
+    c = pd.concat(leer_tabla(pool, "clientes", chunksize)).rename(columns={"id": "id_cliente"})
+    p = pd.concat(leer_tabla(pool, "productos", chunksize)).rename(columns={"id": "id_producto", "nombre": "producto"})
+    for col in ("nombre", "email"):
+        c[col] = c[col].astype("category")
+    p["producto"] = p["producto"].astype("category")
+    # mismos dtypes de clave a ambos lados del merge
+    c["id_cliente"] = c["id_cliente"].astype("int32")
+    p["id_producto"] = p["id_producto"].astype("int32")
+
+    trozos = []
+    for v in leer_tabla(pool, "ventas", chunksize, columnas="id_cliente, id_producto, cantidad"):
+        v = v.astype({"id_cliente": "int32", "id_producto": "int32"})
+        df = v.merge(c, on="id_cliente", how="left").merge(p, on="id_producto", how="left")
+        df["importe"] = (df["cantidad"] * df["precio"]).astype("float32")
+        trozos.append(df[["id_cliente", "nombre", "email", "producto", "cantidad", "precio", "importe"]])
+    if not trozos:
+        return pd.DataFrame(columns=["id_cliente", "nombre", "email", "producto", "cantidad", "precio", "importe"])
+    return pd.concat(trozos, ignore_index=True)
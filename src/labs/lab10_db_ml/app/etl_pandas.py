@@ -0,0 +1,65 @@
+# app/etl_pandas.py
+from __future__ import annotations
+import sqlite3
+from pathlib import Path
+import pandas as pd
+
+DB_PATH = Path("data/sqlite/usuarios.db")
+EXPORT_DIR = Path("data/export")
+
+def export_sqlite_to_csv() -> None:
+    """Exporta las tres tablas de SQLite a CSV para trazabilidad."""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(DB_PATH)
+    try:
+        clientes  = pd.read_sql_query("SELECT * FROM clientes", con)
+        productos = pd.read_sql_query("SELECT * FROM productos", con)
+        ventas    = pd.read_sql_query("SELECT * FROM ventas",    con)
+    finally:
+        con.close()
+
+    clientes.to_csv(EXPORT_DIR / "clientes.csv",  index=False)
+    productos.to_csv(EXPORT_DIR / "productos.csv", index=False)
+    ventas.to_csv(EXPORT_DIR / "ventas.csv",    index=False)
+
+def cargar_y_unir() -> pd.DataFrame:
+    """Carga CSVs exportados y realiza los 'joins' en Pandas."""
+    c = pd.read_csv(EXPORT_DIR / "clientes.csv")   .rename(columns={"id": "id_cliente"})
+    p = pd.read_csv(EXPORT_DIR / "productos.csv")  .rename(columns={"id": "id_producto", "nombre": "producto"})
+    v = pd.read_csv(EXPORT_DIR / "ventas.csv")
+
+    df = (v.merge(c, on="id_cliente", how="left")
+            .merge(p, on="id_producto", how="left"))
+    df["importe"] = df["cantidad"] * df["precio"]
+    return df[["id_cliente", "nombre", "email", "producto", "cantidad", "precio", "importe"]]
+
+def informes(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Genera reportes: importe por cliente y unidades por producto."""
+    por_cliente  = (df.groupby(["id_cliente", "nombre"], as_index=False)["importe"]
+                      .sum().sort_values("importe", ascending=False))
+    por_producto = (df.groupby("producto", as_index=False)["cantidad"]
+                      .sum().rename(columns={"cantidad": "uds"})
+                      .sort_values("uds", ascending=False))
+    return por_cliente, por_producto
+
+def main():
+    print("== ETL: exportando desde SQLite a CSV ==")
+    export_sqlite_to_csv()
+    print("   ✓ CSVs: clientes.csv, productos.csv, ventas.csv")
+
+    print("== ETL: uniendo en Pandas (ventas ↔ clientes ↔ productos) ==")
+    df = cargar_y_unir()
+    print(df.head())
+
+    print("== Informes ==")
+    rc, rp = informes(df)
+    print("\nImporte total por cliente:\n", rc.to_string(index=False))
+    print("\nUnidades por producto:\n",   rp.to_string(index=False))
+
+    # Exportar informes
+    rc.to_csv(EXPORT_DIR / "reporte_importe_por_cliente.csv", index=False)
+    rp.to_csv(EXPORT_DIR / "reporte_unidades_por_producto.csv", index=False)
+    print("\n✓ Reportes guardados en data/export/")
+
+if __name__ == "__main__":
+    main()
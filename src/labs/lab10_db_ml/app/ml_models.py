@@ -0,0 +1,69 @@
+# app/ml_models.py
+from __future__ import annotations
+import pandas as pd
+from pathlib import Path
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.linear_model import LogisticRegression, LinearRegression
+
+EXPORT_DIR = Path("data/export")
+
+def load_dataset() -> pd.DataFrame:
+    """Carga los CSV exportados en Fase 3 y prepara un DataFrame consolidado."""
+    c = pd.read_csv(EXPORT_DIR / "clientes.csv").rename(columns={"id": "id_cliente"})
+    p = pd.read_csv(EXPORT_DIR / "productos.csv").rename(columns={"id": "id_producto", "nombre": "producto"})
+    v = pd.read_csv(EXPORT_DIR / "ventas.csv")
+
+    df = (v.merge(c, on="id_cliente", how="left")
+            .merge(p, on="id_producto", how="left"))
+    df["importe"] = df["cantidad"] * df["precio"]
+    return df
+
+def clasificacion_importe(umbral: float = 200.0) -> float:
+    """Clasificación binaria: importe alto (>= umbral) vs bajo (< umbral)."""
+    df = load_dataset()
+    df["alto"] = (df["importe"] >= umbral).astype(int)
+
+    X = df[["precio", "cantidad"]].values
+    y = df["alto"].values
+
+    scaler = StandardScaler()
+    Xn = scaler.fit_transform(X)
+
+    Xtr, Xte, ytr, yte = train_test_split(Xn, y, test_size=0.3, random_state=42)
+    model = LogisticRegression()
+    model.fit(Xtr, ytr)
+
+    acc = model.score(Xte, yte)
+    return acc
+
+def regresion_precio() -> tuple[float, float, float, float]:
+    """Regresión lineal: predecir precio a partir de la cantidad."""
+    df = load_dataset()
+    X = df[["cantidad"]].values
+    y = df["precio"].values
+
+    reg = LinearRegression()
+    reg.fit(X, y)
+
+    r2 = reg.score(X, y)
+    coef = reg.coef_[0]
+    inter = reg.intercept_
+    pred_10 = reg.predict([[10]])[0]  # predicción para cantidad=10
+    return r2, coef, inter, pred_10
+
+def main():
+    print("== Clasificación: importe alto/bajo ==")
+    acc = clasificacion_importe()
+    print(f"Accuracy (importe >= 200): {acc:.2f}")
+
+    print("\n== Regresión: precio en función de cantidad ==")
+    r2, coef, inter, pred = regresion_precio()
+    print(f"R² = {r2:.2f}")
+    print(f"Coef = {coef:.3f}, Intercepto = {inter:.3f}")
+    print(f"Predicción para cantidad=10 → {pred:.2f}")
+
+    print("\n✔ Fase 4 completada.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# app/ml_streaming.py
+"""
+Entrenamiento por lotes (out-of-core) de los modelos de la Fase 4.
+
+ml_models carga el dataset completo con pandas y llama a fit una vez, así
+que la memoria crece con ventas. Aquí:
+
+- Las filas (precio, cantidad) se leen de SQLite con fetchmany en lotes de
+  tam_lote y cada lote se entrena con partial_fit; nada se acumula.
+- La normalización (media y desviación) se calcula con un único SELECT de
+  agregados, sin cargar los datos.
+- La partición train/test depende solo del id de la venta (hash
+  multiplicativo), así que es la misma en cada época y en cada ejecución.
+- Estimadores: SGDClassifier(loss="log_loss") / SGDRegressor si
+  scikit-learn está instalado; si no, SGDLineal, un equivalente mínimo en
+  Python puro con la misma interfaz (partial_fit, predict, coef_, intercept_).
+
+Las funciones *_memoria cargan todo y ajustan de una vez (LogisticRegression
+y LinearRegression, o su solución exacta sin scikit-learn) sobre los mismos
+datos, para comparar la métrica.
+"""
+from __future__ import annotations
+import math
+import random
+from typing import Iterator, NamedTuple
+from .datos import PoolConexiones
+
+try:
+    from sklearn.linear_model import LinearRegression, LogisticRegression, SGDClassifier, SGDRegressor
+except ImportError:
+    LinearRegression = LogisticRegression = SGDClassifier = SGDRegressor = None
+
+TAM_LOTE = 10_000
+EPOCAS = 5
+PCT_TEST = 30
+
+# --- lectura ---
+_SQL_FILAS = """
+SELECT p.precio, v.cantidad
+FROM ventas v JOIN productos p ON p.id = v.id_producto
+{where}
+"""
+# Hash multiplicativo (Knuth) del id: reparte train/test sin depender del
+# orden de inserción ni de una semilla.
+_ES_TEST = "((v.id * 2654435761) % 4294967296) % 100 < :pct"
+PARTES = {"todo": "", "train": f"WHERE NOT {_ES_TEST}", "test": f"WHERE {_ES_TEST}"}
+
+def _sql(parte: str) -> str:
+    if parte not in PARTES:
+        raise ValueError(f"Parte desconocida: {parte!r}. Válidas: {tuple(PARTES)}")
+    return _SQL_FILAS.format(where=PARTES[parte])
+
+def lotes(pool: PoolConexiones, parte: str = "todo", tam_lote: int = TAM_LOTE,
+          pct_test: int = PCT_TEST) -> Iterator[list[tuple[float, int]]]:
+    """Lotes de (precio, cantidad) de la parte pedida."""
+    with pool.conexion() as conn:
+        cur = conn.execute(_sql(parte), {"pct": pct_test})
+        cur.row_factory = None  # tuplas: más baratas que sqlite3.Row
+        try:
+            while filas := cur.fetchmany(tam_lote):
+                yield filas
+        finally:
+            cur.close()
+
+class Estadisticas(NamedTuple):
+    n: int
+    media_precio: float
+    desv_precio: float
+    media_cantidad: float
+    desv_cantidad: float
+
+def estadisticas(pool: PoolConexiones, parte: str = "todo", pct_test: int = PCT_TEST) -> Estadisticas:
+    """Media y desviación típica de precio y cantidad (como StandardScaler) en una pasada de SQLite."""
+    sql = (f"SELECT COUNT(*), AVG(precio), AVG(precio * precio), AVG(cantidad), AVG(cantidad * cantidad) "
+           f"FROM ({_sql(parte)})")
+    with pool.conexion() as conn:
+        n, mp, mp2, mc, mc2 = conn.execute(sql, {"pct": pct_test}).fetchone()
+    if not n:
+        raise ValueError(f"No hay ventas en la parte {parte!r}")
+    # desviación 0 (columna constante) → se deja la escala en 1, como StandardScaler
+    desv = lambda m, m2: math.sqrt(max(m2 - m * m, 0.0)) or 1.0
+    return Estadisticas(n, mp, desv(mp, mp2), mc, desv(mc, mc2))
+
+# --- estimadores ---
+class SGDLineal:
+    """
+    Descenso de gradiente estocástico para un modelo lineal, muestra a muestra:
+    pérdida "logistica" (clases 0/1) o "cuadratica", regularización L2 y
+    tasa eta0 / t**power_t (invscaling). Con promedio=N coef_ e intercept_
+    son la media de los pesos desde la muestra N (ASGD, average=N en
+    scikit-learn; True = desde la primera): mucho menos ruido con una tasa
+    que no llega a cero.
+    Sustituye a SGDClassifier/SGDRegressor cuando scikit-learn no está instalado.
+    """
+
+    def __init__(self, perdida: str = "cuadratica", alpha: float = 1e-4, eta0: float = 0.01,
+                 power_t: float = 0.25, promedio: bool | int = False):
+        if perdida not in ("logistica", "cuadratica"):
+            raise ValueError(f"Pérdida desconocida: {perdida!r}")
+        self.perdida, self.alpha, self.eta0, self.power_t = perdida, alpha, eta0, power_t
+        self.promedio = int(promedio)
+        self._w: list[float] | None = None
+        self._b = 0.0
+        self._wm: list[float] | None = None
+        self._bm = 0.0
+        self.t_ = 0
+
+    def _promediando(self) -> bool:
+        return bool(self.promedio) and self.t_ >= self.promedio
+
+    @property
+    def coef_(self):
+        w = self._wm if self._promediando() else self._w
+        # misma forma que scikit-learn: (1, n) en el clasificador, (n,) en el regresor
+        return [w] if self.perdida == "logistica" else w
+
+    @property
+    def intercept_(self) -> list[float]:
+        return [self._bm if self._promediando() else self._b]
+
+    def partial_fit(self, X, y, classes=None) -> "SGDLineal":
+        if self._w is None:
+            self._w, self._wm = [0.0] * len(X[0]), [0.0] * len(X[0])
+        w, b, wm, bm, t = self._w, self._b, self._wm, self._bm, self.t_
+        logistica, alpha, eta0, power_t = self.perdida == "logistica", self.alpha, self.eta0, self.power_t
+        promedio = self.promedio
+        rango = range(len(w))
+        for xi, yi in zip(X, y):
+            t += 1
+            eta = eta0 / t ** power_t
+            z = b
+            for j in rango:
+                z += w[j] * xi[j]
+            if logistica:
+                # 1/(1+e^-z) sin desbordar para |z| grande
+                g = (1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z))) - yi
+            else:
+                g = z - yi
+            decaimiento = 1.0 - eta * alpha
+            for j in rango:
+                w[j] = w[j] * decaimiento - eta * g * xi[j]
+            b -= eta * g
+            if promedio and t >= promedio:
+                k = t - promedio + 1
+                for j in rango:
+                    wm[j] += (w[j] - wm[j]) / k
+                bm += (b - bm) / k
+        self._b, self._bm, self.t_ = b, bm, t
+        return self
+
+    def decision_function(self, X) -> list[float]:
+        w, b = (self._wm, self._bm) if self._promediando() else (self._w, self._b)
+        return [b + sum(wj * xj for wj, xj in zip(w, xi)) for xi in X]
+
+    def predict(self, X) -> list:
+        z = self.decision_function(X)
+        return [int(v > 0) for v in z] if self.perdida == "logistica" else z
+
+def nuevo_clasificador(semilla: int = 42):
+    if SGDClassifier is not None:
+        return SGDClassifier(loss="log_loss", random_state=semilla)
+    return SGDLineal("logistica", eta0=0.1)
+
+def nuevo_regresor(semilla: int = 42, promedio_desde: int = 1):
+    """promedio_desde: muestras antes de empezar a promediar (p. ej. una época, para saltar el arranque)."""
+    if SGDRegressor is not None:
+        return SGDRegressor(average=promedio_desde, random_state=semilla)
+    return SGDLineal("cuadratica", promedio=promedio_desde)
+
+# --- clasificación: importe alto/bajo ---
+class ResultadoClasificacion(NamedTuple):
+    accuracy: float
+    n_train: int
+    n_test: int
+
+def _xy_clasificacion(lote, est: Estadisticas, umbral: float):
+    mp, sp, mc, sc = est.media_precio, est.desv_precio, est.media_cantidad, est.desv_cantidad
+    X = [((precio - mp) / sp, (cantidad - mc) / sc) for precio, cantidad in lote]
+    y = [int(precio * cantidad >= umbral) for precio, cantidad in lote]
+    return X, y
+
+def clasificacion_importe_streaming(pool: PoolConexiones, umbral: float = 200.0, tam_lote: int = TAM_LOTE,
+                                    epocas: int = EPOCAS, pct_test: int = PCT_TEST,
+                                    semilla: int = 42) -> ResultadoClasificacion:
+    """Versión por lotes de ml_models.clasificacion_importe."""
+    est = estadisticas(pool, "train", pct_test)
+    modelo, rnd = nuevo_clasificador(semilla), random.Random(semilla)
+    for _ in range(epocas):
+        for lote in lotes(pool, "train", tam_lote, pct_test):
+            rnd.shuffle(lote)  # SGD converge peor si las muestras llegan en orden
+            X, y = _xy_clasificacion(lote, est, umbral)
+            modelo.partial_fit(X, y, classes=[0, 1])
+    aciertos = n_test = 0
+    for lote in lotes(pool, "test", tam_lote, pct_test):
+        X, y = _xy_clasificacion(lote, est, umbral)
+        aciertos += sum(int(p) == r for p, r in zip(modelo.predict(X), y))
+        n_test += len(y)
+    return ResultadoClasificacion(aciertos / n_test if n_test else float("nan"), est.n, n_test)
+
+# --- regresión: precio en función de la cantidad ---
+class ResultadoRegresion(NamedTuple):
+    r2: float
+    coef: float
+    intercepto: float
+    pred_10: float
+
+class _R2:
+    """R² acumulado por lotes: 1 - SS_res / SS_tot con sumas de y y de y²."""
+
+    def __init__(self):
+        self.n = 0
+        self.suma = self.suma2 = self.ss_res = 0.0
+
+    def agregar(self, y, pred) -> None:
+        for yi, pi in zip(y, pred):
+            self.n += 1
+            self.suma += yi
+            self.suma2 += yi * yi
+            self.ss_res += (yi - pi) ** 2
+
+    @property
+    def valor(self) -> float:
+        ss_tot = self.suma2 - self.suma * self.suma / self.n
+        return 1.0 - self.ss_res / ss_tot if ss_tot > 0 else 0.0
+
+def regresion_precio_streaming(pool: PoolConexiones, tam_lote: int = TAM_LOTE, epocas: int = EPOCAS,
+                               semilla: int = 42) -> ResultadoRegresion:
+    """
+    Versión por lotes de ml_models.regresion_precio (mismo retorno: R² sobre
+    todas las ventas, coeficiente, intercepto y predicción para cantidad=10).
+    Se entrena con x e y normalizados y los coeficientes se devuelven en
+    unidades originales.
+    """
+    est = estadisticas(pool, "todo")
+    mp, sp, mc, sc = est.media_precio, est.desv_precio, est.media_cantidad, est.desv_cantidad
+    modelo, rnd = nuevo_regresor(semilla, est.n if epocas > 1 else 1), random.Random(semilla)
+    for _ in range(epocas):
+        for lote in lotes(pool, "todo", tam_lote):
+            rnd.shuffle(lote)
+            modelo.partial_fit([((c - mc) / sc,) for _, c in lote], [(p - mp) / sp for p, _ in lote])
+    w, b = float(modelo.coef_[0]), float(modelo.intercept_[0])
+    coef = w * sp / sc
+    inter = mp + sp * b - coef * mc
+    r2 = _R2()
+    for lote in lotes(pool, "todo", tam_lote):
+        r2.agregar([p for p, _ in lote], [inter + coef * c for _, c in lote])
+    return ResultadoRegresion(r2.valor, coef, inter, inter + coef * 10)
+
+# --- referencia en memoria ---
+def _todas(pool: PoolConexiones, parte: str, pct_test: int = PCT_TEST) -> list[tuple[float, int]]:
+    with pool.conexion() as conn:
+        cur = conn.execute(_sql(parte), {"pct": pct_test})
+        cur.row_factory = None
+        return cur.fetchall()
+
+def _logistica_newton(X: list[tuple[float, float]], y: list[int], iteraciones: int = 25,
+                      alpha: float = 1.0) -> list[float]:
+    """Regresión logística (b, w1, w2) por Newton-Raphson con L2 como LogisticRegression(C=1)."""
+    beta = [0.0, 0.0, 0.0]
+    for _ in range(iteraciones):
+        g = [0.0, 0.0, 0.0]
+        h = [[0.0] * 3 for _ in range(3)]
+        for (x1, x2), yi in zip(X, y):
+            fila = (1.0, x1, x2)
+            z = beta[0] + beta[1] * x1 + beta[2] * x2
+            p = 1.0 / (1.0 + math.exp(-z)) if z >= 0 else math.exp(z) / (1.0 + math.exp(z))
+            pq = p * (1 - p)
+            for i in range(3):
+                g[i] += (p - yi) * fila[i]
+                for j in range(3):
+                    h[i][j] += pq * fila[i] * fila[j]
+        for i in (1, 2):  # el intercepto no se penaliza
+            g[i] += alpha * beta[i]
+            h[i][i] += alpha
+        paso = _resolver3(h, g)
+        beta = [bi - pi for bi, pi in zip(beta, paso)]
+        if max(abs(pi) for pi in paso) < 1e-10:
+            break
+    return beta
+
+def _resolver3(a: list[list[float]], b: list[float]) -> list[float]:
+    """Sistema 3x3 por eliminación gaussiana con pivote parcial."""
+    m = [fila[:] + [bi] for fila, bi in zip(a, b)]
+    for c in range(3):
+        piv = max(range(c, 3), key=lambda r: abs(m[r][c]))
+        m[c], m[piv] = m[piv], m[c]
+        if abs(m[c][c]) < 1e-300:
+            return [0.0, 0.0, 0.0]
+        for r in range(c + 1, 3):
+            f = m[r][c] / m[c][c]
+            for k in range(c, 4):
+                m[r][k] -= f * m[c][k]
+    x = [0.0] * 3
+    for r in (2, 1, 0):
+        x[r] = (m[r][3] - sum(m[r][k] * x[k] for k in range(r + 1, 3))) / m[r][r]
+    return x
+
+def clasificacion_importe_memoria(pool: PoolConexiones, umbral: float = 200.0,
+                                  pct_test: int = PCT_TEST) -> ResultadoClasificacion:
+    """Mismo split y normalización que la versión por lotes, pero con todo cargado y un único fit."""
+    est = estadisticas(pool, "train", pct_test)
+    Xtr, ytr = _xy_clasificacion(_todas(pool, "train", pct_test), est, umbral)
+    Xte, yte = _xy_clasificacion(_todas(pool, "test", pct_test), est, umbral)
+    if LogisticRegression is not None:
+        acc = LogisticRegression().fit(Xtr, ytr).score(Xte, yte) if yte else float("nan")
+    else:
+        b, w1, w2 = _logistica_newton(Xtr, ytr)
+        aciertos = sum(int(b + w1 * x1 + w2 * x2 > 0) == yi for (x1, x2), yi in zip(Xte, yte))
+        acc = aciertos / len(yte) if yte else float("nan")
+    return ResultadoClasificacion(acc, len(ytr), len(yte))
+
+def regresion_precio_memoria(pool: PoolConexiones) -> ResultadoRegresion:
+    """Mínimos cuadrados exactos de precio ~ cantidad (LinearRegression si está disponible)."""
+    filas = _todas(pool, "todo")
+    if LinearRegression is not None:
+        X, y = [[c] for _, c in filas], [p for p, _ in filas]
+        reg = LinearRegression().fit(X, y)
+        coef, inter = float(reg.coef_[0]), float(reg.intercept_)
+    else:
+        n = len(filas)
+        mx = sum(c for _, c in filas) / n
+        my = sum(p for p, _ in filas) / n
+        sxx = sum((c - mx) ** 2 for _, c in filas)
+        sxy = sum((c - mx) * (p - my) for p, c in filas)
+        coef = sxy / sxx if sxx else 0.0
+        inter = my - coef * mx
+    r2 = _R2()
+    r2.agregar([p for p, _ in filas], [inter + coef * c for _, c in filas])
+    return ResultadoRegresion(r2.valor, coef, inter, inter + coef * 10)
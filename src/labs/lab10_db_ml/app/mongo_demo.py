@@ -0,0 +1,112 @@
+# app/mongo_demo.py
+from __future__ import annotations
+from typing import Tuple
+
+MONGO_URI = "mongodb://localhost:27017"
+DB_NAME   = "lab10"
+
+def get_collections(db=None) -> Tuple:
+    """
+    Colecciones de `db`; sin db se conecta a MONGO_URI con pymongo. Para
+    ejecutar la fase sin servidor: get_collections(BaseDocumentos()).
+    """
+    if db is None:
+        from pymongo import MongoClient
+        client = MongoClient(MONGO_URI)
+        db = client[DB_NAME]
+    clientes  = db["clientes"]
+    productos = db["productos"]
+    ventas    = db["ventas"]
+    return clientes, productos, ventas
+
+def crear_indices(db=None):
+    clientes, _, ventas = get_collections(db)
+    ventas.create_index([("id_cliente", 1)])
+    ventas.create_index([("id_producto", 1)])
+    clientes.create_index("email", unique=True)
+
+def seed(db=None):
+    clientes, productos, ventas = get_collections(db)
+    # Limpieza
+    clientes.delete_many({})
+    productos.delete_many({})
+    ventas.delete_many({})
+
+    # Semillas (usamos _id explícito para facilitar lookups)
+    clientes.insert_many([
+        {"_id": 1, "nombre": "Ana",   "email": "ana@test.com"},
+        {"_id": 2, "nombre": "Luis",  "email": "luis@test.com"},
+        {"_id": 3, "nombre": "Marta", "email": "marta@test.com"},
+    ])
+    productos.insert_many([
+        {"_id": 1, "nombre": "Portátil", "precio": 900.0},
+        {"_id": 2, "nombre": "Monitor",  "precio": 180.0},
+        {"_id": 3, "nombre": "Teclado",  "precio": 25.0},
+    ])
+    ventas.insert_many([
+        {"id_cliente": 1, "id_producto": 1, "cantidad": 1},
+        {"id_cliente": 1, "id_producto": 2, "cantidad": 1},
+        {"id_cliente": 2, "id_producto": 3, "cantidad": 2},
+        {"id_cliente": 3, "id_producto": 2, "cantidad": 1},
+    ])
+
+def demo_crud(db=None):
+    clientes, productos, ventas = get_collections(db)
+
+    # CREATE
+    print("→ CREATE: añadir cliente 'Carlos'")
+    clientes.insert_one({"_id": 4, "nombre": "Carlos", "email": "carlos@test.com"})
+
+    # READ simple
+    print("\n→ READ: listar clientes (solo nombre/email)")
+    for doc in clientes.find({}, {"_id": 0, "nombre": 1, "email": 1}).sort("nombre", 1):
+        print("   ", doc)
+
+    # UPDATE
+    print("\n→ UPDATE: actualizar precio de 'Monitor' a 190.0")
+    productos.update_one({"nombre": "Monitor"}, {"$set": {"precio": 190.0}})
+
+    # DELETE
+    print("\n→ DELETE: eliminar cliente 'Carlos'")
+    clientes.delete_one({"_id": 4})
+
+PIPELINE_VENTAS_DETALLE = [
+    {"$lookup": {
+        "from": "clientes",
+        "localField": "id_cliente",
+        "foreignField": "_id",
+        "as": "cliente"
+    }},
+    {"$lookup": {
+        "from": "productos",
+        "localField": "id_producto",
+        "foreignField": "_id",
+        "as": "producto"
+    }},
+    {"$unwind": "$cliente"},
+    {"$unwind": "$producto"},
+    {"$addFields": {"importe": {"$multiply": ["$cantidad", "$producto.precio"]}}},
+    {"$project": {
+        "_id": 0,
+        "cliente": "$cliente.nombre",
+        "producto": "$producto.nombre",
+        "cantidad": 1,
+        "precio": "$producto.precio",
+        "importe": 1
+    }},
+    {"$sort": {"cliente": 1, "producto": 1}}
+]
+
+def ventas_detalle_pipeline(db=None) -> list[dict]:
+    _, _, ventas = get_collections(db)
+    print("\n→ Ventas (aggregation + lookup):")
+    docs = list(ventas.aggregate(PIPELINE_VENTAS_DETALLE))
+    for doc in docs:
+        print("   ", doc)
+    return docs
+
+if __name__ == "__main__":
+    seed()
+    demo_crud()
+    ventas_detalle_pipeline()
+    print("\n✔ Fase 2 completada.")
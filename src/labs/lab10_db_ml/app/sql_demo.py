@@ -0,0 +1,133 @@
+# app/sql_demo.py
+from __future__ import annotations
+import sqlite3
+from pathlib import Path
+from contextlib import closing
+
+DB_PATH = Path("data/sqlite/usuarios.db")
+
+DDL = """
+PRAGMA foreign_keys = ON;
+CREATE TABLE IF NOT EXISTS clientes (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  nombre TEXT NOT NULL,
+  email TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS productos (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  nombre TEXT NOT NULL,
+  precio REAL NOT NULL CHECK (precio >= 0)
+);
+CREATE TABLE IF NOT EXISTS ventas (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  id_cliente INTEGER NOT NULL,
+  id_producto INTEGER NOT NULL,
+  cantidad INTEGER NOT NULL CHECK (cantidad > 0),
+  FOREIGN KEY(id_cliente)  REFERENCES clientes(id)  ON DELETE CASCADE,
+  FOREIGN KEY(id_producto) REFERENCES productos(id) ON DELETE RESTRICT
+);
+CREATE INDEX IF NOT EXISTS ix_ventas_cliente ON ventas(id_cliente);
+CREATE INDEX IF NOT EXISTS ix_ventas_producto ON ventas(id_producto);
+"""
+
+def sentencias(script: str) -> list[str]:
+    return [s.strip() for s in script.split(";") if s.strip()]
+
+def connect():
+    # la carpeta se crea al conectar, no al importar el módulo
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    # devolver filas como dict-like (acceso por nombre de columna)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+def init_db():
+    with closing(connect()) as conn, conn:  # autocommit/rollback
+        cur = conn.cursor()
+        for stmt in sentencias(DDL):
+            cur.execute(stmt)
+
+def seed():
+    with closing(connect()) as conn, conn:
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT OR IGNORE INTO clientes(nombre, email) VALUES (?, ?)",
+            [("Ana","ana@test.com"), ("Luis","luis@test.com"), ("Marta","marta@test.com")]
+        )
+        cur.executemany(
+            "INSERT OR IGNORE INTO productos(nombre, precio) VALUES (?, ?)",
+            [("Portátil", 900.0), ("Monitor", 180.0), ("Teclado", 25.0)]
+        )
+        # ventas (id_cliente, id_producto, cantidad)
+        cur.executemany(
+            "INSERT INTO ventas(id_cliente, id_producto, cantidad) VALUES (?, ?, ?)",
+            [(1,1,1), (1,2,1), (2,3,2), (3,2,1)]
+        )
+
+def create_cliente(nombre: str, email: str) -> int:
+    with closing(connect()) as conn, conn:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO clientes(nombre, email) VALUES (?,?)", (nombre, email))
+        return cur.lastrowid
+
+def read_clientes() -> list[sqlite3.Row]:
+    with closing(connect()) as conn:
+        return conn.execute("SELECT * FROM clientes ORDER BY id").fetchall()
+
+def update_email_cliente(cliente_id: int, nuevo_email: str) -> int:
+    with closing(connect()) as conn, conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE clientes SET email=? WHERE id=?", (nuevo_email, cliente_id))
+        return cur.rowcount
+
+def delete_cliente(cliente_id: int) -> int:
+    with closing(connect()) as conn, conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM clientes WHERE id=?", (cliente_id,))
+        return cur.rowcount
+
+def ventas_detalle() -> list[sqlite3.Row]:
+    sql = """
+    SELECT
+      c.nombre   AS cliente,
+      p.nombre   AS producto,
+      v.cantidad,
+      p.precio,
+      (v.cantidad * p.precio) AS importe
+    FROM ventas v
+    JOIN clientes c  ON c.id = v.id_cliente
+    JOIN productos p ON p.id = v.id_producto
+    ORDER BY cliente, producto;
+    """
+    with closing(connect()) as conn:
+        return conn.execute(sql).fetchall()
+
+def demo():
+    print("→ Inicializando BD y datos…")
+    init_db()
+    seed()
+
+    print("\n→ CREATE: añadir cliente 'Carlos'")
+    nuevo_id = create_cliente("Carlos", "carlos@test.com")
+    print("   id nuevo:", nuevo_id)
+
+    print("\n→ READ: listar clientes")
+    for row in read_clientes():
+        print(f"   {row['id']:>2} | {row['nombre']:<6} | {row['email']}")
+
+    print("\n→ UPDATE: cambiar email de Carlos")
+    update_email_cliente(nuevo_id, "carlos@example.com")
+
+    print("\n→ Ventas (JOIN + importe):")
+    for row in ventas_detalle():
+        print(f"   {row['cliente']:<6} | {row['producto']:<8} | cant={row['cantidad']} | "
+              f"precio={row['precio']:.2f} | importe={row['importe']:.2f}")
+
+    print("\n→ DELETE: borrar cliente Carlos")
+    delete_cliente(nuevo_id)
+
+    print("\n✔ Fase 1 completada.")
+
+if __name__ == "__main__":
+    demo()
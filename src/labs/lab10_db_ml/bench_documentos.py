@@ -0,0 +1,73 @@
+# bench_documentos.py
+"""
+Agregación y find en el almacén de documentos local con y sin índice en
+ventas.id_cliente. El pipeline parte de clientes: $lookup de sus ventas
+(foreignField id_cliente), $unwind, $lookup del producto por _id y $group
+del importe por cliente. Sin índice, cada $lookup recorre todas las ventas.
+
+    python bench_documentos.py --clientes 200 --ventas 50000
+"""
+import argparse
+import random
+import time
+from app.documentos import BaseDocumentos
+
+PIPELINE_IMPORTE = [
+    {"$lookup": {"from": "ventas", "localField": "_id", "foreignField": "id_cliente", "as": "venta"}},
+    {"$unwind": "$venta"},
+    {"$lookup": {"from": "productos", "localField": "venta.id_producto", "foreignField": "_id", "as": "producto"}},
+    {"$unwind": "$producto"},
+    {"$group": {"_id": "$nombre",
+                "importe": {"$sum": {"$multiply": ["$venta.cantidad", "$producto.precio"]}},
+                "n": {"$sum": 1}}},
+    {"$sort": {"importe": -1}},
+]
+
+def poblar(n_clientes: int, n_productos: int, n_ventas: int) -> BaseDocumentos:
+    rnd = random.Random(42)
+    db = BaseDocumentos()
+    db["clientes"].insert_many({"_id": i, "nombre": f"cliente{i:05d}"} for i in range(1, n_clientes + 1))
+    db["productos"].insert_many({"_id": i, "nombre": f"producto{i:04d}", "precio": round(rnd.uniform(1, 1000), 2)}
+                                for i in range(1, n_productos + 1))
+    db["ventas"].insert_many({"id_cliente": rnd.randint(1, n_clientes), "id_producto": rnd.randint(1, n_productos),
+                              "cantidad": rnd.randint(1, 5)} for _ in range(n_ventas))
+    return db
+
+def medir(db: BaseDocumentos, consultas: int, rnd: random.Random) -> tuple[float, float, list]:
+    t0 = time.perf_counter()
+    res = list(db["clientes"].aggregate(PIPELINE_IMPORTE))
+    t_agg = time.perf_counter() - t0
+    ids = [rnd.randint(1, db["clientes"].count_documents({})) for _ in range(consultas)]
+    t0 = time.perf_counter()
+    for i in ids:
+        list(db["ventas"].find({"id_cliente": i}))
+    t_find = time.perf_counter() - t0
+    return t_agg, t_find, res
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_documentos")
+    p.add_argument("--clientes", type=int, default=200)
+    p.add_argument("--productos", type=int, default=100)
+    p.add_argument("--ventas", type=int, default=50_000)
+    p.add_argument("--consultas", type=int, default=200, help="find por id_cliente a cronometrar")
+    args = p.parse_args()
+
+    t0 = time.perf_counter()
+    db = poblar(args.clientes, args.productos, args.ventas)
+    print(f"Carga: {args.ventas} ventas en {time.perf_counter() - t0:.2f}s")
+
+    t_sin, f_sin, res_sin = medir(db, args.consultas, random.Random(1))
+    t0 = time.perf_counter()
+    db["ventas"].create_index("id_cliente")
+    t_idx = time.perf_counter() - t0
+    t_con, f_con, res_con = medir(db, args.consultas, random.Random(1))
+    assert res_con == res_sin, "los resultados con y sin índice difieren"
+
+    print(f"create_index(id_cliente): {t_idx:.3f}s")
+    print(f"{'variante':<12} {'aggregate':>10} {'find x' + str(args.consultas):>12}")
+    print(f"{'sin índice':<12} {t_sin:>9.3f}s {f_sin:>11.3f}s")
+    print(f"{'con índice':<12} {t_con:>9.3f}s {f_con:>11.3f}s")
+    print(f"Aceleración: aggregate x{t_sin / t_con:.1f}, find x{f_sin / f_con:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# bench_escritura.py
+"""
+Filas/s al insertar y actualizar clientes en SQLite:
+- lab: sql_demo (connect por operación, journal por defecto, commit por fila);
+- pool: PoolConexiones con PRAGMAS, una transacción por fila;
+- lote: PoolConexiones + executemany en una sola transacción.
+
+Las variantes fila a fila se miden con --n-unitario filas (son lentas).
+
+    python bench_escritura.py -n 200000 --n-unitario 5000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from app import sql_demo
+from app.datos import PoolConexiones, actualizar_emails, create_cliente, crear_clientes, init_db
+
+def medir(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - t0)
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_escritura")
+    p.add_argument("-n", type=int, default=100_000, help="Filas para la variante por lotes")
+    p.add_argument("--n-unitario", type=int, default=2_000, help="Filas para las variantes fila a fila")
+    args = p.parse_args()
+    n, nu = args.n, min(args.n_unitario, args.n)
+
+    resultados: dict[str, tuple[float, float]] = {}
+    with tempfile.TemporaryDirectory() as d:
+        sql_demo.DB_PATH = Path(d) / "lab.db"
+        sql_demo.init_db()
+        ins = medir(lambda: [sql_demo.create_cliente(f"c{i}", f"c{i}@test.com") for i in range(nu)], nu)
+        upd = medir(lambda: [sql_demo.update_email_cliente(i, f"n{i}@test.com") for i in range(1, nu + 1)], nu)
+        resultados["lab (connect/op)"] = (ins, upd)
+
+        with PoolConexiones(Path(d) / "pool.db") as pool:
+            init_db(pool)
+            ins = medir(lambda: [create_cliente(pool, f"c{i}", f"c{i}@test.com") for i in range(nu)], nu)
+            def actualizar_uno_a_uno():
+                for i in range(1, nu + 1):
+                    actualizar_emails(pool, [(i, f"n{i}@test.com")])
+            upd = medir(actualizar_uno_a_uno, nu)
+            resultados["pool (tx/fila)"] = (ins, upd)
+
+        with PoolConexiones(Path(d) / "lote.db") as pool:
+            init_db(pool)
+            ins = medir(lambda: crear_clientes(pool, ((f"c{i}", f"c{i}@test.com") for i in range(n))), n)
+            upd = medir(lambda: actualizar_emails(pool, ((i, f"n{i}@test.com") for i in range(1, n + 1))), n)
+            resultados["lote (executemany)"] = (ins, upd)
+
+    print(f"n lote={n:,}  n fila a fila={nu:,}")
+    print(f"  {'variante':>20} {'insert filas/s':>15} {'update filas/s':>15}")
+    for nombre, (ins, upd) in resultados.items():
+        print(f"  {nombre:>20} {ins:15,.0f} {upd:15,.0f}")
+
+if __name__ == "__main__":
+    main()
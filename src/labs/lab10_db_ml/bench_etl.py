@@ -0,0 +1,81 @@
+# bench_etl.py
+"""
+Exportación de SQLite a CSV con N ventas: versión del lab (pandas, tablas
+enteras en memoria) frente a la exportación por lotes y la incremental por
+marca de agua tras añadir --nuevas ventas. Si pandas está instalado compara
+también cargar_y_unir entero frente a por trozos con tipos reducidos.
+
+    python bench_etl.py -n 2000000 --nuevas 10000 --memoria
+"""
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from app.datos import PoolConexiones, crear_clientes, crear_indices, crear_productos, crear_ventas, init_db
+from app.etl import cargar_y_unir, export_sqlite_to_csv, exportar_incremental, pd
+
+def poblar(pool: PoolConexiones, n: int, n_clientes: int = 10_000, n_productos: int = 500) -> None:
+    rnd = random.Random(7)
+    init_db(pool, indices=False)
+    crear_clientes(pool, ((f"cliente{i}", f"c{i}@test.com") for i in range(n_clientes)))
+    crear_productos(pool, ((f"producto{i}", round(rnd.uniform(1, 500), 2)) for i in range(n_productos)))
+    crear_ventas(pool, ((rnd.randint(1, n_clientes), rnd.randint(1, n_productos), rnd.randint(1, 5)) for _ in range(n)))
+    crear_indices(pool)
+
+def medir(fn, memoria: bool) -> tuple[float, float | None]:
+    if memoria:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    t = time.perf_counter() - t0
+    pico = None
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return t, pico
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_etl")
+    p.add_argument("-n", type=int, default=1_000_000)
+    p.add_argument("--nuevas", type=int, default=10_000)
+    p.add_argument("--memoria", action="store_true", help="Mide el pico con tracemalloc (más lento)")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        base = Path(d)
+        db = base / "ventas.db"
+        resultados: dict[str, tuple[float, float | None]] = {}
+        with PoolConexiones(db) as pool:
+            poblar(pool, args.n)
+            if pd is not None:
+                from app import etl_pandas
+                etl_pandas.DB_PATH, etl_pandas.EXPORT_DIR = db, base / "lab"
+                resultados["lab (pandas)"] = medir(etl_pandas.export_sqlite_to_csv, args.memoria)
+            resultados["por lotes"] = medir(lambda: export_sqlite_to_csv(pool, base / "lotes"), args.memoria)
+            exportar_incremental(pool, destino_dir=base / "inc")
+            rnd = random.Random(1)
+            crear_ventas(pool, ((rnd.randint(1, 10_000), rnd.randint(1, 500), 1) for _ in range(args.nuevas)))
+            resultados[f"incremental (+{args.nuevas:,})"] = medir(
+                lambda: exportar_incremental(pool, destino_dir=base / "inc"), args.memoria)
+            resultados["completa otra vez"] = medir(lambda: export_sqlite_to_csv(pool, base / "lotes"), args.memoria)
+
+            if pd is not None:
+                from app import etl_pandas
+                etl_pandas.EXPORT_DIR = base / "lotes"
+                resultados["cargar_y_unir lab"] = medir(etl_pandas.cargar_y_unir, args.memoria)
+                resultados["cargar_y_unir trozos"] = medir(lambda: cargar_y_unir(pool), args.memoria)
+                df_lab, df_trozos = etl_pandas.cargar_y_unir(), cargar_y_unir(pool)
+                print(f"DataFrame: lab {df_lab.memory_usage(deep=True).sum() / 1e6:,.1f} MB, "
+                      f"trozos {df_trozos.memory_usage(deep=True).sum() / 1e6:,.1f} MB")
+            else:
+                print("(pandas no instalado: se omiten las variantes con DataFrame)")
+
+    print(f"n={args.n:,}")
+    for nombre, (t, pico) in resultados.items():
+        extra = f"  pico {pico:8.1f} MB" if pico is not None else ""
+        print(f"  {nombre:>22}: {t:7.2f} s{extra}")
+
+if __name__ == "__main__":
+    main()
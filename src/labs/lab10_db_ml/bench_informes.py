@@ -0,0 +1,96 @@
+# bench_informes.py
+"""
+Informes de la Fase 3 con N ventas: agrupando todas las ventas en cada
+consulta (lo que hace etl_pandas.informes, aquí con GROUP BY en SQLite y,
+si pandas está instalado, también con pandas) frente a leer los agregados
+materializados. Mide además cuánto encarece cada modo cargar un lote nuevo
+de ventas.
+
+    python bench_informes.py -n 1000000 --lote 100000
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from app.agregados import informes, instalar_resumenes, refrescar, verificar
+from app.datos import PoolConexiones, crear_clientes, crear_productos, crear_ventas, init_db
+from app.etl import cargar_y_unir, pd
+
+SQL_POR_CLIENTE = """
+SELECT c.id AS id_cliente, c.nombre, SUM(v.cantidad * p.precio) AS importe
+FROM ventas v JOIN clientes c ON c.id = v.id_cliente JOIN productos p ON p.id = v.id_producto
+GROUP BY v.id_cliente ORDER BY importe DESC
+"""
+SQL_POR_PRODUCTO = """
+SELECT p.nombre AS producto, SUM(v.cantidad) AS uds
+FROM ventas v JOIN productos p ON p.id = v.id_producto
+GROUP BY v.id_producto ORDER BY uds DESC
+"""
+
+def ventas(rnd: random.Random, n: int, n_clientes: int, n_productos: int):
+    return ((rnd.randint(1, n_clientes), rnd.randint(1, n_productos), rnd.randint(1, 5)) for _ in range(n))
+
+def poblar(path: Path, n: int, n_clientes: int, n_productos: int) -> PoolConexiones:
+    rnd = random.Random(42)
+    pool = PoolConexiones(path)
+    init_db(pool)
+    crear_clientes(pool, ((f"cliente{i:06d}", f"c{i}@test.com") for i in range(n_clientes)))
+    crear_productos(pool, ((f"producto{i:04d}", round(rnd.uniform(1, 1000), 2)) for i in range(n_productos)))
+    crear_ventas(pool, ventas(rnd, n, n_clientes, n_productos))
+    return pool
+
+def cronometrar(f, repeticiones: int = 3) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        f()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+def _recalcular(pool: PoolConexiones):
+    with pool.conexion() as conn:
+        return conn.execute(SQL_POR_CLIENTE).fetchall(), conn.execute(SQL_POR_PRODUCTO).fetchall()
+
+def _pandas(pool: PoolConexiones):
+    df = cargar_y_unir(pool)
+    return (df.groupby(["id_cliente", "nombre"], observed=True)["importe"].sum().sort_values(ascending=False),
+            df.groupby("producto", observed=True)["cantidad"].sum().sort_values(ascending=False))
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_informes")
+    p.add_argument("-n", type=int, default=1_000_000, help="ventas iniciales")
+    p.add_argument("--clientes", type=int, default=10_000)
+    p.add_argument("--productos", type=int, default=500)
+    p.add_argument("--lote", type=int, default=100_000, help="ventas nuevas para medir la carga")
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        t0 = time.perf_counter()
+        pool = poblar(Path(d) / "bench.db", args.n, args.clientes, args.productos)
+        print(f"Carga: {args.n} ventas en {time.perf_counter() - t0:.1f}s")
+
+        rnd = random.Random(1)
+        nuevas = lambda: crear_ventas(pool, ventas(rnd, args.lote, args.clientes, args.productos))
+        t_sin = cronometrar(nuevas, 1)
+
+        print(f"\n{'informes':<28} {'tiempo':>9}")
+        print(f"{'GROUP BY en cada consulta':<28} {cronometrar(lambda: _recalcular(pool)):>8.3f}s")
+        if pd is not None:
+            print(f"{'pandas (cargar_y_unir)':<28} {cronometrar(lambda: _pandas(pool), 1):>8.3f}s")
+        t0 = time.perf_counter()
+        instalar_resumenes(pool, "triggers")
+        print(f"{'reconstrucción completa':<28} {time.perf_counter() - t0:>8.3f}s")
+        print(f"{'leer agregados':<28} {cronometrar(lambda: informes(pool)):>8.3f}s")
+
+        t_trig = cronometrar(nuevas, 1)
+        instalar_resumenes(pool, "incremental")
+        t_inc = cronometrar(lambda: (nuevas(), refrescar(pool)), 1)
+        print(f"\n{'carga de ' + str(args.lote) + ' ventas':<28} {'tiempo':>9}")
+        for modo, t in (("sin resúmenes", t_sin), ("triggers", t_trig), ("incremental + refrescar", t_inc)):
+            print(f"{modo:<28} {t:>8.3f}s")
+        assert verificar(pool) == [], "los agregados no cuadran con ventas"
+        pool.cerrar()
+
+if __name__ == "__main__":
+    main()
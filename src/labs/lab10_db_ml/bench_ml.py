@@ -0,0 +1,74 @@
+# bench_ml.py
+"""
+Modelos de la Fase 4 con tamaños crecientes de ventas: ajuste en memoria
+(todo cargado y un único fit) frente a entrenamiento por lotes con
+partial_fit. Para cada tamaño y variante, tiempo, pico de memoria
+(ru_maxrss, un proceso por medida) y métrica: accuracy de la clasificación
+y R² de la regresión. Con lotes la memoria debe quedarse plana.
+
+    python bench_ml.py -n 100000 400000 1600000 --epocas 3
+"""
+import argparse
+import random
+import resource
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from pathlib import Path
+from app.datos import PoolConexiones, crear_clientes, crear_productos, crear_ventas, init_db
+from app import ml_streaming as ml
+
+def poblar(path: Path, n: int, n_clientes: int = 1_000, n_productos: int = 200) -> None:
+    rnd = random.Random(42)
+    with PoolConexiones(path) as pool:
+        init_db(pool)
+        crear_clientes(pool, ((f"cliente{i:05d}", f"c{i}@test.com") for i in range(n_clientes)))
+        crear_productos(pool, ((f"producto{i:04d}", round(rnd.uniform(1, 1000), 2)) for i in range(n_productos)))
+        crear_ventas(pool, ((rnd.randint(1, n_clientes), rnd.randint(1, n_productos), rnd.randint(1, 5))
+                            for _ in range(n)))
+
+def _medir(variante: str, path: Path, tam_lote: int, epocas: int, cola: Queue) -> None:
+    with PoolConexiones(path) as pool:
+        t0 = time.perf_counter()
+        if variante == "memoria":
+            acc = ml.clasificacion_importe_memoria(pool).accuracy
+            r2 = ml.regresion_precio_memoria(pool).r2
+        else:
+            acc = ml.clasificacion_importe_streaming(pool, tam_lote=tam_lote, epocas=epocas).accuracy
+            r2 = ml.regresion_precio_streaming(pool, tam_lote=tam_lote, epocas=epocas).r2
+        total = time.perf_counter() - t0
+    cola.put((total, acc, r2, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+def medir(variante: str, path: Path, tam_lote: int, epocas: int) -> tuple:
+    cola: Queue = Queue()
+    proc = Process(target=_medir, args=(variante, path, tam_lote, epocas, cola))
+    proc.start()
+    res = cola.get()
+    proc.join()
+    return res
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_ml")
+    p.add_argument("-n", type=int, nargs="+", default=[50_000, 200_000, 800_000])
+    p.add_argument("--tam-lote", type=int, default=ml.TAM_LOTE)
+    p.add_argument("--epocas", type=int, default=3)
+    args = p.parse_args()
+
+    motor = "scikit-learn" if ml.SGDClassifier is not None else "SGDLineal (Python puro, sin scikit-learn)"
+    print(f"Estimadores: {motor}; lotes de {args.tam_lote}, {args.epocas} épocas")
+    print(f"{'n':>10} {'variante':>8} {'tiempo':>9} {'accuracy':>9} {'R²':>8} {'RSS pico':>10}")
+    with tempfile.TemporaryDirectory() as d:
+        for n in args.n:
+            path = Path(d) / f"ventas_{n}.db"
+            poblar(path, n)
+            metricas = {}
+            for variante in ("memoria", "lotes"):
+                total, acc, r2, rss_kb = medir(variante, path, args.tam_lote, args.epocas)
+                metricas[variante] = (acc, r2)
+                print(f"{n:>10,} {variante:>8} {total:>8.2f}s {acc:>9.4f} {r2:>8.4f} {rss_kb / 1024:>8.0f} MB")
+            (acc_m, r2_m), (acc_l, r2_l) = metricas["memoria"], metricas["lotes"]
+            print(f"{'':>10} {'Δ':>8} {'':>9} {acc_l - acc_m:>+9.4f} {r2_l - r2_m:>+8.4f}")
+            path.unlink()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_ventas.py
+"""
+ventas_detalle con N ventas: versión del lab (fetchall de todo el JOIN
+ordenado) frente al generador por lotes con índices cubrientes, ordenado y
+sin orden. Cada variante corre en su propio proceso para medir el pico de
+memoria (ru_maxrss) sin que se mezclen.
+
+    python bench_ventas.py -n 10000000
+"""
+import argparse
+import random
+import resource
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from pathlib import Path
+from app import sql_demo
+from app.datos import PoolConexiones, crear_clientes, crear_indices, crear_productos, crear_ventas, init_db, ventas_detalle
+
+def poblar(path: Path, n: int, n_clientes: int, n_productos: int) -> float:
+    rnd = random.Random(42)
+    t0 = time.perf_counter()
+    with PoolConexiones(path) as pool:
+        init_db(pool, indices=False)
+        crear_clientes(pool, ((f"cliente{i:07d}", f"c{i}@test.com") for i in range(n_clientes)))
+        crear_productos(pool, ((f"producto{i:05d}", round(rnd.uniform(1, 1000), 2)) for i in range(n_productos)))
+        crear_ventas(pool, ((rnd.randint(1, n_clientes), rnd.randint(1, n_productos), rnd.randint(1, 5))
+                            for _ in range(n)))
+        crear_indices(pool)
+    return time.perf_counter() - t0
+
+def _lab(path: Path):
+    sql_demo.DB_PATH = path
+    filas = sql_demo.ventas_detalle()
+    yield filas  # todo llega de golpe
+
+def _lotes(path: Path, ordenado: bool):
+    with PoolConexiones(path) as pool:
+        yield from ventas_detalle(pool, tam_lote=10_000, ordenado=ordenado)
+
+VARIANTES = {
+    "lab (fetchall)": lambda p: _lab(p),
+    "lotes ordenado": lambda p: _lotes(p, True),
+    "lotes sin orden": lambda p: _lotes(p, False),
+}
+
+def _medir(nombre: str, path: Path, cola: Queue) -> None:
+    t0 = time.perf_counter()
+    primero = None
+    n = 0
+    importe = 0.0
+    for lote in VARIANTES[nombre](path):
+        if primero is None:
+            primero = time.perf_counter() - t0
+        n += len(lote)
+        importe += sum(f["importe"] for f in lote)
+    total = time.perf_counter() - t0
+    cola.put((primero or total, total, n, importe, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+def main():
+    p = argparse.ArgumentParser(prog="bench_ventas")
+    p.add_argument("-n", type=int, default=10_000_000)
+    p.add_argument("--clientes", type=int, default=100_000)
+    p.add_argument("--productos", type=int, default=1_000)
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "ventas.db"
+        t_carga = poblar(path, args.n, args.clientes, args.productos)
+        print(f"n={args.n:,}  carga + índices: {t_carga:.1f} s ({path.stat().st_size / 1e6:,.0f} MB)")
+        print(f"  {'variante':>16} {'1er lote':>9} {'total':>8} {'filas/s':>11} {'RSS pico':>10}")
+        importes = []
+        for nombre in VARIANTES:
+            cola: Queue = Queue()
+            proc = Process(target=_medir, args=(nombre, path, cola))
+            proc.start()
+            primero, total, n, importe, rss_kb = cola.get()
+            proc.join()
+            assert n == args.n, (nombre, n)
+            importes.append(importe)
+            print(f"  {nombre:>16} {primero:8.2f}s {total:7.2f}s {n / total:11,.0f} {rss_kb / 1024:8.0f} MB")
+        assert max(importes) - min(importes) <= 1e-9 * max(importes), importes  # solo cambia el orden de suma
+
+if __name__ == "__main__":
+    main()
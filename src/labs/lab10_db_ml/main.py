@@ -0,0 +1,66 @@
+# main.py
+import argparse
+from app import mongo_demo, sql_demo
+from app.agregados import informes, instalados, instalar_resumenes
+from app.datos import PoolConexiones
+from app.documentos import BaseDocumentos
+from app.etl import EXPORT_DIR, export_sqlite_to_csv, exportar_incremental
+from app.ml_streaming import clasificacion_importe_streaming, regresion_precio_streaming
+
+def fase1():
+    print("== Fase 1: CRUD en SQLite ==")
+    sql_demo.demo()
+
+def fase2(local: bool = False):
+    print("== Fase 2: MongoDB" + (" (almacén local) ==" if local else " =="))
+    db = BaseDocumentos() if local else None
+    mongo_demo.crear_indices(db)
+    mongo_demo.seed(db)
+    mongo_demo.demo_crud(db)
+    mongo_demo.ventas_detalle_pipeline(db)
+
+def fase3(incremental: bool = False, con_informes: bool = False):
+    print("== Fase 3: exportación SQLite → CSV por lotes ==")
+    with PoolConexiones(sql_demo.DB_PATH) as pool:
+        if incremental:
+            n, marca = exportar_incremental(pool)
+            print(f"   ✓ ventas.csv: {n} filas nuevas (marca de agua id={marca})")
+        else:
+            for tabla, n in export_sqlite_to_csv(pool).items():
+                print(f"   ✓ {EXPORT_DIR / tabla}.csv: {n} filas")
+        if con_informes:
+            if not instalados(pool):
+                instalar_resumenes(pool)
+            por_cliente, por_producto = informes(pool)
+            print("\nImporte total por cliente:")
+            for f in por_cliente:
+                print(f"   {f['nombre']:<12} {f['importe']:>10.2f}")
+            print("\nUnidades por producto:")
+            for f in por_producto:
+                print(f"   {f['producto']:<12} {f['uds']:>10}")
+
+def fase4():
+    print("== Fase 4: modelos entrenados por lotes desde SQLite ==")
+    with PoolConexiones(sql_demo.DB_PATH) as pool:
+        clasif = clasificacion_importe_streaming(pool)
+        print(f"Accuracy (importe >= 200): {clasif.accuracy:.2f}  ({clasif.n_train} train / {clasif.n_test} test)")
+        r2, coef, inter, pred = regresion_precio_streaming(pool)
+        print(f"R² = {r2:.2f}")
+        print(f"Coef = {coef:.3f}, Intercepto = {inter:.3f}")
+        print(f"Predicción para cantidad=10 → {pred:.2f}")
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(prog="lab10")
+    p.add_argument("fase", choices=["1", "2", "3", "4"], nargs="?", default="1")
+    p.add_argument("--incremental", action="store_true", help="Fase 3: solo ventas nuevas desde la última exportación")
+    p.add_argument("--local", action="store_true", help="Fase 2: usar el almacén de documentos local en vez de MongoDB")
+    p.add_argument("--informes", action="store_true", help="Fase 3: informes desde los agregados materializados")
+    args = p.parse_args()
+    if args.fase == "2":
+        fase2(args.local)
+    elif args.fase == "3":
+        fase3(args.incremental, args.informes)
+    elif args.fase == "4":
+        fase4()
+    else:
+        fase1()
@@ -0,0 +1,104 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from app.agregados import (
+    estado, informe_por_cliente, informe_por_producto, informes, instalar_resumenes,
+    reconstruir, refrescar, verificar,
+)
+from app.datos import PoolConexiones, borrar_clientes, crear_clientes, crear_productos, crear_ventas, init_db
+
+def filas(rows) -> list[tuple]:
+    return [tuple(r) for r in rows]
+
+class BaseResumenes(unittest.TestCase):
+    modo = "triggers"
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.pool = PoolConexiones(Path(self.dir.name) / "t.db")
+        init_db(self.pool)
+        crear_clientes(self.pool, [("Ana", "ana@test.com"), ("Luis", "luis@test.com"), ("Marta", "marta@test.com")])
+        crear_productos(self.pool, [("Portátil", 900.0), ("Monitor", 180.0), ("Teclado", 25.0)])
+        crear_ventas(self.pool, [(1, 1, 1), (1, 2, 1), (2, 3, 2), (3, 2, 1)])
+        instalar_resumenes(self.pool, self.modo)
+
+    def tearDown(self):
+        self.pool.cerrar()
+        self.dir.cleanup()
+
+class TestTriggers(BaseResumenes):
+    def test_informes_del_lab(self):
+        por_cliente, por_producto = informes(self.pool)
+        self.assertEqual(filas(por_cliente), [(1, "Ana", 1080.0), (3, "Marta", 180.0), (2, "Luis", 50.0)])
+        self.assertEqual(filas(por_producto), [("Monitor", 2), ("Teclado", 2), ("Portátil", 1)])
+        self.assertEqual(estado(self.pool), ("triggers", 4))
+
+    def test_escrituras_mantienen_resumenes(self):
+        crear_ventas(self.pool, [(2, 1, 1)])
+        with self.pool.transaccion() as conn:
+            conn.execute("UPDATE productos SET precio = 190.0 WHERE nombre = 'Monitor'")
+            conn.execute("UPDATE ventas SET cantidad = 3 WHERE id = 3")
+            conn.execute("UPDATE ventas SET id_cliente = 1 WHERE id = 4")
+        borrar_clientes(self.pool, [2])  # ON DELETE CASCADE también dispara los triggers
+        self.assertEqual(verificar(self.pool), [])
+        self.assertEqual(filas(informe_por_cliente(self.pool)), [(1, "Ana", 1280.0)])
+        self.assertEqual(filas(informe_por_producto(self.pool)), [("Monitor", 2), ("Portátil", 1)])
+        self.assertEqual(refrescar(self.pool), 0)
+
+    def test_transaccion_deshecha_no_altera_resumenes(self):
+        with self.assertRaises(ZeroDivisionError):
+            with self.pool.transaccion() as conn:
+                conn.execute("INSERT INTO ventas(id_cliente, id_producto, cantidad) VALUES (2, 1, 5)")
+                1 / 0
+        self.assertEqual(filas(informe_por_cliente(self.pool))[-1], (2, "Luis", 50.0))
+
+    def test_carga_aleatoria_consistente(self):
+        rnd = random.Random(7)
+        crear_ventas(self.pool, ((rnd.randint(1, 3), rnd.randint(1, 3), rnd.randint(1, 5)) for _ in range(500)))
+        with self.pool.transaccion() as conn:
+            conn.execute("DELETE FROM ventas WHERE id % 3 = 0")
+            conn.execute("UPDATE productos SET precio = precio * 1.1")
+        self.assertEqual(verificar(self.pool), [])
+
+class TestIncremental(BaseResumenes):
+    modo = "incremental"
+
+    def test_refresco_por_marca(self):
+        crear_ventas(self.pool, [(2, 1, 1), (2, 3, 4)])
+        self.assertEqual(len(verificar(self.pool)), 3)  # Luis, Portátil y Teclado desfasados
+        self.assertEqual(refrescar(self.pool), 2)
+        self.assertEqual(refrescar(self.pool), 0)
+        self.assertEqual(verificar(self.pool), [])
+        self.assertEqual(estado(self.pool), ("incremental", 6))
+
+    def test_informes_refrescan_antes_de_leer(self):
+        crear_ventas(self.pool, [(2, 1, 2)])
+        self.assertEqual(filas(informe_por_cliente(self.pool))[0], (2, "Luis", 1850.0))
+
+    def test_verificar_detecta_y_repara(self):
+        with self.pool.transaccion() as conn:
+            conn.execute("DELETE FROM ventas WHERE id_cliente = 3")
+            conn.execute("UPDATE resumen_cliente SET uds = 99 WHERE id_cliente = 1")
+        errores = verificar(self.pool, reparar=True)
+        self.assertEqual({(e.tabla, e.clave) for e in errores},
+                         {("resumen_cliente", 1), ("resumen_cliente", 3), ("resumen_producto", 2)})
+        faltante = next(e for e in errores if e.clave == 3)
+        self.assertEqual((faltante.esperado, faltante.materializado), (None, (180.0, 1, 1)))
+        self.assertEqual(verificar(self.pool), [])
+
+    def test_cambio_de_modo(self):
+        crear_ventas(self.pool, [(3, 3, 1)])
+        instalar_resumenes(self.pool, "triggers")  # reconstruye al cambiar
+        crear_ventas(self.pool, [(3, 3, 1)])
+        self.assertEqual(verificar(self.pool), [])
+        instalar_resumenes(self.pool, "incremental")
+        crear_ventas(self.pool, [(3, 3, 1)])
+        self.assertEqual(len(verificar(self.pool)), 2)
+        reconstruir(self.pool)
+        self.assertEqual(verificar(self.pool), [])
+        with self.assertRaises(ValueError):
+            instalar_resumenes(self.pool, "vistas")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from app.datos import (
+    PoolConexiones, actualizar_emails, borrar_clientes, create_cliente, crear_clientes,
+    crear_productos, crear_ventas, init_db, read_clientes,
+)
+
+class TestPoolConexiones(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.pool = PoolConexiones(Path(self.dir.name) / "t.db", tam=2, timeout=0.2)
+        init_db(self.pool)
+
+    def tearDown(self):
+        self.pool.cerrar()
+        self.dir.cleanup()
+
+    def test_pragmas_aplicados(self):
+        with self.pool.conexion() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+
+    def test_init_db_no_crea_indices_sustituidos(self):
+        with PoolConexiones(Path(self.dir.name) / "u.db", tam=1) as pool:
+            init_db(pool)
+            with pool.conexion() as conn:
+                conn.execute("CREATE INDEX ix_ventas_cliente ON ventas(id_cliente)")  # como sql_demo
+                sentencias = []
+                conn.set_trace_callback(sentencias.append)
+            init_db(pool)
+            with pool.conexion() as conn:
+                conn.set_trace_callback(None)
+                indices = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertFalse([s for s in sentencias if "CREATE INDEX" in s and "ix_ventas_cliente " in s + " "])
+        self.assertIn("DROP INDEX IF EXISTS ix_ventas_cliente", [s.strip() for s in sentencias])
+        self.assertNotIn("ix_ventas_cliente", indices)
+        self.assertIn("ix_ventas_cliente_cubre", indices)
+
+    def test_lote_atomico(self):
+        self.assertEqual(crear_clientes(self.pool, [("Ana", "ana@test.com"), ("Luis", "luis@test.com")]), 2)
+        with self.assertRaises(sqlite3.IntegrityError):
+            crear_clientes(self.pool, [("Marta", "marta@test.com"), ("Otra", "ana@test.com")])
+        self.assertEqual([r["nombre"] for r in read_clientes(self.pool)], ["Ana", "Luis"])
+
+    def test_actualizar_y_borrar_en_bloque(self):
+        crear_clientes(self.pool, ((f"c{i}", f"c{i}@test.com") for i in range(100)))
+        crear_productos(self.pool, [("Monitor", 180.0)])
+        crear_ventas(self.pool, [(i, 1, 1) for i in range(1, 101)])
+        self.assertEqual(actualizar_emails(self.pool, [(i, f"nuevo{i}@test.com") for i in range(1, 11)]), 10)
+        self.assertEqual(read_clientes(self.pool)[0]["email"], "nuevo1@test.com")
+        self.assertEqual(borrar_clientes(self.pool, range(1, 51)), 50)
+        with self.pool.conexion() as conn:
+            # ON DELETE CASCADE: las FK están activas en las conexiones del pool
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM ventas").fetchone()[0], 50)
+
+    def test_hilos_comparten_tam_conexiones(self):
+        def trabajo(h):
+            for i in range(50):
+                create_cliente(self.pool, f"h{h}", f"h{h}_{i}@test.com")
+        hilos = [threading.Thread(target=trabajo, args=(h,)) for h in range(6)]
+        for t in hilos: t.start()
+        for t in hilos: t.join()
+        self.assertEqual(len(read_clientes(self.pool)), 300)
+        self.assertLessEqual(self.pool.abiertas, 2)
+
+    def test_timeout_y_rollback_al_devolver(self):
+        with self.pool.conexion() as a, self.pool.conexion() as b:
+            a.execute("BEGIN")
+            a.execute("INSERT INTO clientes(nombre, email) VALUES ('x', 'x@test.com')")
+            with self.assertRaises(TimeoutError):
+                with self.pool.conexion():
+                    pass
+        self.assertEqual(read_clientes(self.pool), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from app import mongo_demo
+from app.documentos import BaseDocumentos, ErrorClaveDuplicada
+
+class TestFaseMongoEnLocal(unittest.TestCase):
+    def setUp(self):
+        self.db = BaseDocumentos()
+        mongo_demo.crear_indices(self.db)
+        with contextlib.redirect_stdout(io.StringIO()) as self.salida:
+            mongo_demo.seed(self.db)
+            mongo_demo.demo_crud(self.db)
+            self.detalle = mongo_demo.ventas_detalle_pipeline(self.db)
+
+    def test_salida_esperada_del_lab(self):
+        self.assertEqual(self.detalle, [
+            {"cliente": "Ana", "producto": "Monitor", "cantidad": 1, "precio": 190.0, "importe": 190.0},
+            {"cliente": "Ana", "producto": "Portátil", "cantidad": 1, "precio": 900.0, "importe": 900.0},
+            {"cliente": "Luis", "producto": "Teclado", "cantidad": 2, "precio": 25.0, "importe": 50.0},
+            {"cliente": "Marta", "producto": "Monitor", "cantidad": 1, "precio": 190.0, "importe": 190.0},
+        ])
+        self.assertIn("{'nombre': 'Ana', 'email': 'ana@test.com'}", self.salida.getvalue())
+
+    def test_seed_repetible_y_unique(self):
+        clientes, _, ventas = mongo_demo.get_collections(self.db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            mongo_demo.seed(self.db)
+        self.assertEqual((clientes.count_documents({}), ventas.count_documents({})), (3, 4))
+        with self.assertRaises(ErrorClaveDuplicada):
+            clientes.insert_one({"nombre": "Otra Ana", "email": "ana@test.com"})
+        with self.assertRaises(ErrorClaveDuplicada):
+            clientes.update_one({"_id": 2}, {"$set": {"email": "ana@test.com"}})
+        self.assertEqual(clientes.find_one({"_id": 2})["email"], "luis@test.com")
+
+    def test_group_importe_por_cliente(self):
+        _, _, ventas = mongo_demo.get_collections(self.db)
+        res = list(ventas.aggregate(mongo_demo.PIPELINE_VENTAS_DETALLE[:-2] + [
+            {"$group": {"_id": "$cliente.nombre",
+                        "importe": {"$sum": {"$multiply": ["$cantidad", "$producto.precio"]}},
+                        "uds": {"$sum": "$cantidad"}, "n": {"$sum": 1}}},
+            {"$sort": {"importe": -1}},
+        ]))
+        self.assertEqual(res, [
+            {"_id": "Ana", "importe": 1090.0, "uds": 2, "n": 2},
+            {"_id": "Marta", "importe": 190.0, "uds": 1, "n": 1},
+            {"_id": "Luis", "importe": 50.0, "uds": 2, "n": 1},
+        ])
+
+class TestColeccion(unittest.TestCase):
+    def setUp(self):
+        self.col = BaseDocumentos()["ventas"]
+        self.col.insert_many({"_id": i, "id_cliente": i % 5, "cantidad": i % 7, "tags": ["a"]} for i in range(50))
+
+    def test_filtros_con_y_sin_indice_coinciden(self):
+        filtros = [{"id_cliente": 3}, {"id_cliente": {"$in": [1, 2]}, "cantidad": {"$gte": 3}},
+                   {"$or": [{"id_cliente": 0}, {"cantidad": 6}]}, {"falta": None}, {"falta": {"$exists": True}}]
+        sin = [sorted(d["_id"] for d in self.col.find(f)) for f in filtros]
+        self.assertFalse(self.col.usa_indice({"id_cliente": 3}))
+        self.col.create_index("id_cliente")
+        self.assertTrue(self.col.usa_indice({"id_cliente": 3}))
+        con = [sorted(d["_id"] for d in self.col.find(f)) for f in filtros]
+        self.assertEqual(con, sin)
+        self.assertEqual([len(x) for x in con], [10, 11, 16, 50, 0])
+
+    def test_indice_se_mantiene_al_modificar_y_borrar(self):
+        self.col.create_index("id_cliente")
+        r = self.col.update_many({"id_cliente": 1}, {"$set": {"id_cliente": 9}, "$inc": {"cantidad": 100}})
+        self.assertEqual((r.matched_count, r.modified_count), (10, 10))
+        self.assertEqual(self.col.count_documents({"id_cliente": 1}), 0)
+        self.assertEqual(self.col.count_documents({"id_cliente": 9, "cantidad": {"$gte": 100}}), 10)
+        self.assertEqual(self.col.delete_many({"id_cliente": 9}).deleted_count, 10)
+        self.assertEqual(self.col.delete_one({"id_cliente": 2}).deleted_count, 1)
+        self.assertEqual(self.col.count_documents({}), 39)
+
+    def test_rutas_con_punto_no_tocan_lo_guardado(self):
+        col = BaseDocumentos()["anidados"]
+        col.create_index("a.b")
+        col.insert_one({"_id": 1, "a": {"b": 1, "x": {"y": 1}}})
+        self.assertEqual(col.update_one({"_id": 1}, {"$set": {"a.b": 2}}).modified_count, 1)
+        self.assertEqual([d["_id"] for d in col.find({"a.b": 2})], [1])
+        self.assertEqual(list(col.find({"a.b": 1})), [])
+        col.update_one({"_id": 1}, {"$unset": {"a.x.y": ""}})
+        self.assertEqual(col.find_one({"_id": 1})["a"], {"b": 2, "x": {}})
+        # etapas de solo lectura y proyecciones de exclusión no modifican el documento
+        list(col.aggregate([{"$addFields": {"a.c": 5}}, {"$project": {"a.b": 0}}]))
+        list(col.aggregate([{"$unwind": "$a.x"}]))
+        list(col.find({}, {"a.x": 0}))
+        self.assertEqual(col.find_one({"_id": 1}), {"_id": 1, "a": {"b": 2, "x": {}}})
+        with self.assertRaises(ValueError):
+            col.update_one({"_id": 1}, {"$set": {"a.b.c": 1}})
+
+    def test_cursor_y_proyeccion(self):
+        docs = list(self.col.find({"id_cliente": 0}, {"_id": 0, "tags": 0}).sort([("cantidad", -1), ("id_cliente", 1)]).skip(1).limit(3))
+        self.assertEqual(docs, [{"id_cliente": 0, "cantidad": 5}, {"id_cliente": 0, "cantidad": 5}, {"id_cliente": 0, "cantidad": 4}])
+        self.assertEqual(list(self.col.find({"_id": 7}, {"_id": 0}).limit(1)), [{"id_cliente": 2, "cantidad": 0, "tags": ["a"]}])
+        # las copias devueltas no alteran lo almacenado
+        self.col.find_one({"_id": 1})["cantidad"] = -1
+        self.assertEqual(self.col.find_one({"_id": 1})["cantidad"], 1)
+
+    def test_unwind_count_y_etapa_desconocida(self):
+        self.assertEqual(list(self.col.aggregate([{"$match": {"id_cliente": 1}}, {"$unwind": "$tags"}, {"$count": "n"}])), [{"n": 10}])
+        with self.assertRaises(ValueError):
+            self.col.aggregate([{"$out": "x"}])
+
+    def test_guardar_y_cargar(self):
+        self.col.create_index("id_cliente")
+        with tempfile.TemporaryDirectory() as d:
+            self.col.db.guardar(Path(d))
+            db = BaseDocumentos.cargar(Path(d))
+        self.assertEqual(list(db["ventas"].find()), list(self.col.find()))
+        self.assertTrue(db["ventas"].usa_indice({"id_cliente": 1}))
+
+if __name__ == "__main__":
+    unittest.main()
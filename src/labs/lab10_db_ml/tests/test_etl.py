@@ -0,0 +1,86 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+from app.datos import PoolConexiones, crear_clientes, crear_productos, crear_ventas, init_db
+from app.etl import export_sqlite_to_csv, exportar_incremental, exportar_tabla_csv, pd, cargar_y_unir, reducir_tipos
+
+def leer_csv(path: Path) -> list[list[str]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+class TestExportacion(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.dir.name)
+        self.pool = PoolConexiones(self.base / "t.db")
+        init_db(self.pool)
+        crear_clientes(self.pool, [("Ana", "ana@test.com"), ("Luis, el \"grande\"", "luis@test.com")])
+        crear_productos(self.pool, [("Portátil", 900.0), ("Monitor", 180.0)])
+        crear_ventas(self.pool, [(1, 1, 1), (1, 2, 1), (2, 2, 3)])
+        self.export = self.base / "export"
+
+    def tearDown(self):
+        self.pool.cerrar()
+        self.dir.cleanup()
+
+    def test_exportacion_completa_por_lotes(self):
+        self.assertEqual(export_sqlite_to_csv(self.pool, self.export, tam_lote=2),
+                         {"clientes": 2, "productos": 2, "ventas": 3})
+        self.assertEqual(leer_csv(self.export / "clientes.csv"),
+                         [["id", "nombre", "email"], ["1", "Ana", "ana@test.com"], ["2", 'Luis, el "grande"', "luis@test.com"]])
+        self.assertEqual(leer_csv(self.export / "ventas.csv")[-1], ["3", "2", "2", "3"])
+        self.assertEqual(sorted(p.name for p in self.export.iterdir()), ["clientes.csv", "productos.csv", "ventas.csv"])
+
+    def test_tabla_desconocida(self):
+        with self.assertRaises(ValueError):
+            exportar_tabla_csv(self.pool, "ventas; DROP TABLE ventas", self.export / "x.csv")
+
+    def test_incremental_solo_exporta_ventas_nuevas(self):
+        self.assertEqual(exportar_incremental(self.pool, destino_dir=self.export), (3, 3))
+        self.assertEqual(exportar_incremental(self.pool, destino_dir=self.export), (0, 3))
+        crear_ventas(self.pool, [(2, 1, 1), (1, 1, 2)])
+        self.assertEqual(exportar_incremental(self.pool, destino_dir=self.export, tam_lote=1), (2, 5))
+        filas = leer_csv(self.export / "ventas.csv")
+        self.assertEqual(filas[0], ["id", "id_cliente", "id_producto", "cantidad"])
+        self.assertEqual([f[0] for f in filas[1:]], ["1", "2", "3", "4", "5"])
+
+    def test_incremental_tras_corte_no_duplica(self):
+        exportar_incremental(self.pool, destino_dir=self.export)
+        crear_ventas(self.pool, [(2, 1, 1)])
+        # una ejecución anterior escribió filas pero murió antes de guardar la marca
+        with (self.export / "ventas.csv").open("a", encoding="utf-8") as f:
+            f.write("4,2,1,1\n5,2,1")
+        self.assertEqual(exportar_incremental(self.pool, destino_dir=self.export), (1, 4))
+        self.assertEqual([f[0] for f in leer_csv(self.export / "ventas.csv")[1:]], ["1", "2", "3", "4"])
+
+@unittest.skipIf(pd is None, "pandas no instalado")
+class TestPandasPorTrozos(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.pool = PoolConexiones(Path(self.dir.name) / "t.db")
+        init_db(self.pool)
+        crear_clientes(self.pool, [(f"c{i}", f"c{i}@test.com") for i in range(10)])
+        crear_productos(self.pool, [("Portátil", 900.0), ("Monitor", 180.0), ("Teclado", 25.0)])
+        crear_ventas(self.pool, [(i % 10 + 1, i % 3 + 1, i % 4 + 1) for i in range(95)])
+
+    def tearDown(self):
+        self.pool.cerrar()
+        self.dir.cleanup()
+
+    def test_cargar_y_unir_por_trozos(self):
+        df = cargar_y_unir(self.pool, chunksize=20)
+        self.assertEqual(len(df), 95)
+        self.assertEqual(list(df.columns), ["id_cliente", "nombre", "email", "producto", "cantidad", "precio", "importe"])
+        self.assertEqual(str(df["producto"].dtype), "category")
+        self.assertEqual(str(df["precio"].dtype), "float32")
+        self.assertEqual(str(df["id_cliente"].dtype), "int32")
+        self.assertAlmostEqual(float(df["importe"].sum()),
+                               sum((i % 4 + 1) * (900.0, 180.0, 25.0)[i % 3] for i in range(95)), places=1)
+
+    def test_reducir_tipos(self):
+        df = reducir_tipos(pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, 2.5], "c": ["x", "x", "y"], "d": ["1", "2", "3"]}))
+        self.assertEqual([str(t) for t in df.dtypes], ["int8", "float32", "category", "object"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import random
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from app.datos import PoolConexiones, crear_clientes, crear_productos, crear_ventas, init_db
+from app.ml_streaming import (
+    SGDLineal, clasificacion_importe_memoria, clasificacion_importe_streaming, estadisticas, lotes,
+    regresion_precio_memoria, regresion_precio_streaming,
+)
+
+def poblar(pool: PoolConexiones, n: int, semilla: int = 1) -> None:
+    rnd = random.Random(semilla)
+    init_db(pool)
+    crear_clientes(pool, ((f"c{i}", f"c{i}@test.com") for i in range(50)))
+    crear_productos(pool, ((f"p{i}", round(8 * i + rnd.uniform(1, 40), 2)) for i in range(50)))
+    # los productos caros (id alto) se compran en menos cantidad: hay algo que aprender
+    crear_ventas(pool, ((rnd.randint(1, 50), p, max(1, min(5, 6 - p // 10 + rnd.randint(-1, 1))))
+                        for p in (rnd.randint(1, 50) for _ in range(n))))
+
+class TestStreaming(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        cls.pool = PoolConexiones(Path(cls.dir.name) / "t.db")
+        poblar(cls.pool, 4_000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.cerrar()
+        cls.dir.cleanup()
+
+    def test_particion_estable_y_disjunta(self):
+        train = [f for lote in lotes(self.pool, "train", tam_lote=500) for f in lote]
+        test = [f for lote in lotes(self.pool, "test", tam_lote=700) for f in lote]
+        self.assertEqual(len(train) + len(test), 4_000)
+        self.assertAlmostEqual(len(test) / 4_000, 0.3, delta=0.03)
+        self.assertEqual(test, [f for lote in lotes(self.pool, "test") for f in lote])
+        self.assertTrue(all(len(lote) <= 500 for lote in lotes(self.pool, "train", tam_lote=500)))
+        self.assertEqual(estadisticas(self.pool, "train").n, len(train))
+        with self.assertRaises(ValueError):
+            next(lotes(self.pool, "validacion"))
+
+    def test_clasificacion_paridad_con_memoria(self):
+        streaming = clasificacion_importe_streaming(self.pool, tam_lote=512, epocas=3)
+        memoria = clasificacion_importe_memoria(self.pool)
+        self.assertEqual((streaming.n_train, streaming.n_test), (memoria.n_train, memoria.n_test))
+        self.assertGreater(memoria.accuracy, 0.8)
+        self.assertAlmostEqual(streaming.accuracy, memoria.accuracy, delta=0.02)
+
+    def test_regresion_paridad_con_memoria(self):
+        streaming = regresion_precio_streaming(self.pool, tam_lote=512, epocas=3)
+        memoria = regresion_precio_memoria(self.pool)
+        self.assertGreater(memoria.r2, 0.3)
+        self.assertAlmostEqual(streaming.r2, memoria.r2, delta=0.01)
+        self.assertAlmostEqual(streaming.coef, memoria.coef, delta=abs(memoria.coef) * 0.05)
+        self.assertAlmostEqual(streaming.pred_10, streaming.intercepto + 10 * streaming.coef)
+
+class TestMemoria(unittest.TestCase):
+    def pico(self, n: int) -> int:
+        with tempfile.TemporaryDirectory() as d:
+            pool = PoolConexiones(Path(d) / "t.db")
+            poblar(pool, n)
+            tracemalloc.start()
+            try:
+                clasificacion_importe_streaming(pool, tam_lote=256, epocas=1)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+                pool.cerrar()
+
+    def test_memoria_plana_al_crecer_ventas(self):
+        pequeno, grande = self.pico(2_000), self.pico(8_000)
+        self.assertLess(grande, pequeno * 1.5 + 64 * 1024)
+
+class TestSGDLineal(unittest.TestCase):
+    def test_regresion_y_forma_de_coef(self):
+        rnd = random.Random(0)
+        X = [(rnd.uniform(-1, 1),) for _ in range(20_000)]
+        y = [3.0 * x - 1.0 + rnd.gauss(0, 0.1) for (x,) in X]
+        m = SGDLineal("cuadratica", promedio=10_000)
+        for i in range(0, len(X), 1_000):
+            m.partial_fit(X[i:i + 1_000], y[i:i + 1_000])
+            if i == 5_000:
+                self.assertEqual(m.coef_, m._w)  # aún sin promediar
+        self.assertAlmostEqual(m.coef_[0], 3.0, delta=0.1)
+        self.assertAlmostEqual(m.intercept_[0], -1.0, delta=0.05)
+
+    def test_clasificacion(self):
+        rnd = random.Random(0)
+        X = [(rnd.uniform(-1, 1), rnd.uniform(-1, 1)) for _ in range(5_000)]
+        y = [int(a + b > 0) for a, b in X]
+        m = SGDLineal("logistica", eta0=0.1).partial_fit(X, y, classes=[0, 1])
+        self.assertEqual(len(m.coef_), 1)
+        self.assertGreater(sum(p == r for p, r in zip(m.predict(X), y)) / len(y), 0.97)
+        with self.assertRaises(ValueError):
+            SGDLineal("hinge")
+
+if __name__ == "__main__":
+    unittest.main()
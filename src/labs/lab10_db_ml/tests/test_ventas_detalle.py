@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app import sql_demo
+from app.datos import (
+    PoolConexiones, crear_clientes, crear_productos, crear_ventas, init_db, plan_consulta,
+    sql_ventas_detalle, ventas_detalle,
+)
+
+class TestVentasDetalle(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.dir.name) / "t.db"
+        self.pool = PoolConexiones(self.path)
+        init_db(self.pool)
+        crear_clientes(self.pool, [(f"cliente{i % 7}", f"c{i}@test.com") for i in range(20)])
+        crear_productos(self.pool, [(f"prod{i}", 10.0 * i) for i in range(1, 6)])
+        crear_ventas(self.pool, [(i % 20 + 1, i % 5 + 1, i % 3 + 1) for i in range(250)])
+
+    def tearDown(self):
+        self.pool.cerrar()
+        self.dir.cleanup()
+
+    def test_lotes_y_mismo_resultado_que_el_lab(self):
+        lotes = list(ventas_detalle(self.pool, tam_lote=100))
+        self.assertEqual([len(l) for l in lotes], [100, 100, 50])
+        filas = [tuple(f) for l in lotes for f in l]
+        viejo = sql_demo.DB_PATH
+        sql_demo.DB_PATH = self.path
+        try:
+            esperado = [tuple(f) for f in sql_demo.ventas_detalle()]
+        finally:
+            sql_demo.DB_PATH = viejo
+        # mismo multiconjunto y mismo orden por (cliente, producto)
+        self.assertEqual(sorted(filas), sorted(esperado))
+        self.assertEqual([f[:2] for f in filas], [f[:2] for f in esperado])
+        self.assertEqual(sorted(tuple(f) for l in ventas_detalle(self.pool, ordenado=False) for f in l), sorted(esperado))
+
+    def test_filtro_por_cliente(self):
+        filas = [f for l in ventas_detalle(self.pool, id_cliente=3) for f in l]
+        self.assertEqual(len(filas), 13)
+        self.assertEqual({f["cliente"] for f in filas}, {"cliente2"})
+        self.assertEqual(filas[0]["importe"], filas[0]["cantidad"] * filas[0]["precio"])
+
+    def test_generador_cerrado_devuelve_la_conexion(self):
+        gen = ventas_detalle(self.pool, tam_lote=10)
+        next(gen)
+        gen.close()
+        self.assertEqual(self.pool._libres.qsize(), self.pool.abiertas)
+
+    def test_plan_sin_recorridos_completos_ni_ordenacion_global(self):
+        # Si alguien quita los índices o cambia el JOIN, el plan vuelve a SCAN v + TEMP B-TREE
+        casos = [sql_ventas_detalle(), sql_ventas_detalle(id_cliente=1), sql_ventas_detalle(False, 1)]
+        for sql, params in casos:
+            plan = plan_consulta(self.pool, sql, params)
+            texto = "\n".join(plan)
+            self.assertNotIn("SCAN v\n", texto + "\n", plan)
+            self.assertNotIn("SCAN ventas", texto, plan)
+            self.assertNotIn("TEMP B-TREE FOR ORDER BY", texto, plan)
+            self.assertTrue(any(l.startswith("SEARCH v USING COVERING INDEX") for l in plan), plan)
+
+if __name__ == "__main__":
+    unittest.main()